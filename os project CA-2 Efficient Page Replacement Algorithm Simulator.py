@@ -1,12 +1,2305 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from matplotlib.animation import FuncAnimation
+import argparse
+import cProfile
+import csv
+import gc
+import gzip
+import hashlib
+import heapq
+import importlib
+import importlib.util
+import itertools
+import json
+import logging
 import random
-import pygame
 import os
-import numpy as np
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import zipfile
+from collections import OrderedDict, deque
+from contextlib import contextmanager, nullcontext
+
+# Logging. Each subsystem has its own logger under "pagesim"; messages use %-style arguments
+# so nothing is formatted unless a handler will emit it, and the console handler rate-limits
+# repeated messages from the same call site (e.g. one line per animation frame).
+engine_log = logging.getLogger("pagesim.engine")
+chart_log = logging.getLogger("pagesim.chart")
+gui_log = logging.getLogger("pagesim.gui")
+service_log = logging.getLogger("pagesim.service")
+
+LOG_FORMAT = "%(asctime)s %(levelname)-7s %(name)s: %(message)s%(suppressed)s"
+
+class RateLimitFilter(logging.Filter):
+    # Passes at most `burst` records per (logger, message template) in each `interval` seconds
+    # and reports how many were dropped on the next record that gets through.
+    def __init__(self, burst=5, interval=1.0):
+        super().__init__()
+        self.burst = burst
+        self.interval = interval
+        self.windows = {}  # (logger name, template) -> [window start, emitted, suppressed]
+        self.lock = threading.Lock()
+
+    def filter(self, record):
+        key = (record.name, record.msg)
+        with self.lock:
+            window = self.windows.get(key)
+            if window is None or record.created - window[0] >= self.interval:
+                suppressed = window[2] if window else 0
+                window = self.windows[key] = [record.created, 0, 0]
+            else:
+                suppressed = 0
+            if window[1] >= self.burst:
+                window[2] += 1
+                return False
+            window[1] += 1
+        record.suppressed = f" ({suppressed} similar messages suppressed)" if suppressed else ""
+        return True
+
+def configure_logging(level=None, burst=5, interval=1.0, stream=None):
+    level = level or os.environ.get("PAGESIM_LOG_LEVEL", "WARNING")
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    handler.addFilter(RateLimitFilter(burst, interval))
+    logger = logging.getLogger("pagesim")
+    for old_handler in list(logger.handlers):
+        logger.removeHandler(old_handler)
+    logger.addHandler(handler)
+    logger.setLevel(level.upper() if isinstance(level, str) else level)
+    logger.propagate = False
+    return logger
+
+class LazyModule:
+    # Placeholder for a heavy dependency; the real import happens on first attribute access
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+        self._lock = threading.Lock()
+
+    def load(self):
+        if self._module is None:
+            with self._lock:
+                if self._module is None:
+                    self._module = importlib.import_module(self._name)
+        return self._module
+
+    def __getattr__(self, attr):
+        return getattr(self.load(), attr)
+
+# matplotlib, pygame and numpy together cost most of a second to import, so they are only
+# loaded when a chart, sound or engine first needs them (or by the background preload).
+np = LazyModule("numpy")
+plt = LazyModule("matplotlib.pyplot")
+backend_tkagg = LazyModule("matplotlib.backends.backend_tkagg")
+animation = LazyModule("matplotlib.animation")
+mpl_figure = LazyModule("matplotlib.figure")
+pygame = LazyModule("pygame")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+futures = LazyModule("concurrent.futures")
+shared_memory = LazyModule("multiprocessing.shared_memory")
+resource_tracker = LazyModule("multiprocessing.resource_tracker")
+asyncio = LazyModule("asyncio")
+pyarrow = LazyModule("pyarrow")
+pyarrow_parquet = LazyModule("pyarrow.parquet")
+
+HEAVY_MODULES = ("numpy", "matplotlib", "pygame")
+STARTUP_BUDGET = 0.25  # seconds allowed for importing this module
+
+def preload_heavy_modules():
+    for module in (np, plt, backend_tkagg, animation):
+        try:
+            module.load()
+        except ImportError as e:
+            gui_log.warning("Could not preload %s: %s", module._name, e)
+
+def start_background_imports():
+    threading.Thread(target=preload_heavy_modules, name="preload-imports", daemon=True).start()
+
+_sounds = None
+
+def load_sounds():
+    # The mixer is initialised and the sound files decoded once per process
+    global _sounds
+    if _sounds is None:
+        try:
+            pygame.mixer.init()
+            _sounds = (pygame.mixer.Sound("fault.wav"), pygame.mixer.Sound("hit.wav"))
+        except Exception as e:
+            gui_log.warning("Sound disabled, could not load sound files: %s", e)
+            _sounds = (None, None)
+    return _sounds
+
+class Instrumentation:
+    # Opt-in collector for phase timings, per-policy counters and an optional cProfile session.
+    # Nothing is recorded per reference; engines report their counters once per run.
+    def __init__(self, profile=False):
+        self.origin = time.perf_counter()
+        self.events = []  # (name, category, start, duration, thread id)
+        self.counters = {}  # policy name -> {counter: total}
+        self.profiler = cProfile.Profile() if profile else None
+
+    @contextmanager
+    def phase(self, name, category="phase"):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.events.append((name, category, start - self.origin, time.perf_counter() - start, threading.get_ident()))
+
+    @contextmanager
+    def profiling(self):
+        if self.profiler is None:
+            yield
+            return
+        self.profiler.enable()
+        try:
+            yield
+        finally:
+            self.profiler.disable()
+
+    def record_policies(self, policies):
+        for policy in policies:
+            counters = self.counters.setdefault(policy.name, {"hits": 0, "faults": 0, "evictions": 0, "victim_probes": 0})
+            counters["hits"] += policy.hits
+            counters["faults"] += policy.faults
+            counters["evictions"] += policy.evictions
+            counters["victim_probes"] += policy.probes
+
+    def summary(self):
+        totals = {}
+        for name, category, _, duration, _ in self.events:
+            count, total = totals.get(name, (0, 0.0))
+            totals[name] = (count + 1, total + duration)
+        lines = ["Phase timings:"]
+        for name, (count, total) in totals.items():
+            lines.append(f"  {name:12s} {total * 1000:10.2f} ms  ({count} call{'s' if count != 1 else ''})")
+        if self.counters:
+            lines.append("Policy counters:")
+            for name, counters in self.counters.items():
+                lines.append(f"  {name:8s} " + " ".join(f"{key}={value}" for key, value in counters.items()))
+        return "\n".join(lines)
+
+    def write_chrome_trace(self, path):
+        # Loadable in chrome://tracing and Perfetto: complete ("X") events plus final counter values
+        pid = os.getpid()
+        events = [{"name": name, "cat": category, "ph": "X", "ts": start * 1e6, "dur": duration * 1e6, "pid": pid, "tid": tid}
+                  for name, category, start, duration, tid in self.events]
+        end = (time.perf_counter() - self.origin) * 1e6
+        for name, counters in self.counters.items():
+            events.append({"name": name, "cat": "policy", "ph": "C", "ts": end, "pid": pid, "args": counters})
+        with open(path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+    def write_profile(self, path):
+        if self.profiler is None:
+            raise ValueError("Profiling was not enabled for this session")
+        self.profiler.dump_stats(path)
+
+_instrumentation = None
+
+def set_instrumentation(instrumentation):
+    global _instrumentation
+    _instrumentation = instrumentation
+
+def get_instrumentation():
+    return _instrumentation
+
+def phase(name, category="phase"):
+    return _instrumentation.phase(name, category) if _instrumentation else nullcontext()
+
+def profile_call(func, path):
+    # .html/.pyisession paths use pyinstrument when it is installed, anything else is cProfile stats
+    if path.endswith((".html", ".pyisession")):
+        pyinstrument = importlib.import_module("pyinstrument")
+        profiler = pyinstrument.Profiler()
+        profiler.start()
+        try:
+            return func()
+        finally:
+            profiler.stop()
+            if path.endswith(".html"):
+                with open(path, "w") as f:
+                    f.write(profiler.output_html())
+            else:
+                profiler.last_session.save(path)
+    profiler = cProfile.Profile()
+    try:
+        return profiler.runcall(func)
+    finally:
+        profiler.dump_stats(path)
+
+def simulate_fifo(pages, frames):
+    memory, page_faults, result, gantt_data, faults = [], 0, [], [], []
+    for i, page in enumerate(pages):
+        fault = page not in memory
+        if fault:
+            if len(memory) < frames:
+                memory.append(page)
+            else:
+                memory.pop(0)
+                memory.append(page)
+            page_faults += 1
+        # Pad memory with None to ensure consistent length
+        memory_padded = memory + [None] * (frames - len(memory))
+        result.append(f"Page: {format_page(page):>2} | Memory: {memory_padded} | {'Fault' if fault else 'Hit'}")
+        gantt_data.append((i, memory_padded, page))
+        faults.append(fault)
+    return result, page_faults, gantt_data, faults
+
+def simulate_lru(pages, frames):
+    memory, page_faults, result, recent, gantt_data, faults = [], 0, [], {}, [], []
+    for i, page in enumerate(pages):
+        fault = page not in memory
+        if fault:
+            if len(memory) < frames:
+                memory.append(page)
+            else:
+                lru_page = min(recent, key=recent.get)
+                memory.remove(lru_page)
+                del recent[lru_page]
+                memory.append(page)
+            page_faults += 1
+        recent[page] = i
+        memory_padded = memory + [None] * (frames - len(memory))
+        result.append(f"Page: {format_page(page):>2} | Memory: {memory_padded} | {'Fault' if fault else 'Hit'}")
+        gantt_data.append((i, memory_padded, page))
+        faults.append(fault)
+    return result, page_faults, gantt_data, faults
+
+def simulate_optimal(pages, frames):
+    memory, page_faults, result, gantt_data, faults = [], 0, [], [], []
+    for i, page in enumerate(pages):
+        fault = page not in memory
+        if fault:
+            if len(memory) < frames:
+                memory.append(page)
+            else:
+                future = {p: (pages[i+1:].index(p) if p in pages[i+1:] else float('inf')) for p in memory}
+                memory.remove(max(future, key=future.get))
+                memory.append(page)
+            page_faults += 1
+        memory_padded = memory + [None] * (frames - len(memory))
+        result.append(f"Page: {format_page(page):>2} | Memory: {memory_padded} | {'Fault' if fault else 'Hit'}")
+        gantt_data.append((i, memory_padded, page))
+        faults.append(fault)
+    return result, page_faults, gantt_data, faults
+
+SIMULATORS = {"FIFO": simulate_fifo, "LRU": simulate_lru, "Optimal": simulate_optimal}
+
+def iter_references(lines, flags=True):
+    # Page numbers may be separated by commas and/or whitespace, on one line or many;
+    # pid:page tokens are references of a process and come out as (pid, page) tuples.
+    # Read/write flags (5w, or an r/w column) are dropped, or rejected with flags=False;
+    # iter_accesses keeps them.
+    for line in lines:
+        for token in line.replace(",", " ").split():
+            if token[-1] in ACCESS_FLAGS:
+                if not flags:
+                    raise ValueError(f"Read/write flag in {token!r}; use --writes to simulate writes")
+                if len(token) == 1:
+                    continue
+                token = token[:-1]
+            if ":" in token:
+                pid, _, page = token.partition(":")
+                yield int(pid), int(page)
+            else:
+                yield int(token)
+
+def parse_reference_string(text):
+    pages = list(iter_references(text.splitlines()))
+    if ":" in text:
+        # In a tagged string, untagged pages belong to process 0
+        pages = [page if isinstance(page, tuple) else (0, page) for page in pages]
+    return pages
+
+ACCESS_FLAGS = {"r": False, "R": False, "w": True, "W": True}  # flag -> is a write
+
+def iter_accesses(lines):
+    # (page, write) pairs. A reference is a write when it has a w suffix (5w) or is followed by
+    # a w column ("5 w", "5,w"); r marks a read and unflagged references are reads.
+    for line in lines:
+        page = None
+        for token in line.replace(",", " ").split():
+            if token in ACCESS_FLAGS:
+                if page is None:
+                    raise ValueError(f"Flag {token} does not follow a page number")
+                yield page, ACCESS_FLAGS[token]
+                page = None
+                continue
+            if page is not None:
+                yield page, False
+            write = ACCESS_FLAGS.get(token[-1])
+            page = next(iter_references((token,)))
+            if write is not None:
+                yield page, write
+                page = None
+        if page is not None:
+            yield page, False
+
+def parse_access_string(text):
+    # The pages of parse_reference_string plus one write flag per reference
+    accesses = list(iter_accesses(text.splitlines()))
+    pages = [page for page, _ in accesses]
+    if ":" in text:
+        pages = [page if isinstance(page, tuple) else (0, page) for page in pages]
+    return pages, [write for _, write in accesses]
+
+def has_access_flags(text):
+    return any(flag in text for flag in ACCESS_FLAGS)
+
+def is_tagged(pages):
+    return bool(pages) and isinstance(pages[0], tuple)
+
+def format_page(page):
+    return f"{page[0]}:{page[1]}" if isinstance(page, tuple) else str(page)
+
+def iter_trace_file(path, flags=True):
+    with open(path, "r") as f:
+        yield from iter_references(f, flags)
+
+def intern_pages(pages):
+    # Map page numbers to dense ids 0..n-1 so per-page state can live in flat lists
+    page_ids, page_table, ids = {}, [], []
+    for page in pages:
+        page_id = page_ids.get(page)
+        if page_id is None:
+            page_id = page_ids[page] = len(page_table)
+            page_table.append(page)
+        ids.append(page_id)
+    return ids, page_table
+
+def compute_next_use(ids, unique_pages):
+    # next_use[i] is the index of the next reference to ids[i], or len(ids) if there is none
+    never = len(ids)
+    last_seen = [never] * unique_pages
+    next_use = [never] * len(ids)
+    for i in range(len(ids) - 1, -1, -1):
+        page_id = ids[i]
+        next_use[i] = last_seen[page_id]
+        last_seen[page_id] = i
+    return next_use
+
+# Incremental policies used by the multi-policy engine. Each keeps its resident pages in the
+# same frame order as the reference simulate_* functions, so results match them exactly.
+# access() returns True on a fault and leaves the evicted page (or None) in self.victim.
+# access_rw() adds dirty bits for traces with writes: self.dirty holds the resident pages
+# written since they were loaded, and evicting one of them costs a write-back.
+class ReplacementPolicy:
+    name = None
+    needs_future = False
+
+    def __init__(self, frames):
+        self.frames = frames
+        self.victim = None
+        self.pinned = None  # never chosen as a victim while set (a demanded page during read-ahead)
+        self.hits = self.faults = self.evictions = self.probes = 0
+        self.dirty = set()
+        self.writes = self.write_backs = 0
+
+    def access_rw(self, page, next_use=None, write=False):
+        fault = self.access(page, next_use)
+        if fault and self.victim in self.dirty:
+            self.dirty.discard(self.victim)
+            self.write_backs += 1
+        if write:
+            self.writes += 1
+            self.dirty.add(page)
+        return fault
+
+    def get_state(self):
+        # Plain lists and numbers only, so checkpoints can be written as JSON
+        return {"name": self.name, "frames": self.frames,
+                "counters": [self.hits, self.faults, self.evictions, self.probes],
+                "resident": self.save_resident()}
+
+    def set_state(self, state):
+        if state["name"] != self.name or state["frames"] != self.frames:
+            raise ValueError(f"Checkpoint is for {state['name']} with {state['frames']} frames")
+        self.hits, self.faults, self.evictions, self.probes = state["counters"]
+        self.load_resident(state["resident"])
+
+class FIFOPolicy(ReplacementPolicy):
+    name = "FIFO"
+
+    def __init__(self, frames):
+        super().__init__(frames)
+        self.queue = deque()
+        self.resident = set()
+
+    def access(self, page, next_use=None):
+        if page in self.resident:
+            self.hits += 1
+            return False
+        self.faults += 1
+        self.victim = None
+        if len(self.queue) >= self.frames:
+            self.victim = self.queue.popleft()
+            if self.victim == self.pinned:
+                # The pinned page keeps its place at the head; the next oldest goes instead
+                self.victim = self.queue.popleft()
+                self.queue.appendleft(self.pinned)
+            self.resident.discard(self.victim)
+            self.evictions += 1
+            self.probes += 1
+        self.queue.append(page)
+        self.resident.add(page)
+        return True
+
+    def memory(self):
+        return list(self.queue)
+
+    def __contains__(self, page):
+        return page in self.resident
+
+    def save_resident(self):
+        return list(self.queue)
+
+    def load_resident(self, resident):
+        self.queue = deque(resident)
+        self.resident = set(resident)
+
+    @staticmethod
+    def resident_key(resident):
+        # The part of a saved state that decides all future faults
+        return tuple(resident)
+
+class LRUPolicy(ReplacementPolicy):
+    name = "LRU"
+
+    def __init__(self, frames):
+        super().__init__(frames)
+        self.slots = {}  # frame order: insertion order, untouched by hits
+        self.recency = OrderedDict()  # least recently used first
+
+    def access(self, page, next_use=None):
+        if page in self.slots:
+            self.recency.move_to_end(page)
+            self.hits += 1
+            return False
+        self.faults += 1
+        self.victim = None
+        if len(self.slots) >= self.frames:
+            self.victim, _ = self.recency.popitem(last=False)
+            del self.slots[self.victim]
+            self.evictions += 1
+            self.probes += 1
+        self.slots[page] = None
+        self.recency[page] = None
+        return True
+
+    def memory(self):
+        return list(self.slots)
+
+    def __contains__(self, page):
+        return page in self.slots
+
+    def save_resident(self):
+        return {"slots": list(self.slots), "recency": list(self.recency)}
+
+    def load_resident(self, resident):
+        self.slots = dict.fromkeys(resident["slots"])
+        self.recency = OrderedDict.fromkeys(resident["recency"])
+
+    @staticmethod
+    def resident_key(resident):
+        return tuple(resident["recency"])
+
+class OptimalPolicy(ReplacementPolicy):
+    name = "Optimal"
+    needs_future = True
+
+    def __init__(self, frames):
+        super().__init__(frames)
+        self.slots = {}  # page -> insertion sequence, in frame order
+        self.next_use = {}
+        self.heap = []  # (-next_use, sequence, page) with lazily discarded stale entries
+        self.sequence = 0
+
+    def access(self, page, next_use):
+        slots = self.slots
+        if page in slots:
+            self.next_use[page] = next_use
+            heapq.heappush(self.heap, (-next_use, slots[page], page))
+            self.hits += 1
+            if len(self.heap) > 4 * self.frames + 1024:
+                self.compact()
+            return False
+        self.faults += 1
+        self.victim = None
+        if len(slots) >= self.frames:
+            # Farthest next use wins; pages never used again tie-break on frame order
+            held = None
+            while True:
+                entry = heapq.heappop(self.heap)
+                neg_next, sequence, candidate = entry
+                self.probes += 1
+                if slots.get(candidate) == sequence and self.next_use[candidate] == -neg_next:
+                    if candidate != self.pinned:
+                        break
+                    held = entry
+            if held is not None:
+                heapq.heappush(self.heap, held)
+            del slots[candidate]
+            del self.next_use[candidate]
+            self.victim = candidate
+            self.evictions += 1
+        slots[page] = self.sequence
+        self.next_use[page] = next_use
+        heapq.heappush(self.heap, (-next_use, self.sequence, page))
+        self.sequence += 1
+        return True
+
+    def compact(self):
+        self.heap = [(-self.next_use[page], sequence, page) for page, sequence in self.slots.items()]
+        heapq.heapify(self.heap)
+
+    def memory(self):
+        return list(self.slots)
+
+    def __contains__(self, page):
+        return page in self.slots
+
+    def save_resident(self):
+        return {"slots": [[page, sequence, self.next_use[page]] for page, sequence in self.slots.items()],
+                "sequence": self.sequence}
+
+    def load_resident(self, resident):
+        self.slots = {page: sequence for page, sequence, _ in resident["slots"]}
+        self.next_use = {page: next_use for page, _, next_use in resident["slots"]}
+        self.sequence = resident["sequence"]
+        self.compact()
+
+    @staticmethod
+    def resident_key(resident):
+        # Next uses follow from the trace, and ties only pick among pages never used again
+        return frozenset(page for page, _, _ in resident["slots"])
+
+# Dirty-aware policies. They read the modified bits from self.dirty, so on a trace without
+# writes ESC is plain second chance and NRU goes by reference bits alone.
+NRU_INTERVAL = 100  # references between clears of NRU's reference bits (the clock interrupt)
+
+class EnhancedSecondChancePolicy(ReplacementPolicy):
+    name = "ESC"
+
+    def __init__(self, frames):
+        super().__init__(frames)
+        self.ring = []  # clock order; the new page takes its victim's slot
+        self.hand = 0
+        self.referenced = {}  # page -> reference bit, in frame order
+
+    def access(self, page, next_use=None):
+        referenced = self.referenced
+        if page in referenced:
+            referenced[page] = True
+            self.hits += 1
+            return False
+        self.faults += 1
+        self.victim = None
+        ring = self.ring
+        if len(ring) < self.frames:
+            ring.append(page)
+        else:
+            # Sweeps alternate between an unreferenced clean page (changing nothing) and an
+            # unreferenced dirty page (clearing reference bits as they pass). After the second
+            # sweep every bit is clear, so the third finds any clean page; if every page is dirty,
+            # the fourth takes the page at the hand. At most three full sweeps plus one probe (two
+            # when the pinned page is at the hand, as it is never taken).
+            dirty, want_dirty, scanned = self.dirty, False, 0
+            while True:
+                candidate = ring[self.hand]
+                self.probes += 1
+                if not referenced[candidate] and (candidate in dirty) == want_dirty and candidate != self.pinned:
+                    break
+                if want_dirty:
+                    referenced[candidate] = False
+                self.hand = (self.hand + 1) % len(ring)
+                scanned += 1
+                if scanned == len(ring):
+                    want_dirty, scanned = not want_dirty, 0
+            del referenced[candidate]
+            ring[self.hand] = page
+            self.hand = (self.hand + 1) % len(ring)
+            self.victim = candidate
+            self.evictions += 1
+        referenced[page] = True
+        return True
+
+    def memory(self):
+        return list(self.referenced)
+
+    def __contains__(self, page):
+        return page in self.referenced
+
+class NRUPolicy(ReplacementPolicy):
+    # Evicts from the lowest (referenced, modified) class; ties go to the page loaded first
+    name = "NRU"
+
+    def __init__(self, frames):
+        super().__init__(frames)
+        self.referenced = {}  # page -> reference bit, in frame order
+        self.clock = 0
+
+    def access(self, page, next_use=None):
+        self.clock += 1
+        if self.clock % NRU_INTERVAL == 0:
+            self.referenced = dict.fromkeys(self.referenced, False)
+        referenced = self.referenced
+        if page in referenced:
+            referenced[page] = True
+            self.hits += 1
+            return False
+        self.faults += 1
+        self.victim = None
+        if len(referenced) >= self.frames:
+            dirty = self.dirty
+            pinned = self.pinned
+            self.victim = min((candidate for candidate in referenced if candidate != pinned),
+                              key=lambda candidate: 2 * referenced[candidate] + (candidate in dirty))
+            self.probes += len(referenced)
+            del referenced[self.victim]
+            self.evictions += 1
+        referenced[page] = True
+        return True
+
+    def memory(self):
+        return list(self.referenced)
+
+    def __contains__(self, page):
+        return page in self.referenced
+
+POLICIES = {"FIFO": FIFOPolicy, "LRU": LRUPolicy, "Optimal": OptimalPolicy}
+DIRTY_POLICIES = {"ESC": EnhancedSecondChancePolicy, "NRU": NRUPolicy}
+ACCESS_POLICIES = {**POLICIES, **DIRTY_POLICIES}  # everything simulate_access and compare can run on R/W traces
+
+def make_policies(algorithms, frames):
+    return [POLICIES[algo](frames) for algo in algorithms]
+
+def prepare_trace(pages, need_future):
+    # Shared per-trace work: one interning pass and, only if a policy needs it, one next-use pass.
+    # Returns (references, next_use, page_table); references are ids when a page table is returned.
+    if not need_future:
+        return pages, None, None
+    ids, page_table = intern_pages(pages)
+    return ids, compute_next_use(ids, len(page_table)), page_table
+
+def run_lockstep(policies, references, next_use=None, report=True):
+    # A single pass over the trace advances every policy by one reference at a time
+    accesses = [policy.access for policy in policies]
+    if next_use is None:
+        for page in references:
+            for access in accesses:
+                access(page)
+    else:
+        for page, page_next_use in zip(references, next_use):
+            for access in accesses:
+                access(page, page_next_use)
+    if report:
+        report_policies(policies)
+    return policies
+
+def run_dirty(policies, accesses, next_use=None, report=True):
+    # run_lockstep over (page, write) pairs, with dirty bits and write-backs counted per policy
+    access_rws = [policy.access_rw for policy in policies]
+    for i, (page, write) in enumerate(accesses):
+        page_next_use = next_use[i] if next_use is not None else None
+        for access_rw in access_rws:
+            access_rw(page, page_next_use, write)
+    if report:
+        report_policies(policies)
+    return policies
+
+def simulate_access(pages, writes, frames, algorithm):
+    # simulate_* style results for a trace with writes, for any of ACCESS_POLICIES. Frames are
+    # shown in the simulate_* order (a victim is removed, the new page appended); written pages
+    # are marked with *. Returns (result, page_faults, gantt_data, faults, policy).
+    policy = ACCESS_POLICIES[algorithm](frames)
+    references, next_use, page_table = prepare_trace(pages, policy.needs_future)
+    memory, result, gantt_data, faults = [], [], [], []
+    for i, (page, write) in enumerate(zip(pages, writes)):
+        write_backs = policy.write_backs
+        fault = policy.access_rw(references[i], next_use[i] if next_use is not None else None, write)
+        if fault:
+            if policy.victim is not None:
+                memory.remove(page_table[policy.victim] if page_table is not None else policy.victim)
+            memory.append(page)
+        dirty = {page_table[resident] for resident in policy.dirty} if page_table is not None else policy.dirty
+        memory_padded = memory + [None] * (frames - len(memory))
+        shown = ", ".join("None" if resident is None else format_page(resident) + ("*" if resident in dirty else "") for resident in memory_padded)
+        outcome = "Fault" if fault else "Hit"
+        if policy.write_backs > write_backs:
+            outcome += " (write-back)"
+        result.append(f"Page: {format_page(page) + ('w' if write else ''):>3} | Memory: [{shown}] | {outcome}")
+        gantt_data.append((i, memory_padded, page))
+        faults.append(fault)
+    return result, policy.faults, gantt_data, faults, policy
+
+def dirty_report_line(policy):
+    # Faults split by what they evicted: nothing (a free frame), a clean page or a dirty one
+    clean = policy.evictions - policy.write_backs
+    return (f"{policy.name:8s} faults={policy.faults} (cold={policy.faults - policy.evictions} clean={clean} "
+            f"dirty={policy.write_backs}) hits={policy.hits} writes={policy.writes} write_backs={policy.write_backs} "
+            f"dirty_resident={len(policy.dirty)}")
+
+def report_policies(policies):
+    if _instrumentation:
+        _instrumentation.record_policies(policies)
+    if engine_log.isEnabledFor(logging.DEBUG):
+        engine_log.debug("Lockstep run finished: %s", ", ".join(f"{policy.name}={policy.faults} faults" for policy in policies))
+
+def compare_policies(pages, algorithms, frames):
+    policies = make_policies(algorithms, frames)
+    if use_kernels(policies, pages):
+        with phase("parse"):
+            ids, next_use = intern_trace_array(pages)
+        with phase("simulate"):
+            run_kernels(policies, ids, next_use)
+        return {policy.name: policy.faults for policy in policies}
+    with phase("parse"):
+        references, next_use, _ = prepare_trace(pages, any(policy.needs_future for policy in policies))
+    with phase("simulate"):
+        run_lockstep(policies, references, next_use)
+    return {policy.name: policy.faults for policy in policies}
+
+# Prefetching. PrefetchPolicy wraps any policy: after each demand reference its prefetcher
+# proposes pages, and those not resident are loaded through the base policy as if referenced
+# (at most frames - 1 per reference). The demanded page is pinned meanwhile, so the base
+# policy never picks it as a victim for its own read-ahead. run_prefetch runs the unwrapped policies in the same lockstep pass, so every
+# wrapper is reported against its baseline. Accuracy is the share of prefetched pages used
+# before eviction; coverage is the share of demand references that would have faulted and
+# were instead served by a prefetch (useful / (useful + demand faults)).
+PREFETCH_DEGREE = 2
+PREFETCH_TABLE = 1 << 16  # pages remembered by the Markov prefetcher
+
+class SequentialPrefetcher:
+    # Read-ahead: a demand fault, or the first use of a prefetched page, fetches the next pages
+    def __init__(self, degree):
+        self.degree = degree
+
+    def candidates(self, page, trigger):
+        return range(page + 1, page + 1 + self.degree) if trigger else ()
+
+class StridePrefetcher:
+    # Two equal strides in a row between demand references predict the next pages on that stride
+    def __init__(self, degree):
+        self.degree = degree
+        self.last = self.stride = None
+
+    def candidates(self, page, trigger):
+        predicted = ()
+        if self.last is not None:
+            stride = page - self.last
+            if stride and stride == self.stride:
+                predicted = [page + stride * k for k in range(1, self.degree + 1)]
+            self.stride = stride
+        self.last = page
+        return predicted
+
+class MarkovPrefetcher:
+    # First-order history: each page keeps the last `degree` distinct pages that followed it
+    def __init__(self, degree, table_size=PREFETCH_TABLE):
+        self.degree = degree
+        self.table_size = table_size
+        self.table = OrderedDict()  # least recently updated first
+        self.last = None
+
+    def candidates(self, page, trigger):
+        if self.last is not None:
+            successors = self.table.setdefault(self.last, [])
+            if page in successors:
+                successors.remove(page)
+            successors.insert(0, page)
+            del successors[self.degree:]
+            self.table.move_to_end(self.last)
+            if len(self.table) > self.table_size:
+                self.table.popitem(last=False)
+        self.last = page
+        return list(self.table.get(page, ()))
+
+PREFETCHERS = {"sequential": SequentialPrefetcher, "stride": StridePrefetcher, "markov": MarkovPrefetcher}
+
+class PrefetchPolicy(ReplacementPolicy):
+    # hits/faults count demand references only; evictions and probes include prefetch loads
+    def __init__(self, base, prefetcher, degree=PREFETCH_DEGREE, baseline=None, page_table=None, upcoming=None, never=None):
+        super().__init__(base.frames)
+        self.name = f"{base.name}+{prefetcher}"
+        self.needs_future = base.needs_future
+        self.base = base
+        self.baseline = baseline
+        self.prefetcher = PREFETCHERS[prefetcher](min(degree, base.frames - 1))
+        self.prefetched = set()  # resident pages loaded by prefetch and not yet used
+        self.issued = self.useful = self.wasted = self.unused_frame_steps = 0
+        # Pages are ids when the base needs the future; prefetched pages then need an id and a
+        # next use too. upcoming[id] is the id's next reference after the current one.
+        self.page_table = page_table
+        self.upcoming = upcoming
+        self.never = never
+        if page_table is not None:
+            self.page_ids = {page: page_id for page_id, page in enumerate(page_table)}
+
+    def access(self, page, next_use=None):
+        base, prefetched = self.base, self.prefetched
+        fault = base.access(page, next_use)
+        self.victim = base.victim if fault else None
+        if fault:
+            self.faults += 1
+            self.discard_prefetched(base.victim)
+        else:
+            self.hits += 1
+        trigger = fault or page in prefetched
+        if page in prefetched:
+            prefetched.discard(page)
+            self.useful += 1
+        base.pinned = page
+        page_table = self.page_table
+        if page_table is not None:
+            self.upcoming[page] = next_use
+            page = page_table[page]
+        for candidate in self.prefetcher.candidates(page, trigger):
+            candidate_next_use = None
+            if page_table is not None:
+                candidate = self.page_id(candidate)
+                candidate_next_use = self.upcoming[candidate]
+            if candidate in base:
+                continue
+            base.access(candidate, candidate_next_use)
+            self.discard_prefetched(base.victim)
+            prefetched.add(candidate)
+            self.issued += 1
+        base.pinned = None
+        self.unused_frame_steps += len(prefetched)
+        self.evictions, self.probes = base.evictions, base.probes
+        return fault
+
+    def page_id(self, page):
+        page_id = self.page_ids.get(page)
+        if page_id is None:
+            # A page the trace never references: a new id that is never used again
+            page_id = self.page_ids[page] = len(self.page_table)
+            self.page_table.append(page)
+            self.upcoming.append(self.never)
+        return page_id
+
+    def discard_prefetched(self, victim):
+        if victim in self.prefetched:
+            self.prefetched.discard(victim)
+            self.wasted += 1
+
+    def memory(self):
+        return self.base.memory()
+
+    def __contains__(self, page):
+        return page in self.base
+
+def prefetch_policies(pages, algorithms, frames, prefetchers, degree=PREFETCH_DEGREE):
+    # (baselines, wrappers, references, next_use): one PrefetchPolicy per (algorithm, prefetcher),
+    # each with its unwrapped policy as .baseline, and the trace as the policies take it
+    if is_tagged(pages):
+        raise ValueError("Prefetching needs plain page numbers, not pid:page references")
+    baselines = [ACCESS_POLICIES[algo](frames) for algo in algorithms]
+    need_future = any(policy.needs_future for policy in baselines)
+    with phase("parse"):
+        references, next_use, page_table = prepare_trace(pages, need_future)
+        upcoming = None
+        if need_future:
+            # First reference of each id, the next use of a page prefetched before it is demanded
+            upcoming = [len(references)] * len(page_table)
+            for i in range(len(references) - 1, -1, -1):
+                upcoming[references[i]] = i
+    wrapped = [PrefetchPolicy(ACCESS_POLICIES[baseline.name](frames), prefetcher, degree, baseline,
+                              list(page_table) if need_future else None, list(upcoming) if need_future else None,
+                              len(references))
+               for baseline in baselines for prefetcher in prefetchers]
+    return baselines, wrapped, references, next_use
+
+def run_prefetch(pages, algorithms, frames, prefetchers, degree=PREFETCH_DEGREE):
+    # Returns the PrefetchPolicy wrappers after one lockstep pass with their baselines
+    baselines, wrapped, references, next_use = prefetch_policies(pages, algorithms, frames, prefetchers, degree)
+    with phase("simulate"):
+        run_lockstep(baselines + wrapped, references, next_use)
+    return wrapped
+
+def prefetch_report(policy):
+    references = policy.hits + policy.faults
+    demand = policy.useful + policy.faults
+    return {"algorithm": policy.name, "demand_faults": policy.faults, "baseline_faults": policy.baseline.faults,
+            "net_faults": policy.faults - policy.baseline.faults, "issued": policy.issued, "useful": policy.useful,
+            "accuracy": policy.useful / policy.issued if policy.issued else 0.0,
+            "coverage": policy.useful / demand if demand else 0.0,
+            "wasted": policy.wasted, "unused_resident": len(policy.prefetched),
+            "wasted_frames": policy.unused_frame_steps / references if references else 0.0}
+
+def prefetch_report_line(report):
+    return (f"{report['algorithm']:18s} demand_faults={report['demand_faults']} baseline={report['baseline_faults']} "
+            f"net={report['net_faults']:+d} prefetched={report['issued']} useful={report['useful']} "
+            f"accuracy={report['accuracy'] * 100:.2f}% coverage={report['coverage'] * 100:.2f}% "
+            f"wasted={report['wasted']} mean_wasted_frames={report['wasted_frames']:.2f}")
+
+# Compiled fault-count kernels. When Numba is installed, runs of at least JIT_MIN_REFERENCES
+# references count faults with these loops over dense page ids (from intern_trace_array) instead
+# of the policy objects; shorter runs stay in Python so they never wait for compilation. The
+# kernels are plain functions over preallocated arrays, compiled on first use and cached on
+# disk. They return (faults, probes) and agree with the policies on every fault count (see
+# `bench kernels`); PAGESIM_JIT=0 turns them off.
+JIT_MIN_REFERENCES = 50_000
+_kernels = None
+
+def _fifo_kernel(ids, resident, queue, frames):
+    head = size = faults = 0
+    for page in ids:
+        if resident[page]:
+            continue
+        faults += 1
+        if size == frames:
+            resident[queue[head]] = False
+            queue[head] = page
+            head = (head + 1) % frames
+        else:
+            queue[size] = page
+            size += 1
+        resident[page] = True
+    return faults, max(faults - frames, 0)
+
+def _lru_kernel(ids, resident, older, newer, frames):
+    # Recency list threaded through older/newer links per page; head is least recently used
+    head = tail = -1
+    size = faults = 0
+    for page in ids:
+        if resident[page]:
+            if page != tail:
+                if older[page] >= 0:
+                    newer[older[page]] = newer[page]
+                else:
+                    head = newer[page]
+                older[newer[page]] = older[page]
+                older[page], newer[page] = tail, -1
+                newer[tail] = page
+                tail = page
+            continue
+        faults += 1
+        if size == frames:
+            victim = head
+            head = newer[victim]
+            if head >= 0:
+                older[head] = -1
+            else:
+                tail = -1
+            resident[victim] = False
+        else:
+            size += 1
+        older[page], newer[page] = tail, -1
+        if tail >= 0:
+            newer[tail] = page
+        else:
+            head = page
+        tail = page
+        resident[page] = True
+    return faults, max(faults - frames, 0)
+
+def _optimal_kernel(ids, next_use, resident, current, slots, heap_keys, heap_pages, frames):
+    # Max-heap of (next use, page) with lazily discarded stale entries, compacted from the
+    # resident slots like OptimalPolicy. Pages never used again tie, and any of them is as good.
+    size = count = faults = probes = 0
+    for i in range(len(ids)):
+        page = ids[i]
+        if resident[page] < 0:
+            faults += 1
+            if size == frames:
+                while True:
+                    probes += 1
+                    key, victim = heap_keys[0], heap_pages[0]
+                    count -= 1
+                    last_key, last_page = heap_keys[count], heap_pages[count]
+                    position = 0
+                    while True:
+                        child = 2 * position + 1
+                        if child >= count:
+                            break
+                        if child + 1 < count and heap_keys[child + 1] > heap_keys[child]:
+                            child += 1
+                        if heap_keys[child] <= last_key:
+                            break
+                        heap_keys[position], heap_pages[position] = heap_keys[child], heap_pages[child]
+                        position = child
+                    heap_keys[position], heap_pages[position] = last_key, last_page
+                    if resident[victim] >= 0 and current[victim] == key:
+                        break
+                slot = resident[victim]
+                resident[victim] = -1
+            else:
+                slot = size
+                size += 1
+            slots[slot] = page
+            resident[page] = slot
+        current[page] = next_use[i]
+        if count == len(heap_keys):
+            # Compact: rebuild the heap from the resident pages only
+            count = 0
+            for slot in range(size):
+                resident_page = slots[slot]
+                key = current[resident_page]
+                position = count
+                count += 1
+                while position > 0 and heap_keys[(position - 1) // 2] < key:
+                    heap_keys[position], heap_pages[position] = heap_keys[(position - 1) // 2], heap_pages[(position - 1) // 2]
+                    position = (position - 1) // 2
+                heap_keys[position], heap_pages[position] = key, resident_page
+            continue  # the rebuilt heap already holds this page's new next use
+        position = count
+        count += 1
+        key = next_use[i]
+        while position > 0 and heap_keys[(position - 1) // 2] < key:
+            heap_keys[position], heap_pages[position] = heap_keys[(position - 1) // 2], heap_pages[(position - 1) // 2]
+            position = (position - 1) // 2
+        heap_keys[position], heap_pages[position] = key, page
+    return faults, probes
+
+def load_kernels():
+    # {algorithm: compiled kernel}, empty when Numba is missing or disabled
+    global _kernels
+    if _kernels is None:
+        if os.environ.get("PAGESIM_JIT", "1") == "0" or importlib.util.find_spec("numba") is None:
+            _kernels = {}
+        else:
+            numba = importlib.import_module("numba")
+            with phase("compile"):
+                _kernels = {algo: numba.njit(cache=True, nogil=True)(kernel)
+                            for algo, kernel in (("FIFO", _fifo_kernel), ("LRU", _lru_kernel), ("Optimal", _optimal_kernel))}
+                # Numba compiles (or loads its cache) on the first call, so make that call here
+                # on a tiny trace; otherwise the JIT time would be booked under "simulate"
+                run_kernels(make_policies(list(_kernels), 1), *intern_trace_array([0, 1, 0]), report=False)
+            engine_log.debug("Loaded Numba kernels for %s", ", ".join(_kernels))
+    return _kernels
+
+def use_kernels(policies, pages):
+    return (len(pages) >= JIT_MIN_REFERENCES and not is_tagged(pages)
+            and all(policy.name in load_kernels() for policy in policies))
+
+def run_kernels(policies, ids, next_use, report=True):
+    # Sets the counters of fresh policies from the kernels; their resident state is not filled in
+    kernels = load_kernels()
+    pages = int(ids.max()) + 1 if len(ids) else 0
+    for policy in policies:
+        frames = policy.frames
+        if policy.name == "FIFO":
+            faults, probes = kernels["FIFO"](ids, np.zeros(pages, dtype=np.bool_), np.empty(frames, dtype=np.int64), frames)
+        elif policy.name == "LRU":
+            faults, probes = kernels["LRU"](ids, np.zeros(pages, dtype=np.bool_), np.empty(pages, dtype=np.int64),
+                                            np.empty(pages, dtype=np.int64), frames)
+        else:
+            heap = 4 * frames + 1024
+            faults, probes = kernels["Optimal"](ids, next_use, np.full(pages, -1, dtype=np.int64), np.zeros(pages, dtype=np.int64),
+                                                np.empty(frames, dtype=np.int64), np.empty(heap, dtype=np.int64),
+                                                np.empty(heap, dtype=np.int64), frames)
+        policy.hits, policy.faults, policy.evictions, policy.probes = len(ids) - faults, faults, max(faults - frames, 0), probes
+    if report:
+        report_policies(policies)
+    return policies
+
+CHECKPOINT_VERSION = 1
+BATCH_CHECKPOINT = "batch_checkpoint.jsonl"
+
+def save_checkpoint(path, policies, offset, digest, length):
+    # gzip'd JSON written to a temporary file first, so a crash mid-write keeps the old checkpoint
+    state = {"version": CHECKPOINT_VERSION, "offset": offset, "digest": digest, "length": length,
+             "policies": [policy.get_state() for policy in policies]}
+    temp_path = f"{path}.tmp"
+    with gzip.open(temp_path, "wt", encoding="utf-8") as f:
+        json.dump(state, f, separators=(",", ":"))
+    os.replace(temp_path, path)
+
+def load_checkpoint(path):
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        state = json.load(f)
+    if state.get("version") != CHECKPOINT_VERSION:
+        raise ValueError(f"Unsupported checkpoint version {state.get('version')}")
+    return state
+
+def run_resumable(pages, algorithms, frames, checkpoint_path, every=1 << 20, stop_after=None, resume=True):
+    # Runs the lockstep engine in slices of `every` references and checkpoints after each one.
+    # A rerun skips the references already consumed; stop_after ends a run early so one trace
+    # can be split across several invocations or machines. Returns (policies, offset, done).
+    policies = make_policies(algorithms, frames)
+    need_future = any(policy.needs_future for policy in policies)
+    with phase("parse"):
+        references, next_use, _ = prepare_trace(list(pages) if need_future else pages, need_future)
+    length = len(references) if need_future else None
+    state = load_checkpoint(checkpoint_path) if resume and os.path.exists(checkpoint_path) else None
+    if state:
+        if [policy_state["name"] for policy_state in state["policies"]] != [policy.name for policy in policies]:
+            raise ValueError("Checkpoint was written for different algorithms")
+        if state["length"] != length:
+            raise ValueError("Checkpoint was written for a different trace")
+        for policy, policy_state in zip(policies, state["policies"]):
+            policy.set_state(policy_state)
+    target = state["offset"] if state else 0
+    offset, consumed, done = 0, hashlib.blake2b(digest_size=16), True
+    chunks = iter_reference_chunks(references, every)
+    with phase("simulate"):
+        for chunk in chunks:
+            if offset < target:
+                # The consumed prefix is only hashed, to check this is the checkpointed trace
+                skipped = chunk[:target - offset]
+                consumed.update(skipped.tobytes())
+                offset += len(skipped)
+                if offset == target and consumed.hexdigest() != state["digest"]:
+                    raise ValueError("Checkpoint was written for a different trace")
+                chunk = chunk[len(skipped):]
+            if stop_after is not None and offset + len(chunk) >= target + stop_after:
+                # A cut exactly at the end of the trace still finishes the run
+                remaining = offset + len(chunk) > target + stop_after or next(chunks, None) is not None
+                chunk, done = chunk[:target + stop_after - offset], not remaining
+            if len(chunk):
+                run_lockstep(policies, chunk.tolist(), next_use[offset:offset + len(chunk)] if need_future else None, report=False)
+                consumed.update(chunk.tobytes())
+                offset += len(chunk)
+                save_checkpoint(checkpoint_path, policies, offset, consumed.hexdigest(), length)
+            if not done:
+                break
+    if offset < target:
+        raise ValueError("Checkpoint was written for a different trace")
+    if done and os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+    report_policies(policies)
+    return policies, offset, done
+
+def simulate_steps(pages, frames, algorithm):
+    # Runs one policy and logs only whether each reference faulted and which page it evicted
+    policy = POLICIES[algorithm](frames)
+    with phase("parse"):
+        references, next_use, page_table = prepare_trace(pages, policy.needs_future)
+    with phase("simulate"):
+        access = policy.access
+        fault_flags, victims = [], []
+        for i, page in enumerate(references):
+            fault = access(page, next_use[i] if next_use is not None else None)
+            fault_flags.append(fault)
+            victims.append(policy.victim if fault else None)
+        if page_table is not None:
+            victims = [page_table[victim] if victim is not None else None for victim in victims]
+    if _instrumentation:
+        _instrumentation.record_policies([policy])
+    return fault_flags, victims
+
+# Compact per-step storage. Fault flags are bit-packed; frame contents are kept as a keyframe
+# every KEYFRAME_INTERVAL steps plus, per fault, the frame position the victim was removed from
+# (the new page is always appended, as in the simulate_* functions). Any step is decoded from
+# its keyframe, so memory grows with faults rather than with steps x frames.
+NO_PAGE = -(1 << 63)  # an empty frame in keyframes
+KEYFRAME_INTERVAL = 256
+ITER_CHUNK = 1 << 16
+
+def iter_array(array):
+    # Python scalars from a NumPy array without materialising the whole list at once
+    for start in range(0, len(array), ITER_CHUNK):
+        yield from array[start:start + ITER_CHUNK].tolist()
+
+class FaultBits:
+    # Indexes, slices and iterates like the list of bools it replaces
+    def __init__(self, bits, length):
+        self.bits = bits
+        self.length = length
+
+    @classmethod
+    def pack(cls, flags):
+        return cls(np.packbits(np.asarray(flags, dtype=bool)), len(flags))
+
+    def __len__(self):
+        return self.length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self.array()[index].tolist()
+        if index < 0:
+            index += self.length
+        if not 0 <= index < self.length:
+            raise IndexError("step index out of range")
+        return bool((int(self.bits[index >> 3]) >> (7 - (index & 7))) & 1)
+
+    def __iter__(self):
+        for start in range(0, self.length, ITER_CHUNK):
+            chunk = self.bits[start >> 3:(start + ITER_CHUNK) >> 3]
+            yield from np.unpackbits(chunk, count=min(ITER_CHUNK, self.length - start)).astype(bool).tolist()
+
+    def array(self):
+        return np.unpackbits(self.bits, count=self.length).astype(bool)
+
+    def count(self):
+        return int(np.unpackbits(self.bits, count=self.length).sum(dtype=np.int64))
+
+class StepHistory:
+    # Stands in for gantt_data: len(), history[i] and iteration give (step, memory_padded, page)
+    fields = ("pages", "fault_bits", "positions", "keyframes", "keyframe_faults")
+
+    def __init__(self, frames, length, pages, fault_bits, positions, keyframes, keyframe_faults, blocks=()):
+        self.frames = frames
+        self.length = length
+        self.pages = pages
+        self.fault_bits = fault_bits
+        self.positions = positions
+        self.keyframes = keyframes
+        self.keyframe_faults = keyframe_faults
+        self.faults = FaultBits(fault_bits, length)
+        self.blocks = list(blocks)  # shared memory behind the arrays, if attached
+        self.users = 0  # windows holding this history; see acquire/release
+
+    @classmethod
+    def record(cls, pages, frames, fault_flags, victims):
+        # Rebuilds the per-step memory layout of the simulate_* functions from a fault/eviction log
+        if is_tagged(pages):
+            raise ValueError("pid:page references are simulated with the multi-process engine")
+        with phase("record"):
+            memory, positions, keyframes, keyframe_faults = [], [], [], []
+            for i, (page, fault, victim) in enumerate(zip(pages, fault_flags, victims)):
+                if fault:
+                    if victim is None:
+                        positions.append(-1)
+                    else:
+                        position = memory.index(victim)
+                        del memory[position]
+                        positions.append(position)
+                    memory.append(page)
+                if i % KEYFRAME_INTERVAL == 0:
+                    keyframes.append(memory + [NO_PAGE] * (frames - len(memory)))
+                    keyframe_faults.append(len(positions))
+            return cls(frames, len(pages), np.asarray(pages, dtype=np.int64), np.packbits(np.asarray(fault_flags, dtype=bool)),
+                       np.asarray(positions, dtype=np.int32), np.asarray(keyframes, dtype=np.int64).reshape(-1, frames),
+                       np.asarray(keyframe_faults, dtype=np.int64))
+
+    @classmethod
+    def build(cls, pages, frames, algorithm):
+        return cls.record(pages, frames, *simulate_steps(pages, frames, algorithm))
+
+    def __len__(self):
+        return self.length
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self.length
+        if not 0 <= index < self.length:
+            raise IndexError("step index out of range")
+        keyframe = index // KEYFRAME_INTERVAL
+        memory = [page for page in self.keyframes[keyframe].tolist() if page != NO_PAGE]
+        next_fault = int(self.keyframe_faults[keyframe])
+        faults, pages = self.faults, self.pages
+        for step in range(keyframe * KEYFRAME_INTERVAL + 1, index + 1):
+            if faults[step]:
+                position = int(self.positions[next_fault])
+                next_fault += 1
+                if position >= 0:
+                    del memory[position]
+                memory.append(int(pages[step]))
+        return index, memory + [None] * (self.frames - len(memory)), int(pages[index])
+
+    def __iter__(self):
+        memory, positions = [], iter_array(self.positions)
+        for i, (page, fault) in enumerate(zip(iter_array(self.pages), self.faults)):
+            if fault:
+                position = next(positions)
+                if position >= 0:
+                    del memory[position]
+                memory.append(page)
+            yield i, memory + [None] * (self.frames - len(memory)), page
+
+    def lines(self):
+        # The result lines of the simulate_* functions, generated on demand
+        for (_, memory_padded, page), fault in zip(self, self.faults):
+            yield f"Page: {page:2d} | Memory: {memory_padded} | {'Fault' if fault else 'Hit'}"
+
+    def fault_count(self):
+        return self.faults.count()
+
+    def step_columns(self, chunk_size=ITER_CHUNK, evicted=True):
+        # Per-step columns in chunks: step, page, fault and, if asked for, the evicted page (or NO_PAGE)
+        flags, memory, positions = self.faults.array(), [], iter_array(self.positions)
+        for start in range(0, self.length, chunk_size):
+            stop = min(start + chunk_size, self.length)
+            columns = {"step": np.arange(start, stop, dtype=np.int64), "page": self.pages[start:stop], "fault": flags[start:stop]}
+            if evicted:
+                victims = np.full(stop - start, NO_PAGE, dtype=np.int64)
+                for offset, (page, fault) in enumerate(zip(columns["page"].tolist(), columns["fault"].tolist())):
+                    if fault:
+                        position = next(positions)
+                        if position >= 0:
+                            victims[offset] = memory.pop(position)
+                        memory.append(page)
+                columns["evicted"] = victims
+            yield columns
+
+    def occupancy(self):
+        # Frames in use after each step: only faults that filled a free frame add one
+        fills = np.zeros(self.length, dtype=np.int64)
+        fills[np.flatnonzero(self.faults.array())[self.positions == -1]] = 1
+        return np.cumsum(fills)
+
+    def publish(self):
+        # Worker side: copy each array into a new shared memory block and return only the names
+        arrays = {}
+        for field in self.fields:
+            array = getattr(self, field)
+            block = shared_memory.SharedMemory(create=True, size=max(1, array.nbytes))
+            np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[:] = array
+            arrays[field] = (block.name, array.shape, array.dtype.str)
+            block.close()
+        return {"frames": self.frames, "length": self.length, "arrays": arrays}
+
+    @classmethod
+    def attach(cls, descriptor):
+        # Receiving side: zero-copy views, valid while this object (or close()) has not dropped them
+        arrays, blocks = {}, []
+        for field, (name, shape, dtype) in descriptor["arrays"].items():
+            block = shared_memory.SharedMemory(name=name)
+            block.unlink()  # the memory itself lives until this process closes the block
+            blocks.append(block)
+            arrays[field] = np.ndarray(shape, dtype=dtype, buffer=block.buf)
+        return cls(descriptor["frames"], descriptor["length"], blocks=blocks, **arrays)
+
+    def acquire(self):
+        self.users += 1
+        return self
+
+    def release(self):
+        # The shared memory is closed once the last window holding this history is gone
+        self.users -= 1
+        if self.users <= 0:
+            self.close()
+
+    def close(self):
+        self.pages = self.fault_bits = self.positions = self.keyframes = self.keyframe_faults = self.faults = None
+        blocks, self.blocks = self.blocks, []
+        close_blocks(blocks)
+
+# Shared memory blocks that could not be closed yet because NumPy views of them are still alive
+_open_blocks = []
+
+def close_blocks(blocks):
+    # A destroyed window may keep views until it is garbage collected, so blocks still in use
+    # after a collection are left for the next call to retry
+    _open_blocks.extend(blocks)
+    for collect in (False, True):
+        if collect:
+            gc.collect()
+        for block in list(_open_blocks):
+            try:
+                block.close()
+            except BufferError:
+                continue
+            _open_blocks.remove(block)
+        if not _open_blocks:
+            return
+
+def release_on_destroy(window, histories):
+    # Releases the window's StepHistory holds when it is destroyed; histories is read only then,
+    # so a live dict view picks up histories added while the window is open
+    def release(event):
+        if event.widget == window:
+            for history in list(histories):
+                history.release()
+    window.bind("<Destroy>", release, add="+")
+
+def fault_flag_array(faults):
+    if isinstance(faults, FaultBits):
+        return faults.array().astype(np.int64)
+    return np.fromiter((1 if fault else 0 for fault in faults), dtype=np.int64, count=len(faults))
+
+def compute_step_metrics(faults, gantt_data, window_size=5):
+    # Per-step series derived from prefix sums, so any prefix of them is available in O(1)
+    fault_flags = fault_flag_array(faults)
+    cumulative = np.concatenate(([0], np.cumsum(fault_flags)))
+    steps = np.arange(len(fault_flags))
+    window_start = np.maximum(0, steps - window_size + 1)
+    fault_rate = (cumulative[steps + 1] - cumulative[window_start]) / (steps + 1 - window_start)
+    if isinstance(gantt_data, StepHistory):
+        utilization = gantt_data.occupancy()
+    else:
+        utilization = np.array([sum(1 for p in memory if p is not None) if memory else 0 for _, memory, _ in gantt_data])
+    return {"cumulative": cumulative, "fault_rate": fault_rate, "utilization": utilization}
+
+# Per-page charts (frequency, faults by page, timeline, heatmap) keep the CHART_TOP_PAGES
+# highest-ranked pages and fold the rest into one "Other" series. Counts come from np.bincount
+# over dense page indices, so the work is linear in the trace and the number of series drawn
+# is bounded however many distinct pages there are.
+CHART_TOP_PAGES = 20
+CHART_STEP_TICKS = 100  # longer runs leave the heatmap's time ticks to matplotlib
+STEP_BACKGROUNDS = 32  # forward steps the step-through window can undo without a full draw
+
+def page_indices(pages):
+    # Distinct pages in sorted order and the index of each reference among them
+    if len(pages) and not is_tagged(pages):
+        unique_pages, indices = np.unique(np.asarray(pages, dtype=np.int64), return_inverse=True)
+        return unique_pages.tolist(), indices.reshape(-1)
+    unique_pages = sorted(set(pages))
+    index = {page: i for i, page in enumerate(unique_pages)}
+    return unique_pages, np.fromiter((index[page] for page in pages), dtype=np.int64, count=len(pages))
+
+def top_pages(ranking, limit=CHART_TOP_PAGES):
+    # Indices of the highest-ranked pages in page order, and each page's series: its position
+    # among them, or len(top) for the pages folded into "Other"
+    if len(ranking) <= limit:
+        top = np.arange(len(ranking))
+    else:
+        top = np.sort(np.argsort(-np.asarray(ranking), kind="stable")[:limit])
+    slots = np.full(len(ranking), len(top), dtype=np.int64)
+    slots[top] = np.arange(len(top))
+    return top, slots
+
+def resident_indices(gantt_data, frames, unique_pages):
+    # Index of the page in each frame after each step (steps x frames), -1 for a free frame
+    index = {page: i for i, page in enumerate(unique_pages)}
+    resident = np.full((len(gantt_data), frames), -1, dtype=np.int32)
+    for time, memory, _ in gantt_data:
+        resident[time] = [index.get(page, -1) for page in memory]
+    return resident
+
+def resident_series(resident, slots, series):
+    # Frames held by each series at each step (series x steps), one bincount per frame
+    steps = len(resident)
+    counts, times = np.zeros(series * steps, dtype=np.int64), np.arange(steps, dtype=np.int64)
+    for column in resident.T:
+        held = column >= 0
+        counts += np.bincount(slots[column[held]] * steps + times[held], minlength=series * steps)
+    return counts.reshape(series, steps)
+
+# Step histories computed in worker processes come back through shared memory: only the block
+# names are pickled, and the receiving side wraps the blocks in NumPy views without copying.
+BACKGROUND_RUN_STEPS = 100_000  # GUI runs at least this long are simulated in a worker process
+BATCH_POOL_REFERENCES = 50_000  # batches with more references in total use a process pool
+MAX_DISPLAY_STEPS = 5000  # result lines shown in the output box; Save Results writes all of them
+
+def _run_steps_job(pages, frames, algorithm):
+    return StepHistory.build(pages, frames, algorithm).publish()
+
+def start_step_pool(workers):
+    # Workers must share this process's resource tracker; blocks they create are unlinked here
+    resource_tracker.ensure_running()
+    return futures.ProcessPoolExecutor(max_workers=workers)
+
+def iter_step_jobs(jobs, workers=None):
+    # jobs are (pages, frames, algorithm) tuples; yields one StepHistory per job, in order
+    workers = min(workers or os.cpu_count() or 1, len(jobs))
+    if workers <= 1:
+        for job in jobs:
+            yield StepHistory.build(*job)
+        return
+    with start_step_pool(workers) as pool:
+        for descriptor in pool.map(_run_steps_job, *zip(*jobs)):
+            yield StepHistory.attach(descriptor)
+
+def iter_fault_counts(strings, algorithms, frames, workers=None):
+    # One compare_policies pass per pages list, in order; only the fault counts cross processes
+    workers = min(workers or os.cpu_count() or 1, len(strings))
+    if workers <= 1:
+        for pages in strings:
+            yield compare_policies(pages, algorithms, frames)
+        return
+    with futures.ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(compare_policies, strings, itertools.repeat(algorithms), itertools.repeat(frames))
+
+# Multi-process workloads. A tagged reference is a (pid, page) tuple; untagged pages belong to
+# process 0. simulate_workload shares one pool of frames between the processes under a frame
+# allocation and a replacement scope. Global replacement picks the victim (by the FIFO, LRU or
+# Optimal rule) among all resident pages, so allocation plays no part. Local replacement picks
+# it among the faulting process's own pages once that process holds its allocation; a process
+# below its allocation with no free frame takes one from the process furthest over its own.
+# Equal and proportional (to each process's distinct pages) allocations are fixed. Working-set
+# allocation gives each process the distinct pages it used in the last `window` references,
+# and PFF grows a process's allocation while its fault rate over its last `window` references
+# is above PFF_HIGH and shrinks it below PFF_LOW. Steps where the allocations add up to more
+# than the frames are counted as overcommitted: the workload is thrashing.
+ALLOCATIONS = ("equal", "proportional", "working_set", "pff")
+SCOPES = ("global", "local")
+PFF_LOW, PFF_HIGH = 0.05, 0.3
+
+def process_of(page):
+    return page[0] if isinstance(page, tuple) else 0
+
+def static_allocation(pages, frames, allocation):
+    # Largest-remainder split of the frames; every process gets at least one
+    weights = {}
+    for page in set(pages):
+        pid = process_of(page)
+        weights[pid] = weights.get(pid, 0) + (1 if allocation == "proportional" else 0)
+    if allocation != "proportional":
+        weights = dict.fromkeys(weights, 1)
+    total = sum(weights.values())
+    quotas = {pid: frames * weight // total for pid, weight in weights.items()}
+    by_remainder = sorted(weights, key=lambda pid: (-(frames * weights[pid] % total), pid))
+    for pid in by_remainder[:frames - sum(quotas.values())]:
+        quotas[pid] += 1
+    return {pid: max(quota, 1) for pid, quota in sorted(quotas.items())}
+
+def simulate_workload(pages, frames, algorithm, allocation="equal", scope="global", window=100, record=True):
+    # Returns (result, page_faults, gantt_data, faults, processes, overcommitted); with
+    # record=False the per-step lists are left empty. processes maps pid to its references,
+    # faults, fault rate and mean frames held.
+    if algorithm not in SIMULATORS or allocation not in ALLOCATIONS or scope not in SCOPES:
+        raise ValueError(f"Unknown algorithm, allocation or scope: {algorithm}, {allocation}, {scope}")
+    if window <= 0:
+        raise ValueError("Window must be a positive number")
+    pages = list(pages)
+    if algorithm == "Optimal":
+        ids, page_table = intern_pages(pages)
+        next_use = compute_next_use(ids, len(page_table))
+    pids = sorted({process_of(page) for page in pages})
+    quotas = static_allocation(pages, frames, "equal" if allocation in ("working_set", "pff") else allocation)
+    held = dict.fromkeys(pids, 0)
+    stats = {pid: {"references": 0, "faults": 0, "frame_steps": 0} for pid in pids}
+    memory, order, upcoming = [], {}, {}  # frame order; FIFO load time or LRU last use; next use (Optimal)
+    recent, window_counts, working_set = deque(), {}, dict.fromkeys(pids, 0)
+    recent_faults, window_faults = {pid: deque() for pid in pids}, dict.fromkeys(pids, 0)
+    page_faults, overcommitted, result, gantt_data, faults = 0, 0, [], [], []
+
+    def choose(candidates):
+        if algorithm == "Optimal":
+            return max(candidates, key=upcoming.get)
+        return min(candidates, key=order.get)
+
+    for i, page in enumerate(pages):
+        pid = process_of(page)
+        fault = page not in order
+        if fault:
+            victim = None
+            if scope == "global":
+                if len(memory) >= frames:
+                    victim = choose(memory)
+            elif held[pid] >= quotas[pid] and held[pid] > 0:
+                victim = choose([resident for resident in memory if process_of(resident) == pid])
+            elif len(memory) >= frames:
+                donor = max((other for other in pids if held[other] > 0), key=lambda other: held[other] - quotas[other])
+                victim = choose([resident for resident in memory if process_of(resident) == donor])
+            if victim is not None:
+                memory.remove(victim)
+                del order[victim]
+                upcoming.pop(victim, None)
+                held[process_of(victim)] -= 1
+            memory.append(page)
+            held[pid] += 1
+            page_faults += 1
+            stats[pid]["faults"] += 1
+        if algorithm == "LRU" or fault:
+            order[page] = i
+        if algorithm == "Optimal":
+            upcoming[page] = next_use[i]
+        stats[pid]["references"] += 1
+
+        if allocation == "working_set":
+            recent.append(page)
+            window_counts[page] = window_counts.get(page, 0) + 1
+            if window_counts[page] == 1:
+                working_set[pid] += 1
+            if len(recent) > window:
+                old = recent.popleft()
+                window_counts[old] -= 1
+                if not window_counts[old]:
+                    del window_counts[old]
+                    working_set[process_of(old)] -= 1
+            quotas = {other: max(working_set[other], 1) for other in pids}
+        elif allocation == "pff":
+            history = recent_faults[pid]
+            history.append(fault)
+            window_faults[pid] += fault
+            if len(history) > window:
+                window_faults[pid] -= history.popleft()
+            rate = window_faults[pid] / len(history)
+            if rate > PFF_HIGH and quotas[pid] < frames:
+                quotas[pid] += 1
+            elif rate < PFF_LOW and quotas[pid] > 1:
+                quotas[pid] -= 1
+        if sum(quotas.values()) > frames:
+            overcommitted += 1
+        for other in pids:
+            stats[other]["frame_steps"] += held[other]
+
+        if record:
+            memory_padded = memory + [None] * (frames - len(memory))
+            shown = ", ".join("None" if resident is None else format_page(resident) for resident in memory_padded)
+            result.append(f"Page: {format_page(page):>2} | Memory: [{shown}] | {'Fault' if fault else 'Hit'}")
+            gantt_data.append((i, memory_padded, page))
+            faults.append(fault)
+
+    processes = {pid: {"references": stat["references"], "faults": stat["faults"],
+                       "fault_rate": stat["faults"] / stat["references"], "mean_frames": stat["frame_steps"] / len(pages)}
+                 for pid, stat in stats.items()}
+    return result, page_faults, gantt_data, faults, processes, overcommitted
+
+def process_fault_lines(processes, overcommitted=0):
+    lines = [f"{'Process':>7}  {'Refs':>8}  {'Faults':>8}  {'Fault Rate':>10}  {'Mean Frames':>11}"]
+    for pid, stat in processes.items():
+        lines.append(f"{pid:>7}  {stat['references']:>8}  {stat['faults']:>8}  {stat['fault_rate'] * 100:>9.2f}%  {stat['mean_frames']:>11.2f}")
+    if overcommitted:
+        lines.append(f"Allocations exceeded the frames on {overcommitted} steps (thrashing)")
+    return lines
+
+# Memory hierarchy cost model. A set-associative TLB (LRU within each set) sits in front of the
+# page frames. Every reference pays a TLB lookup and the final memory access; a TLB miss adds a
+# page-table walk of walk_levels memory accesses and a page fault adds its service time. The TLB
+# entry of an evicted page is shot down, so the TLB never maps a page that is not resident.
+# TLBModel, the compare options and the GUI's hierarchy settings all take their defaults from here.
+HIERARCHY_DEFAULTS = {"tlb_entries": 16, "tlb_ways": 4, "tlb_ns": 1.0, "memory_ns": 100.0, "walk_levels": 1, "fault_ns": 8_000_000.0}
+
+class TLBModel:
+    def __init__(self, tlb_entries=HIERARCHY_DEFAULTS["tlb_entries"], tlb_ways=HIERARCHY_DEFAULTS["tlb_ways"],
+                 tlb_ns=HIERARCHY_DEFAULTS["tlb_ns"], memory_ns=HIERARCHY_DEFAULTS["memory_ns"],
+                 walk_levels=HIERARCHY_DEFAULTS["walk_levels"], fault_ns=HIERARCHY_DEFAULTS["fault_ns"]):
+        if tlb_entries <= 0 or tlb_ways <= 0 or tlb_entries % tlb_ways:
+            raise ValueError("TLB entries must be a positive multiple of the associativity")
+        if min(tlb_ns, memory_ns, fault_ns) < 0 or walk_levels < 0:
+            raise ValueError("Latencies and page-table levels cannot be negative")
+        self.ways = tlb_ways
+        self.sets = [OrderedDict() for _ in range(tlb_entries // tlb_ways)]  # least recently used first
+        self.tlb_ns = tlb_ns
+        self.memory_ns = memory_ns
+        self.walk_levels = walk_levels
+        self.fault_ns = fault_ns
+        self.accesses = self.tlb_misses = self.faults = self.shootdowns = 0
+        self.total_ns = 0.0
+
+    def tlb_set(self, page):
+        return self.sets[hash(page) % len(self.sets)]
+
+    def access(self, page, fault, victim=None):
+        if victim is not None:
+            entries = self.tlb_set(victim)
+            if victim in entries:
+                del entries[victim]
+                self.shootdowns += 1
+        self.accesses += 1
+        cost = self.tlb_ns + self.memory_ns
+        entries = self.tlb_set(page)
+        if page in entries:
+            entries.move_to_end(page)
+        else:
+            self.tlb_misses += 1
+            cost += self.walk_levels * self.memory_ns
+            if len(entries) >= self.ways:
+                entries.popitem(last=False)
+            entries[page] = None
+        if fault:
+            self.faults += 1
+            cost += self.fault_ns
+        self.total_ns += cost
+
+    def run(self, events):
+        access = self.access
+        for page, fault, victim in events:
+            access(page, fault, victim)
+        return self
+
+    def report(self):
+        # Stall time is everything beyond a TLB hit on every reference
+        accesses = self.accesses or 1
+        return {"eat_ns": self.total_ns / accesses, "tlb_miss_rate": self.tlb_misses / accesses,
+                "stall_ns": self.total_ns - self.accesses * (self.tlb_ns + self.memory_ns),
+                "tlb_misses": self.tlb_misses, "shootdowns": self.shootdowns, "total_ns": self.total_ns}
+
+def format_ns(ns):
+    for unit, scale in (("s", 1e9), ("ms", 1e6), ("us", 1e3)):
+        if abs(ns) >= scale:
+            return f"{ns / scale:.2f} {unit}"
+    return f"{ns:.1f} ns"
+
+def step_events(gantt_data, faults):
+    # (page, fault, evicted page or None) per step, from a StepHistory or a list of gantt tuples
+    if isinstance(gantt_data, StepHistory):
+        for columns in gantt_data.step_columns():
+            for page, fault, evicted in zip(columns["page"].tolist(), columns["fault"].tolist(), columns["evicted"].tolist()):
+                yield page, fault, None if evicted == NO_PAGE else evicted
+        return
+    previous = []
+    for (_, memory, page), fault in zip(gantt_data, faults):
+        current = [resident for resident in memory if resident is not None]
+        victims = [resident for resident in previous if resident not in current]
+        yield page, fault, victims[0] if victims else None
+        previous = current
+
+def run_hierarchy(policies, references, next_use, page_table, models):
+    # Lockstep run that also feeds every reference, fault and eviction to each policy's TLB model
+    pairs = list(zip(policies, models))
+    for i, page in enumerate(references):
+        page_next_use = next_use[i] if next_use is not None else None
+        real_page = page_table[page] if page_table is not None else page
+        for policy, model in pairs:
+            if policy.access(page, page_next_use):
+                victim = policy.victim
+                model.access(real_page, True, page_table[victim] if page_table is not None and victim is not None else victim)
+            else:
+                model.access(real_page, False)
+    report_policies(policies)
+    return policies
+
+# Columnar result export. A run is one summary row; with per-step traces every step of every run
+# is one row of a second table, keyed by run_id. Rows are written in chunks, so neither table is
+# ever built in memory. Formats: CSV, NumPy .npz (one column per member) and Parquet (pyarrow).
+SUMMARY_COLUMNS = ("run_id", "run", "algorithm", "frames", "references", "faults", "hits", "hit_ratio")
+STEP_COLUMNS = ("run_id", "step", "page", "fault", "evicted")
+STEP_DTYPES = {"run_id": "int32", "step": "int64", "page": "int64", "fault": "bool", "evicted": "int64"}
+RESULT_FORMATS = (".csv", ".npz", ".parquet")
+
+def run_summary(run, algorithm, frames, references, faults):
+    hits = references - faults
+    return {"run": run, "algorithm": algorithm, "frames": frames, "references": references,
+            "faults": faults, "hits": hits, "hit_ratio": hits / references if references else 0.0}
+
+def history_summary(run, algorithm, frames, history):
+    return run_summary(run, algorithm, frames, len(history), history.fault_count())
+
+def steps_path(path):
+    root, ext = os.path.splitext(path)
+    return f"{root}_steps{ext}"
+
+def iter_step_chunks(histories, evicted=True):
+    for run_id, history in enumerate(histories):
+        for columns in history.step_columns(evicted=evicted):
+            columns["run_id"] = np.full(len(columns["step"]), run_id, dtype=np.int32)
+            yield columns
+
+def export_results(path, runs, histories=None):
+    # runs are run_summary() dicts; histories (one StepHistory per run) add the per-step table.
+    # Returns the paths written.
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in RESULT_FORMATS:
+        raise ValueError(f"Unsupported result format {ext or '(none)'}; use {', '.join(RESULT_FORMATS)}")
+    if ext == ".parquet" and importlib.util.find_spec("pyarrow") is None:
+        raise ValueError("pyarrow is not installed; use .csv or .npz")
+    summary = [dict(row, run_id=run_id) for run_id, row in enumerate(runs)]
+    with phase("export"):
+        if ext == ".csv":
+            paths = write_results_csv(path, summary, histories)
+        elif ext == ".npz":
+            paths = write_results_npz(path, summary, histories)
+        else:
+            paths = write_results_parquet(path, summary, histories)
+    engine_log.info("Exported %d runs to %s", len(summary), ", ".join(paths))
+    return paths
+
+def write_results_csv(path, summary, histories):
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(SUMMARY_COLUMNS)
+        writer.writerows([row[column] for column in SUMMARY_COLUMNS] for row in summary)
+    if histories is None:
+        return [path]
+    with open(steps_path(path), "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(STEP_COLUMNS)
+        for columns in iter_step_chunks(histories):
+            evicted = ["" if page == NO_PAGE else page for page in columns["evicted"].tolist()]
+            writer.writerows(zip(columns["run_id"].tolist(), columns["step"].tolist(), columns["page"].tolist(),
+                                 columns["fault"].astype(np.int8).tolist(), evicted))
+    return [path, steps_path(path)]
+
+def write_npy_member(archive, name, dtype, length, chunks):
+    # Streams one column into the archive as name.npy; chunks must add up to length values
+    dtype = np.dtype(dtype)
+    with archive.open(f"{name}.npy", "w", force_zip64=True) as member:
+        np.lib.format.write_array_header_1_0(member, {"descr": np.lib.format.dtype_to_descr(dtype), "fortran_order": False, "shape": (length,)})
+        for chunk in chunks:
+            member.write(np.ascontiguousarray(chunk, dtype=dtype).tobytes())
+
+def write_results_npz(path, summary, histories):
+    # np.load(path) gives summary_<column> and, with histories, steps_<column> arrays
+    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for column in SUMMARY_COLUMNS:
+            values = np.array([row[column] for row in summary])
+            write_npy_member(archive, f"summary_{column}", values.dtype, len(values), [values])
+        if histories is not None:
+            total = sum(len(history) for history in histories)
+            for column in STEP_COLUMNS:
+                # One pass per column; only the evicted column needs the frame history decoded
+                chunks = (columns[column] for columns in iter_step_chunks(histories, evicted=column == "evicted"))
+                write_npy_member(archive, f"steps_{column}", STEP_DTYPES[column], total, chunks)
+    return [path]
+
+def write_results_parquet(path, summary, histories):
+    table = pyarrow.table({column: [row[column] for row in summary] for column in SUMMARY_COLUMNS})
+    pyarrow_parquet.write_table(table, path)
+    if histories is None:
+        return [path]
+    schema = pyarrow.schema([(column, STEP_DTYPES[column]) for column in STEP_COLUMNS])
+    with pyarrow_parquet.ParquetWriter(steps_path(path), schema) as writer:
+        for columns in iter_step_chunks(histories):
+            evicted = columns["evicted"]
+            arrays = [pyarrow.array(columns[column]) for column in STEP_COLUMNS[:-1]]
+            arrays.append(pyarrow.array(evicted, mask=evicted == NO_PAGE))
+            writer.write_batch(pyarrow.record_batch(arrays, schema=schema))
+    return [path, steps_path(path)]
+
+# Frame-count sweep. Each worker process prepares the trace (interning, next-use) once in the
+# pool initializer; a job is then one frame count, run for every algorithm in lockstep.
+_sweep_trace = None
+SWEEP_DEFAULT_MAX = 64  # the GUI's default Max Frames never starts more simulations than this
+
+def _init_sweep_worker(pages, algorithms):
+    global _sweep_trace
+    if use_kernels(make_policies(algorithms, 1), pages):
+        _sweep_trace = (algorithms, run_kernels) + intern_trace_array(pages)
+    else:
+        need_future = any(POLICIES[algo].needs_future for algo in algorithms)
+        _sweep_trace = (algorithms, run_lockstep) + prepare_trace(pages, need_future)[:2]
+
+def _sweep_point(frames):
+    algorithms, engine, references, next_use = _sweep_trace
+    policies = engine(make_policies(algorithms, frames), references, next_use)
+    return frames, {policy.name: policy.faults for policy in policies}
+
+def sweep_frames(pages, algorithms, frame_counts, workers=None):
+    global _sweep_trace
+    frame_counts = list(frame_counts)
+    workers = min(workers or os.cpu_count() or 1, len(frame_counts))
+    engine_log.debug("Sweeping %d frame counts for %s on %d worker(s)", len(frame_counts), algorithms, workers)
+    if workers <= 1:
+        _init_sweep_worker(pages, algorithms)
+        try:
+            points = list(map(_sweep_point, frame_counts))
+        finally:
+            _sweep_trace = None  # don't keep the interned trace alive in this process
+    else:
+        with futures.ProcessPoolExecutor(max_workers=workers, initializer=_init_sweep_worker, initargs=(pages, algorithms)) as pool:
+            points = list(pool.map(_sweep_point, frame_counts, chunksize=max(1, len(frame_counts) // (workers * 4))))
+    return sweep_curves(points, algorithms)
+
+def start_sweep(pages, algorithms, frame_counts, workers=None):
+    # sweep_frames without waiting: one future per frame count, for callers that poll them
+    frame_counts = list(frame_counts)
+    workers = max(1, min(workers or os.cpu_count() or 1, len(frame_counts)))
+    pool = futures.ProcessPoolExecutor(max_workers=workers, initializer=_init_sweep_worker, initargs=(pages, algorithms))
+    jobs = [pool.submit(_sweep_point, frames) for frames in frame_counts]
+    pool.shutdown(wait=False)
+    return jobs
+
+def sweep_curves(points, algorithms):
+    # {algorithm: [(frames, faults), ...]} from (frames, {algorithm: faults}) points
+    curves = {algo: [] for algo in algorithms}
+    for frames, faults in points:
+        for algo in algorithms:
+            curves[algo].append((frames, faults[algo]))
+    return {algo: sorted(curve) for algo, curve in curves.items()}
+
+def find_belady_anomalies(curve):
+    # A point is anomalous when adding frames increased the fault count (Belady's anomaly)
+    anomalies = []
+    for (prev_frames, prev_faults), (frames, faults) in zip(curve, curve[1:]):
+        if faults > prev_faults:
+            anomalies.append((prev_frames, prev_faults, frames, faults))
+    return anomalies
+
+# Chunk-parallel simulation of one trace. The interned trace (and next-use array) is shared with
+# the workers through shared memory and split into chunks, each simulated from a guessed start
+# state. LRU's guess is exact: the `frames` most recently used pages before the chunk. FIFO and
+# Optimal warm up on the preceding references; the parent then reconciles chunks in order by
+# running the true start state forward until it matches one of the worker's snapshots, after
+# which the worker's counts are exact.
+_chunk_trace = None
+
+def _init_chunk_worker(trace_name, next_use_name, length):
+    global _chunk_trace
+    blocks = [shared_memory.SharedMemory(name=name) for name in (trace_name, next_use_name) if name]
+    arrays = [np.ndarray(length, dtype=np.int64, buffer=block.buf) for block in blocks]
+    _chunk_trace = (blocks, arrays[0], arrays[1] if next_use_name else None)
+
+def lru_start_state(trace, start, frames):
+    # The LRU stack at `start` holds the last `frames` distinct pages referenced before it
+    recent, position = {}, start
+    while position > 0 and len(recent) < frames:
+        for page in reversed(trace[max(0, position - 4096):position].tolist()):
+            if page not in recent:
+                recent[page] = None
+                if len(recent) == frames:
+                    break
+        position -= 4096
+    recency = list(reversed(recent))  # least recently used first
+    return {"slots": recency, "recency": recency}
+
+CHUNK_START_STATES = {"LRU": lru_start_state}
+
+def run_slice(policy, trace, next_use, start, stop):
+    return run_lockstep([policy], trace[start:stop].tolist(), next_use[start:stop].tolist() if policy.needs_future else None, report=False)
+
+def _simulate_chunk(task):
+    algo, frames, start, stop, warmup = task
+    _, trace, next_use = _chunk_trace
+    policy = POLICIES[algo](frames)
+    if start and algo in CHUNK_START_STATES:
+        policy.load_resident(CHUNK_START_STATES[algo](trace, start, frames))
+    elif start:
+        run_slice(policy, trace, next_use, max(0, start - warmup), start)
+        policy.hits = policy.faults = policy.evictions = policy.probes = 0
+    start_state, snapshots = policy.get_state(), []
+    every = max(1, (stop - start) // 32)
+    for position in range(start, stop, every):
+        end = min(position + every, stop)
+        run_slice(policy, trace, next_use, position, end)
+        snapshots.append((end, policy.get_state()))
+    return start_state, snapshots
+
+def reconcile_chunks(algo, frames, trace, next_use, results):
+    # Chains the chunk results; returns the policy's exact final state with summed counters
+    key = POLICIES[algo].resident_key
+    counters, true_state, replayed = [0, 0, 0, 0], None, 0
+    for start, (start_state, snapshots) in results:
+        final_state = snapshots[-1][1]
+        chunk_counters = final_state["counters"]
+        if true_state is not None and key(true_state["resident"]) != key(start_state["resident"]):
+            policy = POLICIES[algo](frames)
+            policy.set_state(dict(true_state, counters=[0, 0, 0, 0]))
+            position = start
+            for end, snapshot in snapshots:
+                run_slice(policy, trace, next_use, position, end)
+                replayed += end - position
+                position = end
+                if key(policy.get_state()["resident"]) == key(snapshot["resident"]):
+                    chunk_counters = [mine + final - theirs for mine, final, theirs in
+                                      zip(policy.get_state()["counters"], final_state["counters"], snapshot["counters"])]
+                    break
+            else:
+                final_state = policy.get_state()
+                chunk_counters = final_state["counters"]
+        counters = [total + count for total, count in zip(counters, chunk_counters)]
+        true_state = final_state
+    engine_log.debug("%s: reconciled %d chunks, %d references replayed", algo, len(results), replayed)
+    return dict(true_state, counters=counters)
+
+def intern_trace_array(pages):
+    # Dense int64 ids plus a vectorised next-use array: next_use[i] is the next index of the same page
+    ids = np.unique(np.fromiter(pages, dtype=np.int64), return_inverse=True)[1].astype(np.int64).ravel()
+    next_use = np.full(len(ids), len(ids), dtype=np.int64)
+    order = np.argsort(ids, kind="stable")
+    same = ids[order[1:]] == ids[order[:-1]]
+    next_use[order[:-1][same]] = order[1:][same]
+    return ids, next_use
+
+def compare_parallel(pages, algorithms, frames, workers=None, chunks=None, warmup=None):
+    # Same result as compare_policies, with the trace split over a process pool
+    policies = run_chunk_parallel(pages, algorithms, frames, workers, chunks, warmup)
+    return {policy.name: policy.faults for policy in policies}
+
+def run_chunk_parallel(pages, algorithms, frames, workers=None, chunks=None, warmup=None):
+    global _chunk_trace
+    workers = workers or os.cpu_count() or 1
+    warmup = warmup or max(8 * frames, 1 << 14)
+    policies = make_policies(algorithms, frames)
+    need_future = any(policy.needs_future for policy in policies)
+    with phase("parse"):
+        trace, next_use = intern_trace_array(pages)
+    if not len(trace):
+        return policies
+    chunks = max(1, min(chunks or workers, len(trace)))
+    bounds = [len(trace) * i // chunks for i in range(chunks + 1)]
+    tasks = [(algo, frames, start, stop, warmup) for algo in algorithms for start, stop in zip(bounds, bounds[1:])]
+    engine_log.debug("Chunk-parallel run: %d references, %d chunks, %d worker(s)", len(trace), chunks, workers)
+    with phase("simulate"):
+        if workers <= 1:
+            _chunk_trace = (None, trace, next_use)
+            results = list(map(_simulate_chunk, tasks))
+        else:
+            blocks = []
+            try:
+                for array in (trace, next_use) if need_future else (trace,):
+                    block = shared_memory.SharedMemory(create=True, size=array.nbytes)
+                    np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[:] = array
+                    blocks.append(block)
+                names = (blocks[0].name, blocks[1].name if need_future else None, len(trace))
+                with futures.ProcessPoolExecutor(max_workers=workers, initializer=_init_chunk_worker, initargs=names) as pool:
+                    results = list(pool.map(_simulate_chunk, tasks))
+            finally:
+                for block in blocks:
+                    block.close()
+                    block.unlink()
+    with phase("reconcile"):
+        for index, policy in enumerate(policies):
+            chunk_results = list(zip(bounds, results[index * chunks:(index + 1) * chunks]))
+            policy.set_state(reconcile_chunks(policy.name, frames, trace, next_use, chunk_results))
+    report_policies(policies)
+    return policies
+
+# Trace analytics. Reuse (stack) distances come from a Fenwick tree over "last occurrence"
+# markers in O(n log n); working-set sizes and inter-reference gaps are O(n) from next-use.
+class FenwickTree:
+    def __init__(self, size):
+        self.tree = [0] * (size + 1)
+
+    def add(self, index, delta):
+        index += 1
+        tree = self.tree
+        while index < len(tree):
+            tree[index] += delta
+            index += index & -index
+
+    def prefix_sum(self, index):
+        # Sum of positions [0, index)
+        total, tree = 0, self.tree
+        while index > 0:
+            total += tree[index]
+            index -= index & -index
+        return total
+
+def reuse_distances(pages):
+    # Number of distinct other pages referenced since the previous reference to the same
+    # page, or -1 for a first reference. LRU with c frames hits exactly when distance < c.
+    last_seen, distances = {}, []
+    markers = FenwickTree(len(pages))
+    for i, page in enumerate(pages):
+        previous = last_seen.get(page)
+        if previous is None:
+            distances.append(-1)
+        else:
+            distances.append(markers.prefix_sum(i) - markers.prefix_sum(previous + 1))
+            markers.add(previous, -1)
+        markers.add(i, 1)
+        last_seen[page] = i
+    return distances
+
+def lru_fault_curve(distances, max_frames):
+    # LRU faults for 1..max_frames frames from a single reuse-distance pass
+    distances = np.asarray(distances, dtype=np.int64)
+    cold = int(np.count_nonzero(distances < 0))
+    histogram = np.bincount(distances[distances >= 0], minlength=max_frames + 1)
+    at_least = len(distances) - cold - np.concatenate(([0], np.cumsum(histogram)))
+    return [(frames, cold + int(at_least[frames])) for frames in range(1, max_frames + 1)]
+
+def working_set_sizes(pages, window):
+    # W(t, window): distinct pages among the last `window` references ending at t. Reference j
+    # is the newest copy of its page for every t in [j, min(next use, j + window) - 1].
+    ids, page_table = intern_pages(pages)
+    next_use = np.asarray(compute_next_use(ids, len(page_table)), dtype=np.int64)
+    steps = np.arange(len(ids))
+    ends = np.minimum(next_use, steps + window)
+    changes = np.bincount(steps, minlength=len(ids) + 1) - np.bincount(ends, minlength=len(ids) + 1)
+    return np.cumsum(changes)[:len(ids)]
+
+def inter_reference_gaps(pages):
+    ids, page_table = intern_pages(pages)
+    next_use = np.asarray(compute_next_use(ids, len(page_table)), dtype=np.int64)
+    steps = np.arange(len(ids))
+    reused = next_use < len(ids)
+    return next_use[reused] - steps[reused]
+
+def analyze_trace(pages, windows=(10, 100, 1000)):
+    pages = list(pages)
+    distances = reuse_distances(pages)
+    unique_pages = len(set(pages))
+    gaps = inter_reference_gaps(pages)
+    return {
+        "references": len(pages),
+        "unique_pages": unique_pages,
+        "distances": np.asarray(distances, dtype=np.int64),
+        "lru_faults": lru_fault_curve(distances, max(unique_pages, 1)),
+        "working_set": {window: working_set_sizes(pages, window) for window in windows},
+        "gaps": gaps,
+    }
+
+# Sampled simulation (SHARDS-style spatial sampling). A page is kept when a seeded hash of
+# its number falls below rate * SAMPLE_MODULUS, so every reference to a sampled page is kept
+# and reuse patterns survive. Policies then run on the sample with frames scaled by the rate.
+SAMPLE_MODULUS = 1 << 24
+T_CRITICAL_95 = {1: 12.706, 2: 4.303, 3: 3.182, 4: 2.776, 5: 2.571, 6: 2.447, 7: 2.365, 8: 2.306, 9: 2.262}
+
+def hash_pages(pages, seed):
+    # splitmix64 finaliser over a uint64 array; wrap-around multiplication is intended
+    x = pages.astype(np.uint64) + np.uint64((seed * 0x9E3779B97F4A7C15) & 0xFFFFFFFFFFFFFFFF)
+    x ^= x >> np.uint64(30)
+    x *= np.uint64(0xBF58476D1CE4E5B9)
+    x ^= x >> np.uint64(27)
+    x *= np.uint64(0x94D049BB133111EB)
+    x ^= x >> np.uint64(31)
+    return x
+
+def iter_reference_chunks(references, chunk_size=1 << 20):
+    references = iter(references)
+    while True:
+        try:
+            chunk = np.fromiter(itertools.islice(references, chunk_size), dtype=np.int64)
+        except TypeError:
+            raise ValueError("pid:page references cannot be streamed as page numbers; see the workload command") from None
+        if not len(chunk):
+            return
+        yield chunk
+
+def sample_trace(references, rate, seeds=1):
+    # One streamed pass draws an independent sample per seed; only the samples are kept
+    threshold = np.uint64(int(rate * SAMPLE_MODULUS))
+    samples = [[] for _ in range(seeds)]
+    total = 0
+    for chunk in iter_reference_chunks(references):
+        total += len(chunk)
+        for seed, sample in enumerate(samples):
+            keep = hash_pages(chunk, seed) % np.uint64(SAMPLE_MODULUS) < threshold
+            sample.extend(chunk[keep].tolist())
+    return total, samples
+
+def sampled_miss_ratios(references, algorithms, frame_counts, rate=0.01, seeds=5):
+    # Returns (references seen, sample sizes, {algorithm: [(frames, miss ratio, 95% half-width)]}).
+    # Misses are divided by the expected sample size rate * total rather than the actual one
+    # (the SHARDS adjustment), which removes most of the bias when a few very hot pages happen
+    # to fall in or out of the sample. The half-width is a Student-t interval over the seeds.
+    total, samples = sample_trace(references, rate, seeds)
+    expected = rate * total
+    estimates = {algo: [] for algo in algorithms}
+    runs = {}
+    for frames in frame_counts:
+        scaled_frames = max(1, round(frames * rate))
+        ratios = {algo: [] for algo in algorithms}
+        for seed, sample in enumerate(samples):
+            if not sample:
+                continue
+            key = (seed, scaled_frames)
+            if key not in runs:
+                runs[key] = compare_policies(sample, algorithms, scaled_frames)
+            for algo in algorithms:
+                ratios[algo].append(min(1.0, runs[key][algo] / expected))
+        for algo in algorithms:
+            values = np.asarray(ratios[algo], dtype=float)
+            if len(values) == 0:
+                estimates[algo].append((frames, float("nan"), float("nan")))
+                continue
+            half_width = float("nan")
+            if len(values) > 1:
+                half_width = T_CRITICAL_95.get(len(values) - 1, 1.96) * values.std(ddof=1) / len(values) ** 0.5
+            estimates[algo].append((frames, float(values.mean()), half_width))
+    return total, [len(sample) for sample in samples], estimates
+
+# Live streaming. LiveMonitor runs the online policies (those that do not need future references)
+# over an unbounded stream. Its state stays bounded: per-policy totals, the faults and working
+# set of the last `window` references and a ring buffer of the last `history` steps. LiveSession
+# feeds it from a reader thread, so a dashboard can take snapshots at a fixed interval however
+# fast or slow references arrive.
+LIVE_WINDOW = 1000
+LIVE_HISTORY = 20
+LIVE_INTERVAL = 1.0  # seconds between dashboard refreshes
+LIVE_POLL = 0.1  # seconds between reads at the end of a followed file
+LIVE_TICKS = 120  # dashboard refreshes kept for the GUI's rolling charts
+
+def online_algorithms():
+    return [name for name, policy in POLICIES.items() if not policy.needs_future]
+
+def follow_lines(source, follow=False, stop=None, poll=LIVE_POLL):
+    # Complete lines from stdin ("-"), a FIFO or a file. With follow, the end of the file is
+    # polled for more (like tail -f) until stop is set, and a partial last line is held back
+    # until its newline arrives.
+    f = sys.stdin if source == "-" else open(source, "r")
+    try:
+        pending = ""
+        while stop is None or not stop.is_set():
+            line = f.readline()
+            if line.endswith("\n"):
+                yield pending + line
+                pending = ""
+            elif line:
+                pending += line
+            elif follow:
+                time.sleep(poll)
+            else:
+                break
+        if pending and not follow:
+            yield pending
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
+class LiveMonitor:
+    def __init__(self, algorithms, frames, window=LIVE_WINDOW, history=LIVE_HISTORY):
+        offline = [algo for algo in algorithms if POLICIES[algo].needs_future]
+        if offline:
+            raise ValueError(f"{', '.join(offline)} needs future references; live mode runs online policies only")
+        if not algorithms or frames <= 0 or window <= 0 or history <= 0:
+            raise ValueError("Algorithms, frames, window and history must be given and positive")
+        self.policies = make_policies(algorithms, frames)
+        self.window = window
+        self.references = 0
+        self.recent = deque()  # (page, fault flags) of the last `window` references
+        self.page_counts = {}  # references to each page within the window
+        self.window_faults = [0] * len(self.policies)
+        self.steps = deque(maxlen=history)  # (step, page, fault flags, victims)
+
+    def feed(self, references):
+        policies, recent, page_counts, window_faults = self.policies, self.recent, self.page_counts, self.window_faults
+        for page in references:
+            flags = tuple(policy.access(page) for policy in policies)
+            self.steps.append((self.references, page, flags, tuple(policy.victim if fault else None for policy, fault in zip(policies, flags))))
+            self.references += 1
+            recent.append((page, flags))
+            page_counts[page] = page_counts.get(page, 0) + 1
+            for i, fault in enumerate(flags):
+                window_faults[i] += fault
+            if len(recent) > self.window:
+                old, old_flags = recent.popleft()
+                page_counts[old] -= 1
+                if not page_counts[old]:
+                    del page_counts[old]
+                for i, fault in enumerate(old_flags):
+                    window_faults[i] -= fault
+
+    def snapshot(self):
+        filled = len(self.recent)
+        return {"references": self.references, "window": filled, "working_set": len(self.page_counts),
+                "policies": [{"algorithm": policy.name, "faults": policy.faults, "hits": policy.hits,
+                              "fault_rate": policy.faults / self.references if self.references else 0.0,
+                              "window_fault_rate": faults / filled if filled else 0.0}
+                             for policy, faults in zip(self.policies, self.window_faults)],
+                "steps": list(self.steps)}
+
+class LiveSession:
+    def __init__(self, monitor, source, follow=False):
+        self.monitor = monitor
+        self.lock = threading.Lock()
+        self.stop = threading.Event()
+        self.done = threading.Event()
+        self.skipped = 0
+        self.error = None
+        self.started = None
+        self.thread = threading.Thread(target=self.read, args=(source, follow), name="live-reader", daemon=True)
+
+    def start(self):
+        self.started = time.perf_counter()
+        self.thread.start()
+
+    def read(self, source, follow):
+        try:
+            for line in follow_lines(source, follow, self.stop):
+                try:
+                    references = list(iter_references((line,)))
+                except ValueError:
+                    # A bad line in a long-running stream is skipped rather than ending it
+                    self.skipped += 1
+                    engine_log.warning("Skipping unparseable line: %r", line[:80])
+                    continue
+                with self.lock:
+                    self.monitor.feed(references)
+        except OSError as e:
+            self.error = e
+            engine_log.error("Live input failed: %s", e)
+        finally:
+            self.done.set()
+
+    def snapshot(self):
+        with self.lock:
+            snapshot = self.monitor.snapshot()
+        snapshot["skipped"] = self.skipped
+        return snapshot
+
+    def close(self):
+        self.stop.set()
+
+def live_step_line(step, policies):
+    index, page, flags, victims = step
+    outcomes = [f"{policy['algorithm']}:{'Fault' if fault else 'Hit'}" + (f"(-{format_page(victim)})" if victim is not None else "")
+                for policy, fault, victim in zip(policies, flags, victims)]
+    return f"{index + 1:>10}  Page {format_page(page):>6}  {'  '.join(outcomes)}"
+
+def live_dashboard_lines(snapshot, elapsed, rate):
+    lines = [f"references={snapshot['references']} rate={rate:,.0f}/s elapsed={elapsed:.1f}s "
+             f"working_set={snapshot['working_set']} (last {snapshot['window']} references)"]
+    if snapshot["skipped"]:
+        lines[0] += f" skipped_lines={snapshot['skipped']}"
+    for policy in snapshot["policies"]:
+        lines.append(f"{policy['algorithm']:8s} faults={policy['faults']} hits={policy['hits']} "
+                     f"fault_rate={policy['fault_rate'] * 100:.2f}% rolling={policy['window_fault_rate'] * 100:.2f}%")
+    if snapshot["steps"]:
+        lines.append("Recent steps:")
+        lines.extend(live_step_line(step, snapshot["policies"]) for step in snapshot["steps"])
+    return lines
 
 class GanttChart:
     def __init__(self, master, gantt_data, algorithm, max_frames, faults, pages):
@@ -25,8 +2318,10 @@ class GanttChart:
         self.max_frames = max_frames
         self.faults = faults
         self.pages = pages
+        if isinstance(gantt_data, StepHistory):
+            release_on_destroy(self.window, [gantt_data.acquire()])
 
-        print(f"GanttChart initialized with: gantt_data={len(gantt_data)}, faults={len(faults)}, pages={len(pages)}, max_frames={max_frames}, algorithm={algorithm}")
+        chart_log.info("GanttChart opened: %d steps, %d frames, algorithm=%s", len(gantt_data), max_frames, algorithm)
 
         # Main frame for tabs
         self.notebook = ttk.Notebook(self.window)
@@ -47,7 +2342,7 @@ class GanttChart:
 
         self.fig_gantt = plt.Figure(figsize=(12, 5), dpi=100)
         self.ax_gantt = self.fig_gantt.add_subplot(111)
-        self.canvas_gantt = FigureCanvasTkAgg(self.fig_gantt, master=self.gantt_frame)
+        self.canvas_gantt = backend_tkagg.FigureCanvasTkAgg(self.fig_gantt, master=self.gantt_frame)
         self.canvas_gantt.get_tk_widget().pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
         self.animation = None
 
@@ -76,15 +2371,8 @@ class GanttChart:
             btn.bind("<Enter>", lambda e: e.widget.config(bg="#d3d3d3"))
             btn.bind("<Leave>", lambda e: e.widget.config(bg=e.widget.default_bg))
 
-        # Initialize pygame for sound
-        pygame.mixer.init()
-        try:
-            self.fault_sound = pygame.mixer.Sound("fault.wav")
-            self.hit_sound = pygame.mixer.Sound("hit.wav")
-        except pygame.error as e:
-            print(f"Error loading sound files: {e}")
-            self.fault_sound = None
-            self.hit_sound = None
+        # Sounds are loaded once and shared by every chart window
+        self.fault_sound, self.hit_sound = load_sounds()
 
         # Tab 2: Analysis Graphs
         self.analysis_frame = tk.Frame(self.notebook)
@@ -99,7 +2387,7 @@ class GanttChart:
         self.analysis_notebook.add(self.cumulative_frame, text="Cumulative Faults")
         self.fig_cumulative = plt.Figure(figsize=(12, 5), dpi=100)
         self.ax_cumulative = self.fig_cumulative.add_subplot(111)
-        self.canvas_cumulative = FigureCanvasTkAgg(self.fig_cumulative, master=self.cumulative_frame)
+        self.canvas_cumulative = backend_tkagg.FigureCanvasTkAgg(self.fig_cumulative, master=self.cumulative_frame)
         self.canvas_cumulative.get_tk_widget().pack(fill=tk.BOTH, expand=True)
 
         # Page Fault Rate
@@ -107,7 +2395,7 @@ class GanttChart:
         self.analysis_notebook.add(self.fault_rate_frame, text="Page Fault Rate")
         self.fig_fault_rate = plt.Figure(figsize=(12, 5), dpi=100)
         self.ax_fault_rate = self.fig_fault_rate.add_subplot(111)
-        self.canvas_fault_rate = FigureCanvasTkAgg(self.fig_fault_rate, master=self.fault_rate_frame)
+        self.canvas_fault_rate = backend_tkagg.FigureCanvasTkAgg(self.fig_fault_rate, master=self.fault_rate_frame)
         self.canvas_fault_rate.get_tk_widget().pack(fill=tk.BOTH, expand=True)
 
         # Memory Utilization
@@ -115,7 +2403,7 @@ class GanttChart:
         self.analysis_notebook.add(self.utilization_frame, text="Memory Utilization")
         self.fig_utilization = plt.Figure(figsize=(12, 5), dpi=100)
         self.ax_utilization = self.fig_utilization.add_subplot(111)
-        self.canvas_utilization = FigureCanvasTkAgg(self.fig_utilization, master=self.utilization_frame)
+        self.canvas_utilization = backend_tkagg.FigureCanvasTkAgg(self.fig_utilization, master=self.utilization_frame)
         self.canvas_utilization.get_tk_widget().pack(fill=tk.BOTH, expand=True)
 
         # Page Frequency
@@ -123,7 +2411,7 @@ class GanttChart:
         self.analysis_notebook.add(self.frequency_frame, text="Page Frequency")
         self.fig_frequency = plt.Figure(figsize=(12, 5), dpi=100)
         self.ax_frequency = self.fig_frequency.add_subplot(111)
-        self.canvas_frequency = FigureCanvasTkAgg(self.fig_frequency, master=self.frequency_frame)
+        self.canvas_frequency = backend_tkagg.FigureCanvasTkAgg(self.fig_frequency, master=self.frequency_frame)
         self.canvas_frequency.get_tk_widget().pack(fill=tk.BOTH, expand=True)
 
         # Hit/Fault Distribution
@@ -131,7 +2419,7 @@ class GanttChart:
         self.analysis_notebook.add(self.distribution_frame, text="Hit/Fault Distribution")
         self.fig_distribution = plt.Figure(figsize=(12, 5), dpi=100)
         self.ax_distribution = self.fig_distribution.add_subplot(111)
-        self.canvas_distribution = FigureCanvasTkAgg(self.fig_distribution, master=self.distribution_frame)
+        self.canvas_distribution = backend_tkagg.FigureCanvasTkAgg(self.fig_distribution, master=self.distribution_frame)
         self.canvas_distribution.get_tk_widget().pack(fill=tk.BOTH, expand=True)
 
         # Page Replacement Timeline
@@ -139,7 +2427,7 @@ class GanttChart:
         self.analysis_notebook.add(self.timeline_frame, text="Page Replacement Timeline")
         self.fig_timeline = plt.Figure(figsize=(12, 5), dpi=100)
         self.ax_timeline = self.fig_timeline.add_subplot(111)
-        self.canvas_timeline = FigureCanvasTkAgg(self.fig_timeline, master=self.timeline_frame)
+        self.canvas_timeline = backend_tkagg.FigureCanvasTkAgg(self.fig_timeline, master=self.timeline_frame)
         self.canvas_timeline.get_tk_widget().pack(fill=tk.BOTH, expand=True)
 
         # Fault Distribution by Page
@@ -147,7 +2435,7 @@ class GanttChart:
         self.analysis_notebook.add(self.fault_dist_frame, text="Fault Distribution by Page")
         self.fig_fault_dist = plt.Figure(figsize=(12, 5), dpi=100)
         self.ax_fault_dist = self.fig_fault_dist.add_subplot(111)
-        self.canvas_fault_dist = FigureCanvasTkAgg(self.fig_fault_dist, master=self.fault_dist_frame)
+        self.canvas_fault_dist = backend_tkagg.FigureCanvasTkAgg(self.fig_fault_dist, master=self.fault_dist_frame)
         self.canvas_fault_dist.get_tk_widget().pack(fill=tk.BOTH, expand=True)
 
         # Frame Occupancy Heatmap
@@ -155,14 +2443,57 @@ class GanttChart:
         self.analysis_notebook.add(self.heatmap_frame, text="Frame Occupancy Heatmap")
         self.fig_heatmap = plt.Figure(figsize=(12, 5), dpi=100)
         self.ax_heatmap = self.fig_heatmap.add_subplot(111)
-        self.canvas_heatmap = FigureCanvasTkAgg(self.fig_heatmap, master=self.heatmap_frame)
+        self.canvas_heatmap = backend_tkagg.FigureCanvasTkAgg(self.fig_heatmap, master=self.heatmap_frame)
         self.canvas_heatmap.get_tk_widget().pack(fill=tk.BOTH, expand=True)
 
+        # Reuse Distance
+        self.reuse_frame = tk.Frame(self.analysis_notebook)
+        self.analysis_notebook.add(self.reuse_frame, text="Reuse Distance")
+        self.fig_reuse = plt.Figure(figsize=(12, 5), dpi=100)
+        self.ax_reuse = self.fig_reuse.add_subplot(121)
+        self.ax_lru_curve = self.fig_reuse.add_subplot(122)
+        self.canvas_reuse = backend_tkagg.FigureCanvasTkAgg(self.fig_reuse, master=self.reuse_frame)
+        self.canvas_reuse.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+
+        # Working Set
+        self.working_set_frame = tk.Frame(self.analysis_notebook)
+        self.analysis_notebook.add(self.working_set_frame, text="Working Set")
+        window_frame = tk.Frame(self.working_set_frame)
+        window_frame.pack(pady=5)
+        tk.Label(window_frame, text="Window (references):", font=("Arial", 10)).pack(side=tk.LEFT, padx=5)
+        self.ws_window_entry = ttk.Entry(window_frame, width=8)
+        self.ws_window_entry.pack(side=tk.LEFT)
+        self.ws_window_entry.insert(0, "10")
+        self.ws_window_entry.bind("<Return>", lambda e: self.update_working_set_graph())
+        ttk.Button(window_frame, text="Update", command=self.update_working_set_graph).pack(side=tk.LEFT, padx=5)
+        self.fig_working_set = plt.Figure(figsize=(12, 5), dpi=100)
+        self.ax_working_set = self.fig_working_set.add_subplot(111)
+        self.canvas_working_set = backend_tkagg.FigureCanvasTkAgg(self.fig_working_set, master=self.working_set_frame)
+        self.canvas_working_set.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+
+        # Inter-Reference Gaps
+        self.gaps_frame = tk.Frame(self.analysis_notebook)
+        self.analysis_notebook.add(self.gaps_frame, text="Inter-Reference Gaps")
+        self.fig_gaps = plt.Figure(figsize=(12, 5), dpi=100)
+        self.ax_gaps = self.fig_gaps.add_subplot(111)
+        self.canvas_gaps = backend_tkagg.FigureCanvasTkAgg(self.fig_gaps, master=self.gaps_frame)
+        self.canvas_gaps.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+
+        # Per-Process Faults
+        self.processes_frame = tk.Frame(self.analysis_notebook)
+        self.analysis_notebook.add(self.processes_frame, text="Per-Process Faults")
+        self.fig_processes = plt.Figure(figsize=(12, 5), dpi=100)
+        self.ax_process_rate = self.fig_processes.add_subplot(121)
+        self.ax_process_faults = self.fig_processes.add_subplot(122)
+        self.canvas_processes = backend_tkagg.FigureCanvasTkAgg(self.fig_processes, master=self.processes_frame)
+        self.canvas_processes.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+
         # Render all analysis graphs
-        self.update_analysis_graphs()
+        with phase("render"):
+            self.update_analysis_graphs()
 
-        # Show the Gantt chart initially
-        self.show_static_gantt()
+            # Show the Gantt chart initially
+            self.show_static_gantt()
 
     def show_static_gantt(self):
         if self.animation is not None:
@@ -171,27 +2502,25 @@ class GanttChart:
         self.ax_gantt.clear()
 
         graph_type = self.graph_type.get()
-        print(f"Rendering static Gantt chart with {len(self.gantt_data)} steps, type={graph_type}")
+        chart_log.debug("Rendering static Gantt chart: %d steps, type=%s", len(self.gantt_data), graph_type)
 
         if graph_type == "Broken Bar":
             # Plot the entire history up to the last step
-            for time in range(len(self.gantt_data)):
-                memory, page = self.gantt_data[time][1], self.gantt_data[time][2]
+            for time, memory, page in self.gantt_data:
                 for j, p in enumerate(memory):
                     if p is not None:  # Skip None values
                         color = 'red' if p == page and self.faults[time] else 'blue'
                         self.ax_gantt.broken_barh([(time, 0.8)], (j - 0.4, 0.8), facecolors=color, edgecolors='black')
-                        self.ax_gantt.text(time + 0.4, j, str(p), ha='center', va='center', color='white', fontweight='bold', fontsize=10)
+                        self.ax_gantt.text(time + 0.4, j, format_page(p), ha='center', va='center', color='white', fontweight='bold', fontsize=10)
 
         elif graph_type == "Bar":
             # Plot as a bar chart showing page occupancy over time
-            for time in range(len(self.gantt_data)):
-                memory, page = self.gantt_data[time][1], self.gantt_data[time][2]
+            for time, memory, page in self.gantt_data:
                 for j, p in enumerate(memory):
                     if p is not None:
                         color = 'red' if p == page and self.faults[time] else 'blue'
                         self.ax_gantt.bar(time, 1, bottom=j, width=0.8, color=color, edgecolor='black')
-                        self.ax_gantt.text(time, j + 0.5, str(p), ha='center', va='center', color='white', fontweight='bold', fontsize=10)
+                        self.ax_gantt.text(time, j + 0.5, format_page(p), ha='center', va='center', color='white', fontweight='bold', fontsize=10)
 
         elif graph_type == "Histogram":
             # Plot a histogram of page faults over time
@@ -216,10 +2545,10 @@ class GanttChart:
             self.animation = None
 
         self.ax_gantt.clear()
-        print(f"Starting animation with {len(self.gantt_data)} frames, interval={self.speed.get()}ms")
+        chart_log.debug("Starting animation: %d frames, interval=%dms", len(self.gantt_data), self.speed.get())
 
         # Create a new animation
-        self.animation = FuncAnimation(
+        self.animation = animation.FuncAnimation(
             self.fig_gantt,
             self.update_animation,
             frames=len(self.gantt_data),
@@ -233,26 +2562,24 @@ class GanttChart:
     def update_animation(self, frame):
         self.ax_gantt.clear()
         graph_type = self.graph_type.get()
-        print(f"Animating frame {frame + 1}/{len(self.gantt_data)}, type={graph_type}")
+        chart_log.debug("Animating frame %d/%d, type=%s", frame + 1, len(self.gantt_data), graph_type)
 
         if graph_type == "Broken Bar":
             # Plot the history up to the current frame
-            for time in range(frame + 1):
-                memory, page = self.gantt_data[time][1], self.gantt_data[time][2]
+            for time, memory, page in itertools.islice(self.gantt_data, frame + 1):
                 for j, p in enumerate(memory):
                     if p is not None:
                         color = 'red' if p == page and self.faults[time] else 'blue'
                         self.ax_gantt.broken_barh([(time, 0.8)], (j - 0.4, 0.8), facecolors=color, edgecolors='black')
-                        self.ax_gantt.text(time + 0.4, j, str(p), ha='center', va='center', color='white', fontweight='bold', fontsize=10)
+                        self.ax_gantt.text(time + 0.4, j, format_page(p), ha='center', va='center', color='white', fontweight='bold', fontsize=10)
 
         elif graph_type == "Bar":
-            for time in range(frame + 1):
-                memory, page = self.gantt_data[time][1], self.gantt_data[time][2]
+            for time, memory, page in itertools.islice(self.gantt_data, frame + 1):
                 for j, p in enumerate(memory):
                     if p is not None:
                         color = 'red' if p == page and self.faults[time] else 'blue'
                         self.ax_gantt.bar(time, 1, bottom=j, width=0.8, color=color, edgecolor='black')
-                        self.ax_gantt.text(time, j + 0.5, str(p), ha='center', va='center', color='white', fontweight='bold', fontsize=10)
+                        self.ax_gantt.text(time, j + 0.5, format_page(p), ha='center', va='center', color='white', fontweight='bold', fontsize=10)
 
         elif graph_type == "Histogram":
             fault_times = [i for i, fault in enumerate(self.faults[:frame + 1]) if fault]
@@ -272,7 +2599,7 @@ class GanttChart:
                 else:
                     self.hit_sound.play()
             except Exception as e:
-                print(f"Error playing sound: {e}")
+                chart_log.warning("Error playing sound: %s", e)
 
         self.format_gantt_chart(f" (Step {frame + 1}/{len(self.gantt_data)})")
         self.fig_gantt.tight_layout()
@@ -288,16 +2615,47 @@ class GanttChart:
         self.ax_gantt.set_title(f'Gantt Chart - {self.algorithm}{extra_title}', fontsize=14, pad=15)
         self.ax_gantt.grid(True, linestyle='--', alpha=0.7)
 
+    def draw_page_bars(self, ax, unique_pages, counts, color):
+        # Numeric pages keep their position on the x axis; pid:page references, or pages beyond
+        # the top CHART_TOP_PAGES, get one labelled bar each plus an "Other" bar for the rest
+        top, slots = top_pages(counts)
+        if len(top) == len(unique_pages) and not is_tagged(unique_pages):
+            ax.bar(unique_pages, counts, color=color, alpha=0.7)
+            return
+        values = np.bincount(slots, weights=counts, minlength=len(top) + 1)
+        labels = [format_page(unique_pages[i]) for i in top]
+        if len(top) < len(unique_pages):
+            labels.append(f"Other ({len(unique_pages) - len(top)})")
+        bars = ax.bar(range(len(labels)), values[:len(labels)], color=color, alpha=0.7)
+        if len(top) < len(unique_pages):
+            bars[-1].set_color('gray')
+        ax.set_xticks(range(len(labels)))
+        ax.set_xticklabels(labels, rotation=90, fontsize=8)
+
     def update_analysis_graphs(self):
         try:
-            # Cumulative Faults
+            self.draw_analysis_graphs()
+        except Exception as e:
+            chart_log.exception("Failed to render analysis graphs")
+            messagebox.showerror("Error", f"Failed to render analysis graphs: {str(e)}")
+
+    def draw_analysis_graphs(self, charts=None):
+        # charts limits which figures are redrawn; headless export only renders what it saves
+        charts = CHART_NAMES if charts is None else charts
+        if {"cumulative", "fault_rate", "utilization"} & set(charts):
+            with phase("metrics"):
+                metrics = compute_step_metrics(self.faults, self.gantt_data)
+        if {"timeline", "heatmap"} & set(charts):
+            # Frame contents as page indices, with pages ranked by the frame-steps they were resident
+            with phase("metrics"):
+                unique_pages = page_indices(self.pages)[0]
+                resident = resident_indices(self.gantt_data, self.max_frames, unique_pages)
+                top, slots = top_pages(np.bincount(resident[resident >= 0], minlength=len(unique_pages)))
+
+        # Cumulative Faults
+        if "cumulative" in charts:
             self.ax_cumulative.clear()
-            cumulative_faults = [0]
-            fault_count = 0
-            for i in range(len(self.gantt_data)):
-                fault = self.faults[i]
-                fault_count += 1 if fault else 0
-                cumulative_faults.append(fault_count)
+            cumulative_faults = metrics["cumulative"]
             self.ax_cumulative.plot(range(len(cumulative_faults)), cumulative_faults, marker='o', color='red', label='Cumulative Faults')
             self.ax_cumulative.set_xlabel('Time', fontsize=12)
             self.ax_cumulative.set_ylabel('Cumulative Faults', fontsize=12)
@@ -307,16 +2665,10 @@ class GanttChart:
             self.fig_cumulative.tight_layout()
             self.canvas_cumulative.draw()
 
-            # Page Fault Rate
+        # Page Fault Rate
+        if "fault_rate" in charts:
             self.ax_fault_rate.clear()
-            window_size = 5
-            fault_counts = [1 if fault else 0 for fault in self.faults]
-            fault_rate = []
-            for i in range(len(fault_counts)):
-                start = max(0, i - window_size + 1)
-                window = fault_counts[start:i+1]
-                rate = sum(window) / len(window)
-                fault_rate.append(rate)
+            fault_rate = metrics["fault_rate"]
             self.ax_fault_rate.plot(range(len(fault_rate)), fault_rate, marker='o', color='purple', label='Fault Rate')
             self.ax_fault_rate.set_xlabel('Time', fontsize=12)
             self.ax_fault_rate.set_ylabel('Fault Rate', fontsize=12)
@@ -326,11 +2678,10 @@ class GanttChart:
             self.fig_fault_rate.tight_layout()
             self.canvas_fault_rate.draw()
 
-            # Memory Utilization
+        # Memory Utilization
+        if "utilization" in charts:
             self.ax_utilization.clear()
-            utilization = []
-            for time, memory, _ in self.gantt_data:
-                utilization.append(len([p for p in memory if p is not None]) if memory else 0)
+            utilization = metrics["utilization"]
             self.ax_utilization.bar(range(len(utilization)), utilization, color='green', alpha=0.7)
             self.ax_utilization.set_xlabel('Time', fontsize=12)
             self.ax_utilization.set_ylabel('Frames in Use', fontsize=12)
@@ -340,11 +2691,14 @@ class GanttChart:
             self.fig_utilization.tight_layout()
             self.canvas_utilization.draw()
 
-            # Page Frequency
+        # Page Frequency
+        if "frequency" in charts:
             self.ax_frequency.clear()
-            if self.pages:
-                self.ax_frequency.hist(self.pages, bins=range(min(self.pages), max(self.pages) + 2), color='blue', alpha=0.7, rwidth=0.8)
-                self.ax_frequency.set_xlabel('Page Number', fontsize=12)
+            if len(self.pages):
+                referenced, indices = page_indices(self.pages)
+                counts = np.bincount(indices, minlength=len(referenced))
+                self.draw_page_bars(self.ax_frequency, referenced, counts, 'blue')
+                self.ax_frequency.set_xlabel('Page (pid:page)' if is_tagged(referenced) else 'Page Number', fontsize=12)
                 self.ax_frequency.set_ylabel('Frequency', fontsize=12)
                 self.ax_frequency.set_title('Page Frequency in Reference String', fontsize=14)
                 self.ax_frequency.grid(True, linestyle='--', alpha=0.7)
@@ -353,7 +2707,8 @@ class GanttChart:
             self.fig_frequency.tight_layout()
             self.canvas_frequency.draw()
 
-            # Hit/Fault Distribution
+        # Hit/Fault Distribution
+        if "distribution" in charts:
             self.ax_distribution.clear()
             faults_count = sum(1 for fault in self.faults if fault)
             hits_count = len(self.faults) - faults_count
@@ -365,20 +2720,17 @@ class GanttChart:
             self.fig_distribution.tight_layout()
             self.canvas_distribution.draw()
 
-            # Page Replacement Timeline (Stacked Area Chart)
+        # Page Replacement Timeline (Stacked Area Chart)
+        if "timeline" in charts:
             self.ax_timeline.clear()
-            unique_pages = sorted(set(self.pages))
-            timeline_data = {page: [] for page in unique_pages}
-            for time, memory, _ in self.gantt_data:
-                page_counts = {page: 0 for page in unique_pages}
-                for page in memory:
-                    if page is not None:
-                        page_counts[page] += 1
-                for page in unique_pages:
-                    timeline_data[page].append(page_counts[page])
-
-            stack_data = np.array([timeline_data[page] for page in unique_pages])
-            self.ax_timeline.stackplot(range(len(self.gantt_data)), stack_data, labels=[f"Page {page}" for page in unique_pages], alpha=0.7)
+            stack_data = resident_series(resident, slots, len(top) + 1)
+            labels = [f"Page {format_page(unique_pages[i])}" for i in top]
+            colors = [f"C{i % 10}" for i in range(len(top))]
+            if len(top) < len(unique_pages):
+                labels.append(f"Other ({len(unique_pages) - len(top)} pages)")
+                colors.append('lightgray')
+            if labels:
+                self.ax_timeline.stackplot(range(len(self.gantt_data)), stack_data[:len(labels)], labels=labels, colors=colors, alpha=0.7)
             self.ax_timeline.set_xlabel('Time', fontsize=12)
             self.ax_timeline.set_ylabel('Frame Occupancy', fontsize=12)
             self.ax_timeline.set_title('Page Replacement Timeline', fontsize=14)
@@ -387,31 +2739,26 @@ class GanttChart:
             self.fig_timeline.tight_layout()
             self.canvas_timeline.draw()
 
-            # Fault Distribution by Page
+        # Fault Distribution by Page
+        if "fault_dist" in charts:
             self.ax_fault_dist.clear()
-            fault_counts = {page: 0 for page in set(self.pages)}
-            for i, page in enumerate(self.pages):
-                if self.faults[i]:
-                    fault_counts[page] += 1
-            pages_sorted = sorted(fault_counts.keys())
-            fault_values = [fault_counts[page] for page in pages_sorted]
-            self.ax_fault_dist.bar(pages_sorted, fault_values, color='orange', alpha=0.7)
-            self.ax_fault_dist.set_xlabel('Page Number', fontsize=12)
+            referenced, indices = page_indices(self.pages)
+            fault_counts = np.bincount(indices, weights=fault_flag_array(self.faults), minlength=len(referenced)).astype(np.int64)
+            self.draw_page_bars(self.ax_fault_dist, referenced, fault_counts, 'orange')
+            self.ax_fault_dist.set_xlabel('Page (pid:page)' if is_tagged(referenced) else 'Page Number', fontsize=12)
             self.ax_fault_dist.set_ylabel('Number of Faults', fontsize=12)
             self.ax_fault_dist.set_title('Fault Distribution by Page', fontsize=14)
             self.ax_fault_dist.grid(True, linestyle='--', alpha=0.7)
             self.fig_fault_dist.tight_layout()
             self.canvas_fault_dist.draw()
 
-            # Frame Occupancy Heatmap
+        # Frame Occupancy Heatmap
+        if "heatmap" in charts:
             self.ax_heatmap.clear()
-            frame_occupancy = np.zeros((self.max_frames, len(self.gantt_data)))
-            unique_pages = sorted(set(self.pages))
-            page_to_idx = {page: idx for idx, page in enumerate(unique_pages)}
-            for time, memory, _ in self.gantt_data:
-                for frame_idx, page in enumerate(memory):
-                    if page in page_to_idx:
-                        frame_occupancy[frame_idx, time] = page_to_idx[page] + 1  # +1 to avoid 0 for colormap
+            labels = [format_page(unique_pages[i]) for i in top]
+            if len(top) < len(unique_pages):
+                labels.append("Other")
+            frame_occupancy = np.where(resident >= 0, slots[resident] + 1, 0).T  # +1 to avoid 0 for colormap
 
             im = self.ax_heatmap.imshow(frame_occupancy, aspect='auto', cmap='viridis', interpolation='nearest')
             self.ax_heatmap.set_xlabel('Time', fontsize=12)
@@ -419,15 +2766,110 @@ class GanttChart:
             self.ax_heatmap.set_title('Frame Occupancy Heatmap', fontsize=14)
             self.ax_heatmap.set_yticks(range(self.max_frames))
             self.ax_heatmap.set_yticklabels([f"Frame {i+1}" for i in range(self.max_frames)])
-            self.ax_heatmap.set_xticks(range(len(self.gantt_data)))
-            self.fig_heatmap.colorbar(im, label='Page Number', ticks=range(1, len(unique_pages) + 1),
-                                     format=plt.FuncFormatter(lambda x, _: unique_pages[int(x)-1] if int(x) > 0 else ""))
+            if len(self.gantt_data) <= CHART_STEP_TICKS:
+                self.ax_heatmap.set_xticks(range(len(self.gantt_data)))
+            self.fig_heatmap.colorbar(im, label='Page (pid:page)' if is_tagged(unique_pages) else 'Page Number', ticks=range(1, len(labels) + 1),
+                                     format=plt.FuncFormatter(lambda x, _: labels[int(x)-1] if 0 < int(x) <= len(labels) else ""))
             self.fig_heatmap.tight_layout()
             self.canvas_heatmap.draw()
 
-        except Exception as e:
-            print(f"Error in update_analysis_graphs: {e}")
-            messagebox.showerror("Error", f"Failed to render analysis graphs: {str(e)}")
+        # Reuse Distance and the LRU fault curve it implies
+        if "reuse" in charts:
+            self.ax_reuse.clear()
+            self.ax_lru_curve.clear()
+            with phase("metrics"):
+                distances = np.asarray(reuse_distances(self.pages), dtype=np.int64)
+                cold_misses = int(np.count_nonzero(distances < 0))
+                reuse_counts = np.bincount(distances[distances >= 0], minlength=1)
+                lru_curve = lru_fault_curve(distances, max(len(set(self.pages)), self.max_frames))
+            self.ax_reuse.bar(range(len(reuse_counts)), reuse_counts, color='teal', alpha=0.7)
+            self.ax_reuse.axvline(self.max_frames - 0.5, color='red', linestyle='--', label=f'{self.max_frames} frames (LRU misses to the right)')
+            self.ax_reuse.set_xlabel('Reuse Distance (distinct pages)', fontsize=12)
+            self.ax_reuse.set_ylabel('References', fontsize=12)
+            self.ax_reuse.set_title(f'Reuse Distance Histogram ({cold_misses} cold misses)', fontsize=14)
+            self.ax_reuse.grid(True, linestyle='--', alpha=0.7)
+            self.ax_reuse.legend()
+            self.ax_lru_curve.plot([frames for frames, _ in lru_curve], [faults for _, faults in lru_curve], marker='o', color='blue', label='LRU Faults')
+            self.ax_lru_curve.axvline(self.max_frames, color='red', linestyle='--', label='Current Frames')
+            self.ax_lru_curve.set_xlabel('Number of Frames', fontsize=12)
+            self.ax_lru_curve.set_ylabel('Page Faults', fontsize=12)
+            self.ax_lru_curve.set_title('LRU Faults vs. Frames (from reuse distances)', fontsize=14)
+            self.ax_lru_curve.grid(True, linestyle='--', alpha=0.7)
+            self.ax_lru_curve.legend()
+            self.fig_reuse.tight_layout()
+            self.canvas_reuse.draw()
+
+        # Working Set
+        if "working_set" in charts:
+            self.update_working_set_graph()
+
+        # Inter-Reference Gaps
+        if "gaps" in charts:
+            self.ax_gaps.clear()
+            with phase("metrics"):
+                gaps = inter_reference_gaps(self.pages)
+            if len(gaps):
+                self.ax_gaps.hist(gaps, bins=range(1, min(int(gaps.max()), 100) + 2), color='brown', alpha=0.7, rwidth=0.8)
+                self.ax_gaps.set_xlabel('Gap (references since previous use)', fontsize=12)
+                self.ax_gaps.set_ylabel('Frequency', fontsize=12)
+                self.ax_gaps.set_title(f'Inter-Reference Gaps (mean {gaps.mean():.1f}, max {int(gaps.max())})', fontsize=14)
+                self.ax_gaps.grid(True, linestyle='--', alpha=0.7)
+            else:
+                self.ax_gaps.set_title('Inter-Reference Gaps - No Repeated Pages', fontsize=14)
+            self.fig_gaps.tight_layout()
+            self.canvas_gaps.draw()
+
+        # Per-Process Faults: fault rate per process and each process's cumulative faults
+        if "processes" in charts:
+            self.ax_process_rate.clear()
+            self.ax_process_faults.clear()
+            references, cumulative = {}, {}
+            for time, (page, fault) in enumerate(zip(self.pages, self.faults)):
+                pid = process_of(page)
+                references[pid] = references.get(pid, 0) + 1
+                counts = cumulative.setdefault(pid, ([], []))
+                if fault:
+                    counts[0].append(time)
+                    counts[1].append(len(counts[1]) + 1)
+            pids = sorted(references)
+            rates = [len(cumulative[pid][1]) / references[pid] * 100 for pid in pids]
+            self.ax_process_rate.bar([str(pid) for pid in pids], rates, color='crimson', alpha=0.7)
+            self.ax_process_rate.set_xlabel('Process', fontsize=12)
+            self.ax_process_rate.set_ylabel('Fault Rate (%)', fontsize=12)
+            self.ax_process_rate.set_title('Fault Rate by Process', fontsize=14)
+            self.ax_process_rate.grid(True, linestyle='--', alpha=0.7)
+            for pid in pids:
+                times, counts = cumulative[pid]
+                self.ax_process_faults.step(times, counts, where='post', label=f'Process {pid}')
+            self.ax_process_faults.set_xlabel('Time', fontsize=12)
+            self.ax_process_faults.set_ylabel('Cumulative Faults', fontsize=12)
+            self.ax_process_faults.set_title('Faults per Process Over Time', fontsize=14)
+            self.ax_process_faults.grid(True, linestyle='--', alpha=0.7)
+            self.ax_process_faults.legend()
+            self.fig_processes.tight_layout()
+            self.canvas_processes.draw()
+
+    def update_working_set_graph(self):
+        try:
+            window = int(self.ws_window_entry.get())
+            if window <= 0:
+                raise ValueError("Window must be a positive number")
+        except ValueError as e:
+            messagebox.showerror("Error", f"Invalid window! {str(e)}", parent=self.window)
+            return
+
+        self.ax_working_set.clear()
+        with phase("metrics"):
+            working_set = working_set_sizes(self.pages, window)
+        self.ax_working_set.plot(range(len(working_set)), working_set, color='darkgreen', label=f'W(t, {window})')
+        self.ax_working_set.axhline(self.max_frames, color='red', linestyle='--', label=f'Allocated Frames ({self.max_frames})')
+        self.ax_working_set.set_xlabel('Time', fontsize=12)
+        self.ax_working_set.set_ylabel('Distinct Pages in Window', fontsize=12)
+        self.ax_working_set.set_title(f'Working Set Size (window {window}, mean {working_set.mean():.1f}, max {int(working_set.max())})', fontsize=14)
+        self.ax_working_set.grid(True, linestyle='--', alpha=0.7)
+        self.ax_working_set.legend()
+        self.fig_working_set.tight_layout()
+        self.canvas_working_set.draw()
 
     def export_chart(self):
         current_tab = self.notebook.index(self.notebook.select())
@@ -437,7 +2879,8 @@ class GanttChart:
             # Analysis tab
             analysis_tab = self.analysis_notebook.index(self.analysis_notebook.select())
             figs = [self.fig_cumulative, self.fig_fault_rate, self.fig_utilization, self.fig_frequency,
-                    self.fig_distribution, self.fig_timeline, self.fig_fault_dist, self.fig_heatmap]
+                    self.fig_distribution, self.fig_timeline, self.fig_fault_dist, self.fig_heatmap,
+                    self.fig_reuse, self.fig_working_set, self.fig_gaps, self.fig_processes]
             fig_to_save = figs[analysis_tab]
 
         file_path = filedialog.asksaveasfilename(defaultextension=".png", filetypes=[("PNG files", "*.png"), ("All files", "*.*")])
@@ -445,6 +2888,354 @@ class GanttChart:
             fig_to_save.savefig(file_path, bbox_inches='tight')
             messagebox.showinfo("Success", f"Chart exported to {file_path}")
 
+# Headless chart export. HeadlessCharts draws with GanttChart's own methods onto plain Agg figures
+# that are created once per process and cleared between jobs, so no Tk window or display is needed.
+CHART_NAMES = ("gantt", "cumulative", "fault_rate", "utilization", "frequency", "distribution",
+               "timeline", "fault_dist", "heatmap", "reuse", "working_set", "gaps", "processes")
+EXPORT_FORMATS = ("png", "svg", "pdf")
+GANTT_GRAPH_TYPES = ("Broken Bar", "Bar", "Histogram")
+
+class FixedValue:
+    # Stands in for the Tk variables and entries the drawing methods read
+    def __init__(self, value):
+        self.value = value
+
+    def get(self):
+        return self.value
+
+class DeferredCanvas:
+    # savefig renders each figure once; the drawing methods' own draw() calls are skipped
+    def draw(self):
+        pass
+
+class HeadlessCharts(GanttChart):
+    def __init__(self, graph_type="Broken Bar", ws_window=10):
+        self.figures = {name: mpl_figure.Figure(figsize=(12, 5), dpi=100) for name in CHART_NAMES}
+        for name, figure in self.figures.items():
+            setattr(self, f"fig_{name}", figure)
+            setattr(self, f"canvas_{name}", DeferredCanvas())
+        self.graph_type = FixedValue(graph_type)
+        self.ws_window_entry = FixedValue(ws_window)
+        self.window = None
+        self.animation = None
+
+    def load(self, gantt_data, algorithm, max_frames, faults, pages):
+        self.gantt_data = gantt_data
+        self.algorithm = algorithm
+        self.max_frames = max_frames
+        self.faults = faults
+        self.pages = pages
+        for name, figure in self.figures.items():
+            figure.clear()
+            if name == "reuse":
+                self.ax_reuse = figure.add_subplot(121)
+                self.ax_lru_curve = figure.add_subplot(122)
+            elif name == "processes":
+                self.ax_process_rate = figure.add_subplot(121)
+                self.ax_process_faults = figure.add_subplot(122)
+            else:
+                setattr(self, f"ax_{name}", figure.add_subplot(111))
+
+    def render(self, directory, stem, formats=("png",), charts=CHART_NAMES):
+        with phase("render"):
+            if "gantt" in charts:
+                self.show_static_gantt()
+            self.draw_analysis_graphs(charts)
+            paths = []
+            for name in charts:
+                for fmt in formats:
+                    path = os.path.join(directory, f"{stem}_{name}.{fmt}")
+                    self.figures[name].savefig(path, format=fmt)  # already laid out by tight_layout()
+                    paths.append(path)
+        return paths
+
+_export_charts = None
+
+def _init_export_worker(graph_type):
+    global _export_charts
+    _export_charts = HeadlessCharts(graph_type)
+
+def _export_job(task):
+    stem, pages, frames, algorithm, directory, formats, charts = task
+    history = StepHistory.build(pages, frames, algorithm)
+    _export_charts.load(history, algorithm, frames, history.faults, pages)
+    return _export_charts.render(directory, stem, formats, charts)
+
+def export_charts(jobs, directory, formats=("png",), charts=CHART_NAMES, graph_type="Broken Bar", workers=None):
+    # jobs are (stem, pages, frames, algorithm) tuples; every job's charts are written to directory.
+    # Each worker builds its figures once and reuses them for all of its jobs.
+    os.makedirs(directory, exist_ok=True)
+    tasks = [(stem, pages, frames, algorithm, directory, tuple(formats), tuple(charts)) for stem, pages, frames, algorithm in jobs]
+    workers = min(workers or os.cpu_count() or 1, len(tasks))
+    chart_log.info("Exporting %d chart sets to %s on %d worker(s)", len(tasks), directory, workers)
+    if workers <= 1:
+        _init_export_worker(graph_type)
+        paths = list(map(_export_job, tasks))
+    else:
+        with futures.ProcessPoolExecutor(max_workers=workers, initializer=_init_export_worker, initargs=(graph_type,)) as pool:
+            paths = list(pool.map(_export_job, tasks))
+    return [path for job_paths in paths for path in job_paths]
+
+class SweepChart:
+    def __init__(self, master, pages, frames, algorithms=("FIFO", "LRU", "Optimal")):
+        self.window = tk.Toplevel(master)
+        self.window.title("Algorithm Comparison - Frame Sweep")
+        self.window.geometry("1000x750")
+
+        self.pages = pages
+        self.frames = frames
+        self.algorithms = list(algorithms)
+        self.curves = {}
+
+        # Frame range for the sweep
+        range_frame = tk.Frame(self.window)
+        range_frame.pack(pady=5)
+        tk.Label(range_frame, text="Min Frames:", font=("Arial", 10)).pack(side=tk.LEFT, padx=5)
+        self.min_entry = ttk.Entry(range_frame, width=6)
+        self.min_entry.pack(side=tk.LEFT)
+        self.min_entry.insert(0, "1")
+        tk.Label(range_frame, text="Max Frames:", font=("Arial", 10)).pack(side=tk.LEFT, padx=5)
+        self.max_entry = ttk.Entry(range_frame, width=6)
+        self.max_entry.pack(side=tk.LEFT)
+        self.max_entry.insert(0, str(max(frames, min(len(set(pages)), frames * 4, SWEEP_DEFAULT_MAX))))
+        button_style = {"width": 12, "font": ("Arial", 10, "bold")}
+        self.sweep_btn = tk.Button(range_frame, text="Run Sweep", command=self.run_sweep, bg="purple", fg="white", **button_style)
+        self.sweep_btn.pack(side=tk.LEFT, padx=10)
+        self.close_btn = tk.Button(range_frame, text="Close", command=self.window.destroy, bg="red", fg="white", **button_style)
+        self.close_btn.pack(side=tk.LEFT, padx=5)
+
+        for btn in (self.sweep_btn, self.close_btn):
+            btn.default_bg = btn["bg"]
+            btn.bind("<Enter>", lambda e: e.widget.config(bg="#d3d3d3"))
+            btn.bind("<Leave>", lambda e: e.widget.config(bg=e.widget.default_bg))
+
+        self.summary_label = tk.Label(self.window, text="", font=("Arial", 11, "bold"))
+        self.summary_label.pack(pady=5)
+
+        self.fig_sweep = plt.Figure(figsize=(10, 5), dpi=100)
+        self.ax_sweep = self.fig_sweep.add_subplot(111)
+        self.canvas_sweep = backend_tkagg.FigureCanvasTkAgg(self.fig_sweep, master=self.window)
+        self.canvas_sweep.get_tk_widget().pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+
+        ttk.Label(self.window, text="Belady's Anomaly Report:", font=("Arial", 10)).pack(anchor="w", padx=10)
+        self.anomaly_text = tk.Text(self.window, height=6, width=100, font=("Courier", 10))
+        self.anomaly_text.pack(fill=tk.X, padx=10, pady=5)
+
+        self.run_sweep()
+
+    def run_sweep(self):
+        try:
+            min_frames = int(self.min_entry.get())
+            max_frames = int(self.max_entry.get())
+            if min_frames <= 0 or max_frames < min_frames:
+                raise ValueError("Frame range must satisfy 1 <= Min <= Max")
+        except ValueError as e:
+            messagebox.showerror("Error", f"Invalid frame range! {str(e)}", parent=self.window)
+            return
+
+        # The sweep runs on a process pool; its futures are polled so the window stays responsive
+        self.sweep_btn.config(state=tk.DISABLED)
+        self.summary_label.config(text=f"Sweeping {max_frames - min_frames + 1} frame counts...")
+        jobs = start_sweep(self.pages, self.algorithms, range(min_frames, max_frames + 1))
+        self.window.after(100, self.finish_sweep, jobs)
+
+    def finish_sweep(self, jobs):
+        if not self.window.winfo_exists():
+            for job in jobs:
+                job.cancel()
+            return
+        if not all(job.done() for job in jobs):
+            self.window.after(100, self.finish_sweep, jobs)
+            return
+        self.sweep_btn.config(state=tk.NORMAL)
+        try:
+            self.curves = sweep_curves([job.result() for job in jobs], self.algorithms)
+        except Exception as e:
+            self.summary_label.config(text="")
+            messagebox.showerror("Error", f"Sweep failed! {str(e)}", parent=self.window)
+            return
+        with phase("render"):
+            self.plot_curves()
+
+    def plot_curves(self):
+        self.ax_sweep.clear()
+        colors = {"FIFO": "red", "LRU": "blue", "Optimal": "green"}
+        report = []
+        for algo, curve in self.curves.items():
+            frame_counts = [frames for frames, _ in curve]
+            fault_counts = [faults for _, faults in curve]
+            self.ax_sweep.plot(frame_counts, fault_counts, marker='o', color=colors.get(algo), label=algo)
+            for prev_frames, prev_faults, frames, faults in find_belady_anomalies(curve):
+                self.ax_sweep.scatter([frames], [faults], s=150, marker='X', color='black', zorder=3)
+                self.ax_sweep.annotate("Belady", (frames, faults), textcoords="offset points", xytext=(0, 10), ha='center', fontsize=9)
+                report.append(f"{algo}: {prev_frames} frames -> {prev_faults} faults, {frames} frames -> {faults} faults")
+
+        frame_counts = [frames for frames, _ in next(iter(self.curves.values()))]
+        if frame_counts[0] <= self.frames <= frame_counts[-1]:
+            self.ax_sweep.axvline(self.frames, color='gray', linestyle=':', label=f'Current ({self.frames} frames)')
+            summary = [f"{algo}: {dict(curve)[self.frames]}" for algo, curve in self.curves.items()]
+            self.summary_label.config(text=f"Faults at {self.frames} frames - " + " | ".join(summary))
+        else:
+            self.summary_label.config(text="")
+
+        self.ax_sweep.set_xlabel('Number of Frames', fontsize=12)
+        self.ax_sweep.set_ylabel('Page Faults', fontsize=12)
+        self.ax_sweep.set_title('Page Faults vs. Frames', fontsize=14)
+        self.ax_sweep.xaxis.set_major_locator(plt.MaxNLocator(integer=True))
+        self.ax_sweep.grid(True, linestyle='--', alpha=0.7)
+        self.ax_sweep.legend()
+        self.fig_sweep.tight_layout()
+        self.canvas_sweep.draw()
+
+        self.anomaly_text.delete(1.0, tk.END)
+        if report:
+            self.anomaly_text.insert(tk.END, "\n".join(report))
+        else:
+            self.anomaly_text.insert(tk.END, "No Belady's anomaly detected in this frame range.")
+
+class LiveDashboard:
+    def __init__(self, master, frames=""):
+        self.window = tk.Toplevel(master)
+        self.window.title("Live Mode")
+        self.window.geometry("1000x750")
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+
+        self.session = None
+        self.after_id = None
+        self.ticks = deque(maxlen=LIVE_TICKS)  # (elapsed, working set, rolling fault rates)
+
+        source_frame = tk.Frame(self.window)
+        source_frame.pack(pady=5)
+        tk.Label(source_frame, text="Source (file, FIFO or - for stdin):", font=("Arial", 10)).pack(side=tk.LEFT, padx=5)
+        self.source_entry = ttk.Entry(source_frame, width=40)
+        self.source_entry.pack(side=tk.LEFT)
+        ttk.Button(source_frame, text="Browse...", command=self.browse).pack(side=tk.LEFT, padx=5)
+        self.follow_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(source_frame, text="Follow (tail -f)", variable=self.follow_var).pack(side=tk.LEFT, padx=5)
+
+        settings_frame = tk.Frame(self.window)
+        settings_frame.pack(pady=5)
+        self.algorithm_vars = {}
+        for algo in online_algorithms():
+            self.algorithm_vars[algo] = tk.BooleanVar(value=True)
+            ttk.Checkbutton(settings_frame, text=algo, variable=self.algorithm_vars[algo]).pack(side=tk.LEFT, padx=5)
+        self.entries = {}
+        for key, text, value in (("frames", "Frames:", frames), ("window", "Window:", LIVE_WINDOW),
+                                 ("interval", "Refresh (ms):", int(LIVE_INTERVAL * 1000))):
+            tk.Label(settings_frame, text=text, font=("Arial", 10)).pack(side=tk.LEFT, padx=5)
+            self.entries[key] = ttk.Entry(settings_frame, width=8)
+            self.entries[key].pack(side=tk.LEFT)
+            self.entries[key].insert(0, str(value))
+        button_style = {"width": 10, "font": ("Arial", 10, "bold")}
+        self.start_btn = tk.Button(settings_frame, text="Start", command=self.start, bg="blue", fg="white", **button_style)
+        self.start_btn.pack(side=tk.LEFT, padx=10)
+        self.stop_btn = tk.Button(settings_frame, text="Stop", command=self.stop, state=tk.DISABLED, bg="red", fg="white", **button_style)
+        self.stop_btn.pack(side=tk.LEFT, padx=5)
+
+        for btn in (self.start_btn, self.stop_btn):
+            btn.default_bg = btn["bg"]
+            btn.bind("<Enter>", lambda e: e.widget.config(bg="#d3d3d3"))
+            btn.bind("<Leave>", lambda e: e.widget.config(bg=e.widget.default_bg))
+
+        self.summary_label = tk.Label(self.window, text="Not running", font=("Arial", 11, "bold"))
+        self.summary_label.pack(pady=5)
+
+        self.fig_live = plt.Figure(figsize=(10, 4), dpi=100)
+        self.ax_live_rate = self.fig_live.add_subplot(121)
+        self.ax_live_ws = self.fig_live.add_subplot(122)
+        self.canvas_live = backend_tkagg.FigureCanvasTkAgg(self.fig_live, master=self.window)
+        self.canvas_live.get_tk_widget().pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+
+        ttk.Label(self.window, text="Recent Steps:", font=("Arial", 10)).pack(anchor="w", padx=10)
+        self.steps_text = tk.Text(self.window, height=10, width=100, font=("Courier", 10))
+        self.steps_text.pack(fill=tk.X, padx=10, pady=5)
+
+    def browse(self):
+        file_path = filedialog.askopenfilename(parent=self.window, filetypes=[("Text files", "*.txt"), ("All files", "*.*")])
+        if file_path:
+            self.source_entry.delete(0, tk.END)
+            self.source_entry.insert(0, file_path)
+
+    def start(self):
+        try:
+            source = self.source_entry.get().strip()
+            if not source:
+                raise ValueError("Choose a file, FIFO or - for stdin")
+            if source != "-" and not os.path.exists(source):
+                raise ValueError(f"{source} does not exist")
+            algorithms = [algo for algo, var in self.algorithm_vars.items() if var.get()]
+            self.interval = int(self.entries["interval"].get())
+            if self.interval <= 0:
+                raise ValueError("Refresh must be a positive number")
+            monitor = LiveMonitor(algorithms, int(self.entries["frames"].get()), int(self.entries["window"].get()))
+        except ValueError as e:
+            messagebox.showerror("Error", f"Invalid live settings! {str(e)}", parent=self.window)
+            return
+        self.stop()
+        self.ticks.clear()
+        self.last_references, self.last_time = 0, time.perf_counter()
+        self.session = LiveSession(monitor, source, self.follow_var.get())
+        self.session.start()
+        gui_log.info("Live mode reading %s", source)
+        self.start_btn.config(state=tk.DISABLED)
+        self.stop_btn.config(state=tk.NORMAL)
+        self.after_id = self.window.after(self.interval, self.refresh)
+
+    def refresh(self):
+        # Runs every `interval` ms from the Tk loop; the reader thread never touches the widgets
+        snapshot = self.session.snapshot()
+        now = time.perf_counter()
+        rate = (snapshot["references"] - self.last_references) / (now - self.last_time)
+        self.last_references, self.last_time = snapshot["references"], now
+        elapsed = now - self.session.started
+        self.ticks.append((elapsed, snapshot["working_set"], [policy["window_fault_rate"] * 100 for policy in snapshot["policies"]]))
+
+        summary = [f"{policy['algorithm']}: {policy['faults']} faults ({policy['window_fault_rate'] * 100:.1f}% rolling)" for policy in snapshot["policies"]]
+        self.summary_label.config(text=f"{snapshot['references']} references at {rate:,.0f}/s | " + " | ".join(summary))
+        self.plot_ticks(snapshot["policies"])
+        self.steps_text.delete(1.0, tk.END)
+        self.steps_text.insert(tk.END, "\n".join(live_step_line(step, snapshot["policies"]) for step in snapshot["steps"]))
+
+        if self.session.done.is_set():
+            if self.session.error:
+                messagebox.showerror("Error", f"Live input failed! {str(self.session.error)}", parent=self.window)
+            self.stop()
+        else:
+            self.after_id = self.window.after(self.interval, self.refresh)
+
+    def plot_ticks(self, policies):
+        self.ax_live_rate.clear()
+        self.ax_live_ws.clear()
+        times = [tick[0] for tick in self.ticks]
+        colors = {"FIFO": "red", "LRU": "blue"}
+        for i, policy in enumerate(policies):
+            self.ax_live_rate.plot(times, [tick[2][i] for tick in self.ticks], color=colors.get(policy["algorithm"]), label=policy["algorithm"])
+        self.ax_live_rate.set_xlabel('Elapsed (s)', fontsize=12)
+        self.ax_live_rate.set_ylabel('Fault Rate (%)', fontsize=12)
+        self.ax_live_rate.set_title('Rolling Fault Rate', fontsize=14)
+        self.ax_live_rate.grid(True, linestyle='--', alpha=0.7)
+        self.ax_live_rate.legend()
+        self.ax_live_ws.plot(times, [tick[1] for tick in self.ticks], color='green')
+        self.ax_live_ws.set_xlabel('Elapsed (s)', fontsize=12)
+        self.ax_live_ws.set_ylabel('Distinct Pages', fontsize=12)
+        self.ax_live_ws.set_title('Working Set (Window)', fontsize=14)
+        self.ax_live_ws.grid(True, linestyle='--', alpha=0.7)
+        self.fig_live.tight_layout()
+        self.canvas_live.draw()
+
+    def stop(self):
+        if self.after_id is not None:
+            self.window.after_cancel(self.after_id)
+            self.after_id = None
+        if self.session is not None:
+            self.session.close()
+        self.start_btn.config(state=tk.NORMAL)
+        self.stop_btn.config(state=tk.DISABLED)
+
+    def close(self):
+        self.stop()
+        self.window.destroy()
+
 class PageReplacementSimulator:
     def __init__(self, root):
         self.root = root
@@ -472,6 +3263,10 @@ class PageReplacementSimulator:
         self.theme_choice.pack(side=tk.LEFT)
         self.theme_choice.set(self.current_theme)
         self.theme_choice.bind("<<ComboboxSelected>>", self.change_theme)
+        ttk.Button(theme_frame, text="Timings...", command=self.show_timings).pack(side=tk.RIGHT, padx=5)
+        self.instrument_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(theme_frame, text="Record Timings", variable=self.instrument_var,
+                        command=self.toggle_instrumentation).pack(side=tk.RIGHT, padx=5)
 
         input_frame = ttk.LabelFrame(main_frame, text="Input Parameters", padding=10)
         input_frame.pack(fill=tk.X, pady=(0, 10))
@@ -494,11 +3289,26 @@ class PageReplacementSimulator:
         algo_frame = tk.Frame(input_frame, bg=self.style.lookup("TFrame", "background"))
         algo_frame.grid(row=2, column=1, padx=5, pady=5, sticky="w")
         ttk.Label(input_frame, text="Select Algorithm:", font=("Arial", 10)).grid(row=2, column=0, padx=5, pady=5, sticky="e")
-        self.algo_choice = ttk.Combobox(algo_frame, values=["FIFO", "LRU", "Optimal", "Custom"], width=20, font=("Arial", 10))
+        self.algo_choice = ttk.Combobox(algo_frame, values=["FIFO", "LRU", "Optimal", "ESC", "NRU", "Custom"], width=20, font=("Arial", 10))
         self.algo_choice.pack(side=tk.LEFT)
         self.algo_choice.set("FIFO")
         ttk.Button(algo_frame, text="Explain", command=self.explain_algorithm).pack(side=tk.LEFT, padx=5)
 
+        # Used when the reference string has pid:page references
+        workload_frame = tk.Frame(input_frame, bg=self.style.lookup("TFrame", "background"))
+        workload_frame.grid(row=3, column=1, padx=5, pady=5, sticky="w")
+        ttk.Label(input_frame, text="Multi-Process (pid:page):", font=("Arial", 10)).grid(row=3, column=0, padx=5, pady=5, sticky="e")
+        self.allocation_choice = ttk.Combobox(workload_frame, values=["Equal", "Proportional", "Working Set", "PFF"], width=12, font=("Arial", 10))
+        self.allocation_choice.pack(side=tk.LEFT)
+        self.allocation_choice.set("Equal")
+        self.scope_choice = ttk.Combobox(workload_frame, values=["Local", "Global"], width=8, font=("Arial", 10))
+        self.scope_choice.pack(side=tk.LEFT, padx=5)
+        self.scope_choice.set("Local")
+        ttk.Label(workload_frame, text="Window:", font=("Arial", 10)).pack(side=tk.LEFT)
+        self.window_entry = ttk.Entry(workload_frame, width=6)
+        self.window_entry.pack(side=tk.LEFT, padx=5)
+        self.window_entry.insert(0, "100")
+
         button_frame = tk.Frame(main_frame, bg=self.style.lookup("TFrame", "background"))
         button_frame.pack(pady=10)
         button_style = {"width": 20, "font": ("Arial", 10, "bold")}
@@ -520,9 +3330,11 @@ class PageReplacementSimulator:
         self.save_btn.grid(row=2, column=1, padx=10, pady=5)
         self.load_btn = tk.Button(button_frame, text="Load Input", command=self.load_input, bg="brown", fg="white", **button_style)
         self.load_btn.grid(row=2, column=2, padx=10, pady=5)
+        self.live_btn = tk.Button(button_frame, text="Live Mode", command=self.open_live_mode, bg="darkgreen", fg="white", **button_style)
+        self.live_btn.grid(row=3, column=1, padx=10, pady=5)
 
         for btn in (self.simulate_btn, self.random_btn, self.view_btn, self.step_btn,
-                   self.compare_btn, self.batch_btn, self.help_btn, self.save_btn, self.load_btn):
+                   self.compare_btn, self.batch_btn, self.help_btn, self.save_btn, self.load_btn, self.live_btn):
             btn.default_bg = btn["bg"]
             btn.bind("<Enter>", lambda e: e.widget.config(bg="#d3d3d3"))
             btn.bind("<Leave>", lambda e: e.widget.config(bg=e.widget.default_bg))
@@ -538,6 +3350,18 @@ class PageReplacementSimulator:
         self.hit_label.pack()
         self.fault_label = ttk.Label(self.stats_frame, text="Fault Rate: N/A", font=("Arial", 10))
         self.fault_label.pack()
+        hierarchy_frame = tk.Frame(self.stats_frame, bg=self.style.lookup("TFrame", "background"))
+        hierarchy_frame.pack(pady=(5, 0))
+        self.hierarchy_var = tk.BooleanVar(value=False)
+        self.hierarchy_config = dict(HIERARCHY_DEFAULTS)
+        ttk.Checkbutton(hierarchy_frame, text="TLB / Access Time Model", variable=self.hierarchy_var).pack(side=tk.LEFT, padx=5)
+        ttk.Button(hierarchy_frame, text="Hierarchy Settings...", command=self.configure_hierarchy).pack(side=tk.LEFT, padx=5)
+        self.eat_label = ttk.Label(self.stats_frame, text="Effective Access Time: N/A", font=("Arial", 10))
+        self.eat_label.pack()
+        self.tlb_label = ttk.Label(self.stats_frame, text="TLB Miss Rate: N/A", font=("Arial", 10))
+        self.tlb_label.pack()
+        self.stall_label = ttk.Label(self.stats_frame, text="Stall Time: N/A", font=("Arial", 10))
+        self.stall_label.pack()
 
         self.gantt_data = None
         self.algorithm = None
@@ -638,9 +3462,9 @@ class PageReplacementSimulator:
         value = self.page_entry_var.get()
         if not value:
             return
-        if not all(c.isdigit() or c in ", " for c in value):
+        if not all(c.isdigit() or c in ", :rwRW" for c in value):
             self.page_entry.delete(0, tk.END)
-            self.page_entry.insert(0, "".join(c for c in value if c.isdigit() or c in ", "))
+            self.page_entry.insert(0, "".join(c for c in value if c.isdigit() or c in ", :rwRW"))
         current_page = self.page_entry.get()
         current_frame = self.frame_entry.get()
         if current_page != self.last_page_entry or current_frame != self.last_frame_entry:
@@ -753,7 +3577,7 @@ class PageReplacementSimulator:
             "FIFO": ("First In First Out (FIFO)",
                      "Replaces the oldest page in memory.\n\n"
                      "Advantages:\n- Simple to implement\n- Low overhead\n\n"
-                     "Disadvantages:\n- May suffer from Belady's anomaly (more frames can lead to more faults)\n- Does not consider page usage frequency"),
+                     "Disadvantages:\n- May suffer from Belady's anomaly (more frames can lead to more faults; use Compare All to sweep frame counts)\n- Does not consider page usage frequency"),
             "LRU": ("Least Recently Used (LRU)",
                     "Replaces the page that has not been used for the longest time.\n\n"
                     "Advantages:\n- Considers page usage history\n- Generally performs well\n\n"
@@ -762,6 +3586,16 @@ class PageReplacementSimulator:
                        "Replaces the page that will not be used for the longest time in the future.\n\n"
                        "Advantages:\n- Theoretically the best performance\n- Minimizes page faults\n\n"
                        "Disadvantages:\n- Requires future knowledge (not practical in real systems)\n- Used mainly for comparison"),
+            "ESC": ("Enhanced Second-Chance (ESC)",
+                    "A clock that prefers unreferenced clean pages, then unreferenced dirty pages, clearing reference bits as it sweeps.\n\n"
+                    "Mark writes with w (e.g., 5w) to set a page's modified bit.\n\n"
+                    "Advantages:\n- Avoids write-backs when a clean page will do\n- Cheap to run\n\n"
+                    "Disadvantages:\n- Only approximates LRU\n- A sweep may pass every frame twice"),
+            "NRU": ("Not Recently Used (NRU)",
+                    f"Evicts a page from the lowest (referenced, modified) class; reference bits are cleared every {NRU_INTERVAL} references.\n\n"
+                    "Mark writes with w (e.g., 5w) to set a page's modified bit.\n\n"
+                    "Advantages:\n- Simple and prefers clean pages\n\n"
+                    "Disadvantages:\n- Coarse: pages in a class are not ordered by age"),
             "Custom": ("Custom Algorithm",
                        "User-defined algorithm.\n\n"
                        "Define your own page replacement logic by writing a Python function.\n"
@@ -776,7 +3610,8 @@ class PageReplacementSimulator:
                 messagebox.showerror("Error", "Please provide both page references and frame number!")
                 return
 
-            pages = [int(x.strip()) for x in self.page_entry.get().split(",") if x.strip()]
+            with phase("parse"):
+                pages = parse_reference_string(self.page_entry.get())
             if not pages:
                 raise ValueError("No valid page numbers provided")
 
@@ -789,28 +3624,43 @@ class PageReplacementSimulator:
                 messagebox.showerror("Error", "Frames must be a positive number!")
                 return
 
-            print(f"Running simulation with pages={pages}, frames={frames}, algorithm={self.algorithm}")
-
-            if self.algorithm == "FIFO":
-                result, faults, self.gantt_data, self.faults = self.fifo(pages, frames)
-            elif self.algorithm == "LRU":
-                result, faults, self.gantt_data, self.faults = self.lru(pages, frames)
-            elif self.algorithm == "Optimal":
-                result, faults, self.gantt_data, self.faults = self.optimal(pages, frames)
-            elif self.algorithm == "Custom":
-                if not self.custom_algorithm_code:
-                    self.define_custom_algorithm()
-                    if not self.custom_algorithm_code:
-                        messagebox.showerror("Error", "No custom algorithm defined!")
-                        return
-                result, faults, self.gantt_data, self.faults = self.run_custom_algorithm(pages, frames)
-            else:
-                messagebox.showerror("Error", "Invalid algorithm selected!")
+            engine_log.info("Running simulation: %d references, %d frames, algorithm=%s", len(pages), frames, self.algorithm)
+            engine_log.debug("Reference string: %s", pages)
+
+            if is_tagged(pages):
+                self.run_workload(pages, frames)
+                return
+
+            if self.algorithm in DIRTY_POLICIES or has_access_flags(self.page_entry.get()):
+                self.run_access(frames)
+                return
+
+            if self.algorithm in POLICIES and len(pages) >= BACKGROUND_RUN_STEPS:
+                self.run_in_background(pages, frames)
                 return
 
-            print(f"Simulation completed: faults={faults}, gantt_data length={len(self.gantt_data)}")
+            instrumentation = get_instrumentation()
+            with instrumentation.profiling() if instrumentation else nullcontext():
+                if self.algorithm in POLICIES:
+                    self.hold_history(StepHistory.build(pages, frames, self.algorithm))
+                    self.faults = self.gantt_data.faults
+                    result, faults = self.gantt_data.lines(), self.faults.count()
+                elif self.algorithm == "Custom":
+                    if not self.custom_algorithm_code:
+                        self.define_custom_algorithm()
+                        if not self.custom_algorithm_code:
+                            messagebox.showerror("Error", "No custom algorithm defined!")
+                            return
+                    with phase("simulate"):
+                        result, faults, gantt_data, self.faults = self.run_custom_algorithm(pages, frames)
+                        self.hold_history(gantt_data)
+                else:
+                    messagebox.showerror("Error", "Invalid algorithm selected!")
+                    return
 
-            self.display_result(result, faults, self.algorithm)
+                engine_log.info("Simulation completed: %d faults over %d steps", faults, len(self.gantt_data))
+
+                self.display_result(result, faults, self.algorithm, len(self.gantt_data))
             self.view_btn.config(state=tk.NORMAL)
         except ValueError as e:
             if "list.remove" in str(e):
@@ -820,61 +3670,80 @@ class PageReplacementSimulator:
         except Exception as e:
             messagebox.showerror("Error", f"An unexpected error occurred: {str(e)}")
 
+    def run_workload(self, pages, frames):
+        if self.algorithm not in POLICIES:
+            messagebox.showerror("Error", "pid:page references can only be simulated with FIFO, LRU or Optimal!")
+            return
+        allocation = self.allocation_choice.get().lower().replace(" ", "_")
+        scope = self.scope_choice.get().lower()
+        window = int(self.window_entry.get())
+        with phase("simulate"):
+            result, faults, gantt_data, self.faults, processes, overcommitted = simulate_workload(
+                pages, frames, self.algorithm, allocation, scope, window)
+        self.hold_history(gantt_data)
+        engine_log.info("Workload simulation completed: %d processes, %d faults over %d steps", len(processes), faults, len(pages))
+        self.display_result(result + [""] + process_fault_lines(processes, overcommitted), faults,
+                            f"{self.algorithm} ({self.allocation_choice.get()} allocation, {scope} replacement)", len(pages))
+        self.view_btn.config(state=tk.NORMAL)
+
+    def run_access(self, frames):
+        if self.algorithm not in ACCESS_POLICIES:
+            messagebox.showerror("Error", "Read/write references can only be simulated with FIFO, LRU, Optimal, ESC or NRU!")
+            return
+        pages, writes = parse_access_string(self.page_entry.get())
+        with phase("simulate"):
+            result, faults, gantt_data, self.faults, policy = simulate_access(pages, writes, frames, self.algorithm)
+        self.hold_history(gantt_data)
+        engine_log.info("R/W simulation completed: %d faults, %d write-backs over %d steps", faults, policy.write_backs, len(pages))
+        self.display_result(result + ["", "* = dirty page", dirty_report_line(policy)], faults, self.algorithm, len(pages))
+        self.view_btn.config(state=tk.NORMAL)
+
+    def run_in_background(self, pages, frames):
+        # Long traces run in a worker process so the window stays responsive; the step
+        # history comes back through shared memory instead of being pickled
+        engine_log.info("Running %d references in a background process", len(pages))
+        self.simulate_btn.config(state=tk.DISABLED)
+        self.view_btn.config(state=tk.DISABLED)
+        self.output_text.delete("1.0", tk.END)
+        self.output_text.insert(tk.END, f"Simulating {len(pages)} references in the background...\n")
+        pool = start_step_pool(1)
+        job = pool.submit(_run_steps_job, pages, frames, self.algorithm)
+        pool.shutdown(wait=False)
+        self.root.after(100, self.finish_background_run, job, pages)
+
+    def finish_background_run(self, job, pages):
+        if not job.done():
+            self.root.after(100, self.finish_background_run, job, pages)
+            return
+        self.simulate_btn.config(state=tk.NORMAL)
+        try:
+            self.hold_history(StepHistory.attach(job.result()))
+        except Exception as e:
+            messagebox.showerror("Error", f"An unexpected error occurred: {str(e)}")
+            return
+        finally:
+            self.view_btn.config(state=tk.NORMAL)  # an earlier result is still loaded if this run failed
+        self.faults = self.gantt_data.faults
+        faults = self.faults.count()
+        engine_log.info("Background simulation completed: %d faults over %d steps", faults, len(self.gantt_data))
+        self.display_result(self.gantt_data.lines(), faults, self.algorithm, len(self.gantt_data))
+
+    def hold_history(self, gantt_data):
+        # The main window holds its StepHistory like a chart window does; a new result lets the old one go
+        if isinstance(gantt_data, StepHistory):
+            gantt_data.acquire()
+        if isinstance(self.gantt_data, StepHistory):
+            self.gantt_data.release()
+        self.gantt_data = gantt_data
+
     def fifo(self, pages, frames):
-        memory, page_faults, result, gantt_data, faults = [], 0, [], [], []
-        for i, page in enumerate(pages):
-            fault = page not in memory
-            if fault:
-                if len(memory) < frames:
-                    memory.append(page)
-                else:
-                    memory.pop(0)
-                    memory.append(page)
-                page_faults += 1
-            # Pad memory with None to ensure consistent length
-            memory_padded = memory + [None] * (frames - len(memory))
-            result.append(f"Page: {page:2d} | Memory: {memory_padded} | {'Fault' if fault else 'Hit'}")
-            gantt_data.append((i, memory_padded, page))
-            faults.append(fault)
-        return result, page_faults, gantt_data, faults
+        return simulate_fifo(pages, frames)
 
     def lru(self, pages, frames):
-        memory, page_faults, result, recent, gantt_data, faults = [], 0, [], {}, [], []
-        for i, page in enumerate(pages):
-            fault = page not in memory
-            if fault:
-                if len(memory) < frames:
-                    memory.append(page)
-                else:
-                    lru_page = min(recent, key=recent.get)
-                    memory.remove(lru_page)
-                    del recent[lru_page]
-                    memory.append(page)
-                page_faults += 1
-            recent[page] = i
-            memory_padded = memory + [None] * (frames - len(memory))
-            result.append(f"Page: {page:2d} | Memory: {memory_padded} | {'Fault' if fault else 'Hit'}")
-            gantt_data.append((i, memory_padded, page))
-            faults.append(fault)
-        return result, page_faults, gantt_data, faults
+        return simulate_lru(pages, frames)
 
     def optimal(self, pages, frames):
-        memory, page_faults, result, gantt_data, faults = [], 0, [], [], []
-        for i, page in enumerate(pages):
-            fault = page not in memory
-            if fault:
-                if len(memory) < frames:
-                    memory.append(page)
-                else:
-                    future = {p: (pages[i+1:].index(p) if p in pages[i+1:] else float('inf')) for p in memory}
-                    memory.remove(max(future, key=future.get))
-                    memory.append(page)
-                page_faults += 1
-            memory_padded = memory + [None] * (frames - len(memory))
-            result.append(f"Page: {page:2d} | Memory: {memory_padded} | {'Fault' if fault else 'Hit'}")
-            gantt_data.append((i, memory_padded, page))
-            faults.append(fault)
-        return result, page_faults, gantt_data, faults
+        return simulate_optimal(pages, frames)
 
     def define_custom_algorithm(self):
         dialog = tk.Toplevel(self.root)
@@ -926,29 +3795,78 @@ class PageReplacementSimulator:
         except Exception as e:
             raise ValueError(f"Error in custom algorithm: {str(e)}")
 
-    def display_result(self, result, faults, algorithm):
-        self.output_text.delete(1.0, tk.END)
-        self.output_text.insert(tk.END, f"Algorithm: {algorithm}\n")
-        self.output_text.insert(tk.END, "\n".join(result))
-        self.output_text.insert(tk.END, f"\n\nTotal Page Faults: {faults}")
-        self.display_stats(faults, len(result))
+    def display_result(self, result, faults, algorithm, steps=None):
+        steps = len(result) if steps is None else steps
+        with phase("render"):
+            self.output_text.delete(1.0, tk.END)
+            self.output_text.insert(tk.END, f"Algorithm: {algorithm}\n")
+            self.output_text.insert(tk.END, "\n".join(itertools.islice(result, MAX_DISPLAY_STEPS)))
+            if steps > MAX_DISPLAY_STEPS:
+                self.output_text.insert(tk.END, f"\n... {steps - MAX_DISPLAY_STEPS} more steps (Save Results writes all of them)")
+            self.output_text.insert(tk.END, f"\n\nTotal Page Faults: {faults}")
+        self.display_stats(faults, steps)
 
     def display_stats(self, faults, total_pages):
-        hit_ratio = (total_pages - faults) / total_pages * 100 if total_pages > 0 else 0
-        fault_rate = (faults / total_pages * 100) if total_pages > 0 else 0
+        with phase("metrics"):
+            hit_ratio = (total_pages - faults) / total_pages * 100 if total_pages > 0 else 0
+            fault_rate = (faults / total_pages * 100) if total_pages > 0 else 0
         self.hit_label.config(text=f"Hit Ratio: {hit_ratio:.2f}%")
         self.fault_label.config(text=f"Fault Rate: {fault_rate:.2f}%")
+        if self.hierarchy_var.get() and self.gantt_data is not None:
+            with phase("hierarchy"):
+                report = TLBModel(**self.hierarchy_config).run(step_events(self.gantt_data, self.faults)).report()
+            self.eat_label.config(text=f"Effective Access Time: {format_ns(report['eat_ns'])}")
+            self.tlb_label.config(text=f"TLB Miss Rate: {report['tlb_miss_rate'] * 100:.2f}%")
+            self.stall_label.config(text=f"Stall Time: {format_ns(report['stall_ns'])}")
+        else:
+            self.eat_label.config(text="Effective Access Time: N/A")
+            self.tlb_label.config(text="TLB Miss Rate: N/A")
+            self.stall_label.config(text="Stall Time: N/A")
+
+    def configure_hierarchy(self):
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Memory Hierarchy Settings")
+        dialog.transient(self.root)
+        dialog.grab_set()
+
+        labels = {"tlb_entries": "TLB Entries:", "tlb_ways": "TLB Associativity:", "tlb_ns": "TLB Latency (ns):",
+                  "memory_ns": "Memory Latency (ns):", "walk_levels": "Page-Table Levels:", "fault_ns": "Fault Service Time (ns):"}
+        entries = {}
+        for row, (key, text) in enumerate(labels.items()):
+            ttk.Label(dialog, text=text, font=("Arial", 10)).grid(row=row, column=0, padx=5, pady=5, sticky="e")
+            entries[key] = ttk.Entry(dialog, width=15)
+            entries[key].grid(row=row, column=1, padx=5, pady=5)
+            entries[key].insert(0, str(self.hierarchy_config[key]))
+
+        def save_settings():
+            try:
+                config = {key: (int if isinstance(HIERARCHY_DEFAULTS[key], int) else float)(entry.get()) for key, entry in entries.items()}
+                TLBModel(**config)
+            except ValueError as e:
+                messagebox.showerror("Error", f"Invalid settings! {str(e)}", parent=dialog)
+                return
+            self.hierarchy_config = config
+            self.hierarchy_var.set(True)
+            dialog.destroy()
+            if self.gantt_data is not None:
+                self.display_stats(self.faults.count() if isinstance(self.faults, FaultBits) else sum(self.faults), len(self.gantt_data))
+
+        button_frame = tk.Frame(dialog)
+        button_frame.grid(row=len(labels), column=0, columnspan=2, pady=10)
+        ttk.Button(button_frame, text="Save", command=save_settings).pack(side=tk.LEFT, padx=5)
+        ttk.Button(button_frame, text="Cancel", command=dialog.destroy).pack(side=tk.LEFT, padx=5)
 
     def interactive_step_through(self):
         if not self.gantt_data:
             messagebox.showinfo("Info", "No simulation data available. Run simulation first.")
             return
 
-        step_window = tk.Toplevel(self.root)
-        step_window.title("Interactive Step-by-Step")
-        step_window.geometry("900x750")
+        self.step_window = tk.Toplevel(self.root)
+        self.step_window.title("Interactive Step-by-Step")
+        self.step_window.geometry("900x800")
+        self.step_window.protocol("WM_DELETE_WINDOW", self.close_step_through)
 
-        graph_frame = tk.Frame(step_window)
+        graph_frame = tk.Frame(self.step_window)
         graph_frame.pack(pady=5)
         tk.Label(graph_frame, text="Analysis Graph:", font=("Arial", 10)).pack(side=tk.LEFT, padx=5)
         self.step_graph_choice = ttk.Combobox(graph_frame, values=[
@@ -956,141 +3874,350 @@ class PageReplacementSimulator:
         ], width=20)
         self.step_graph_choice.pack(side=tk.LEFT)
         self.step_graph_choice.set("Cumulative Faults")
+        self.step_graph_choice.bind("<<ComboboxSelected>>", lambda e: self.build_step_analysis())
 
-        chart_frame = tk.Frame(step_window)
+        chart_frame = tk.Frame(self.step_window)
         chart_frame.pack(fill=tk.BOTH, expand=True)
         self.fig = plt.Figure(figsize=(12, 7), dpi=100)
         self.ax_gantt = self.fig.add_subplot(211)
         self.ax_fault = self.fig.add_subplot(212)
-        self.canvas = FigureCanvasTkAgg(self.fig, master=chart_frame)
+        self.canvas = backend_tkagg.FigureCanvasTkAgg(self.fig, master=chart_frame)
         self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
 
-        text_frame = tk.Frame(step_window)
+        text_frame = tk.Frame(self.step_window)
         text_frame.pack(fill=tk.X, pady=5)
         self.step_text = tk.Text(text_frame, height=5, width=80, font=("Courier", 10))
         self.step_text.pack(pady=5)
 
-        nav_frame = tk.Frame(step_window)
+        nav_frame = tk.Frame(self.step_window)
         nav_frame.pack(pady=5)
         ttk.Button(nav_frame, text="Previous", command=lambda: self.update_step(-1)).pack(side=tk.LEFT, padx=5)
         ttk.Button(nav_frame, text="Next", command=lambda: self.update_step(1)).pack(side=tk.LEFT, padx=5)
+        self.play_btn = ttk.Button(nav_frame, text="Play", command=self.toggle_step_playback)
+        self.play_btn.pack(side=tk.LEFT, padx=5)
+        ttk.Label(nav_frame, text="Go to Step:", font=("Arial", 10)).pack(side=tk.LEFT, padx=(15, 5))
+        self.step_jump_entry = ttk.Entry(nav_frame, width=8)
+        self.step_jump_entry.pack(side=tk.LEFT)
+        self.step_jump_entry.bind("<Return>", lambda e: self.jump_to_step())
+        ttk.Button(nav_frame, text="Go", command=self.jump_to_step).pack(side=tk.LEFT, padx=5)
+
+        self.step_rate = tk.IntVar(value=500)
+        tk.Scale(self.step_window, from_=50, to=2000, orient=tk.HORIZONTAL, variable=self.step_rate,
+                 label="Playback Speed (ms per step)", font=("Arial", 10), length=300).pack(pady=5)
+
+        self.fault_sound, self.hit_sound = load_sounds()
+
+        # Everything the step view needs is computed once here; moving between steps only
+        # toggles the columns that changed and updates the cursor and analysis artists.
+        with phase("metrics"):
+            self.step_metrics = compute_step_metrics(self.faults, self.gantt_data)
+        self.step_columns = {}
+        self.step_background = None
+        self.step_backgrounds = deque(maxlen=STEP_BACKGROUNDS)
+        self.step_increment = []
+        self.step_overlay = []
+        self.canvas.mpl_connect("draw_event", self.on_step_draw)
+        self.canvas.mpl_connect("resize_event", self.on_step_resize)
+        self.step_playing = False
+        self.step_after_id = None
 
-        pygame.mixer.init()
-        try:
-            self.fault_sound = pygame.mixer.Sound("fault.wav")
-            self.hit_sound = pygame.mixer.Sound("hit.wav")
-        except pygame.error as e:
-            print(f"Error loading sound files: {e}")
-            self.fault_sound = None
-            self.hit_sound = None
+        self.ax_gantt.set_xlim(-0.5, len(self.gantt_data))
+        self.ax_gantt.set_ylim(-0.5, self.max_frames - 0.5)
+        self.ax_gantt.set_xlabel('Time', fontsize=12, labelpad=10)
+        self.ax_gantt.set_ylabel('Frames', fontsize=12, labelpad=10)
+        self.ax_gantt.set_yticks(range(self.max_frames))
+        self.ax_gantt.set_yticklabels([f"Frame {i+1}" for i in range(self.max_frames)], fontsize=10)
+        self.ax_gantt.xaxis.set_major_locator(plt.MaxNLocator(integer=True))
+        self.ax_gantt.grid(True, linestyle='--', alpha=0.7)
+        # Columns painted onto the saved background land above the grid, so keep it there in full draws too
+        self.ax_gantt.set_axisbelow(True)
+        # The cursor and the step title change every step, so they are left out of full draws
+        # and painted over the saved background instead
+        self.step_cursor = self.ax_gantt.axvline(0.4, color='orange', linewidth=2, alpha=0.8, animated=True)
+        self.ax_gantt.title.set_animated(True)
 
         self.current_step = 0
+        self.set_step_column_visible(0, True)
+        self.build_step_analysis()
+        self.fig.tight_layout()
         self.update_step(0)
 
     def update_step(self, direction):
-        new_step = self.current_step + direction
-        if 0 <= new_step < len(self.gantt_data):
-            self.current_step = new_step
-            self.ax_gantt.clear()
-            self.ax_fault.clear()
-
-            # Plot Gantt chart up to the current step
-            for time in range(self.current_step + 1):
-                memory, page = self.gantt_data[time][1], self.gantt_data[time][2]
-                for j, p in enumerate(memory):
-                    if p is not None:
-                        color = 'red' if p == page and self.faults[time] else 'blue'
-                        self.ax_gantt.broken_barh([(time, 0.8)], (j - 0.4, 0.8), facecolors=color, edgecolors='black')
-                        self.ax_gantt.text(time + 0.4, j, str(p), ha='center', va='center', color='white', fontweight='bold', fontsize=10)
-
-            graph_type = self.step_graph_choice.get()
-            end_frame = self.current_step + 1
-
-            if graph_type == "Cumulative Faults":
-                cumulative_faults = [0]
-                fault_count = 0
-                for i in range(end_frame):
-                    fault = self.faults[i]
-                    fault_count += 1 if fault else 0
-                    cumulative_faults.append(fault_count)
-                self.ax_fault.plot(range(len(cumulative_faults)), cumulative_faults, marker='o', color='red', label='Cumulative Faults')
-                self.ax_fault.set_xlabel('Time', fontsize=12)
-                self.ax_fault.set_ylabel('Cumulative Faults', fontsize=12)
-                self.ax_fault.set_title('Cumulative Faults Over Time', fontsize=14)
-                self.ax_fault.grid(True, linestyle='--', alpha=0.7)
-                self.ax_fault.legend()
-
-            elif graph_type == "Page Fault Rate":
-                window_size = 5
-                fault_counts = [1 if fault else 0 for fault in self.faults[:end_frame]]
-                fault_rate = []
-                for i in range(len(fault_counts)):
-                    start = max(0, i - window_size + 1)
-                    window = fault_counts[start:i+1]
-                    rate = sum(window) / len(window)
-                    fault_rate.append(rate)
-                self.ax_fault.plot(range(len(fault_rate)), fault_rate, marker='o', color='purple', label='Fault Rate')
-                self.ax_fault.set_xlabel('Time', fontsize=12)
-                self.ax_fault.set_ylabel('Fault Rate', fontsize=12)
-                self.ax_fault.set_title('Page Fault Rate Over Time (Moving Average)', fontsize=14)
-                self.ax_fault.grid(True, linestyle='--', alpha=0.7)
-                self.ax_fault.legend()
-
-            elif graph_type == "Memory Utilization":
-                utilization = [len([p for p in memory if p is not None]) for time, memory, page in self.gantt_data[:end_frame]]
-                self.ax_fault.bar(range(len(utilization)), utilization, color='green', alpha=0.7)
-                self.ax_fault.set_xlabel('Time', fontsize=12)
-                self.ax_fault.set_ylabel('Frames in Use', fontsize=12)
-                self.ax_fault.set_title('Memory Utilization Over Time', fontsize=14)
-                self.ax_fault.set_ylim(0, self.max_frames + 1)
-                self.ax_fault.grid(True, linestyle='--', alpha=0.7)
-
-            elif graph_type == "Page Frequency":
-                pages_to_plot = self.pages[:end_frame]
-                if pages_to_plot:
-                    self.ax_fault.hist(pages_to_plot, bins=range(min(pages_to_plot), max(pages_to_plot) + 2), color='blue', alpha=0.7, rwidth=0.8)
-                    self.ax_fault.set_xlabel('Page Number', fontsize=12)
-                    self.ax_fault.set_ylabel('Frequency', fontsize=12)
-                    self.ax_fault.set_title('Page Frequency in Reference String', fontsize=14)
-                    self.ax_fault.grid(True, linestyle='--', alpha=0.7)
+        return self.show_step(self.current_step + direction)
+
+    def show_step(self, new_step):
+        if not 0 <= new_step < len(self.gantt_data):
+            return False
+        old_step = self.current_step
+        for time in range(old_step + 1, new_step + 1):
+            self.set_step_column_visible(time, True)
+        for time in range(new_step + 1, old_step + 1):
+            self.set_step_column_visible(time, False)
+        self.current_step = new_step
+
+        self.step_cursor.set_xdata([new_step + 0.4, new_step + 0.4])
+        self.ax_gantt.set_title(f'Gantt Chart - {self.algorithm} (Step {new_step + 1}/{len(self.gantt_data)})', fontsize=14, pad=15)
+        self.update_step_analysis(old_step, new_step)
+
+        fault = self.faults[new_step]
+        status = "Fault" if fault else "Hit"
+        time, memory, page = self.gantt_data[new_step]
+        self.step_text.delete(1.0, tk.END)
+        self.step_text.insert(tk.END, f"Step {new_step + 1}: Page {format_page(page)} -> Memory: {memory} | {status}\n")
+
+        if self.fault_sound and self.hit_sound:
+            try:
+                if fault:
+                    self.fault_sound.play()
                 else:
-                    self.ax_fault.set_title('Page Frequency - No Data', fontsize=14)
-
-            elif graph_type == "Hit/Fault Distribution":
-                faults_count = sum(1 for fault in self.faults[:end_frame] if fault)
-                hits_count = end_frame - faults_count
-                labels = ['Faults', 'Hits']
-                sizes = [faults_count, hits_count]
-                colors = ['red', 'green']
-                self.ax_fault.pie(sizes, labels=labels, colors=colors, autopct='%1.1f%%', startangle=140)
-                self.ax_fault.set_title('Hit/Fault Distribution', fontsize=14)
-
-            fault = self.faults[self.current_step]
-            status = "Fault" if fault else "Hit"
-            time, memory, page = self.gantt_data[self.current_step]
-            self.step_text.delete(1.0, tk.END)
-            self.step_text.insert(tk.END, f"Step {self.current_step + 1}: Page {page} -> Memory: {memory} | {status}\n")
-
-            if self.fault_sound and self.hit_sound:
-                try:
-                    if fault:
-                        self.fault_sound.play()
-                    else:
-                        self.hit_sound.play()
-                except Exception as e:
-                    print(f"Error playing sound: {e}")
-
-            self.ax_gantt.set_xlim(-0.5, len(self.gantt_data))
-            self.ax_gantt.set_ylim(-0.5, self.max_frames - 0.5)
-            self.ax_gantt.set_xlabel('Time', fontsize=12, labelpad=10)
-            self.ax_gantt.set_ylabel('Frames', fontsize=12, labelpad=10)
-            self.ax_gantt.set_yticks(range(self.max_frames))
-            self.ax_gantt.set_yticklabels([f"Frame {i+1}" for i in range(self.max_frames)], fontsize=10)
-            self.ax_gantt.set_xticks(range(len(self.gantt_data)))
-            self.ax_gantt.set_title(f'Gantt Chart - {self.algorithm} (Step {self.current_step + 1}/{len(self.gantt_data)})', fontsize=14, pad=15)
-            self.ax_gantt.grid(True, linestyle='--', alpha=0.7)
-            self.fig.tight_layout()
+                    self.hit_sound.play()
+            except Exception as e:
+                gui_log.warning("Error playing sound: %s", e)
+
+        self.blit_step(old_step, new_step)
+        return True
+
+    def blit_step(self, old_step, new_step):
+        # Stepping forward only adds pixels: the new columns and analysis points are painted onto
+        # the saved background, which is then saved again. The background each forward step
+        # started from is kept (up to STEP_BACKGROUNDS of them), so stepping back to one of those
+        # steps restores it; stepping back further falls back to a full draw.
+        if self.step_background is not None and new_step < old_step:
+            while self.step_backgrounds and self.step_backgrounds[-1][0] > new_step:
+                self.step_backgrounds.pop()
+            if self.step_backgrounds and self.step_backgrounds[-1][0] == new_step:
+                self.step_background = self.step_backgrounds.pop()[1]
+                self.canvas.restore_region(self.step_background)
+                self.draw_step_overlay()
+                self.canvas.blit(self.fig.bbox)
+                return
+        if self.step_background is None or new_step < old_step:
+            self.sync_step_lines()
             self.canvas.draw()
+            return
+        if new_step > old_step:
+            self.step_backgrounds.append((old_step, self.step_background))
+        self.canvas.restore_region(self.step_background)
+        # Bars before labels, as a full draw orders them, when several columns appear at once
+        columns = [artist for time in range(old_step + 1, new_step + 1) for artist in self.step_columns[time]]
+        for artist in sorted(columns, key=lambda artist: artist.get_zorder()):
+            self.ax_gantt.draw_artist(artist)
+        for artist in self.step_increment:
+            self.ax_fault.draw_artist(artist)
+        self.step_background = self.canvas.copy_from_bbox(self.fig.bbox)
+        self.draw_step_overlay()
+        self.canvas.blit(self.fig.bbox)
+
+    def draw_step_overlay(self):
+        self.ax_gantt.draw_artist(self.step_cursor)
+        self.ax_gantt.draw_artist(self.ax_gantt.title)
+        for artist in self.step_overlay:
+            self.ax_fault.draw_artist(artist)
+
+    def on_step_draw(self, event):
+        # Full draws leave out the animated artists, so save the background before adding them
+        self.step_background = self.canvas.copy_from_bbox(self.fig.bbox)
+        self.step_backgrounds.clear()
+        self.draw_step_overlay()
+
+    def on_step_resize(self, event):
+        # Tk redraws a resized canvas itself, so the line charts must be current before it does
+        self.step_background = None
+        self.sync_step_lines()
+
+    def sync_step_lines(self):
+        # Forward steps only paint the newest line segment, so the full line is caught up here
+        graph_type = self.step_graph_choice.get()
+        end_frame = self.current_step + 1
+        if graph_type == "Cumulative Faults":
+            self.step_artists.set_data(range(end_frame + 1), self.step_metrics["cumulative"][:end_frame + 1])
+        elif graph_type == "Page Fault Rate":
+            self.step_artists.set_data(range(end_frame), self.step_metrics["fault_rate"][:end_frame])
+
+    def set_step_column_visible(self, time, visible):
+        # Columns are drawn the first time they are revealed and only toggled afterwards
+        artists = self.step_columns.get(time)
+        if artists is None:
+            if not visible:
+                return
+            artists = self.step_columns[time] = []
+            memory, page = self.gantt_data[time][1], self.gantt_data[time][2]
+            for j, p in enumerate(memory):
+                if p is not None:
+                    color = 'red' if p == page and self.faults[time] else 'blue'
+                    artists.append(self.ax_gantt.broken_barh([(time, 0.8)], (j - 0.4, 0.8), facecolors=color, edgecolors='black'))
+                    artists.append(self.ax_gantt.text(time + 0.4, j, format_page(p), ha='center', va='center', color='white', fontweight='bold', fontsize=10))
+        for artist in artists:
+            artist.set_visible(visible)
+
+    def set_step_bar_visible(self, time, visible):
+        # Memory Utilization bars are created as they are revealed, like the Gantt columns
+        bar = self.step_artists.get(time)
+        if bar is None:
+            if not visible:
+                return
+            bar = self.step_artists[time] = self.ax_fault.bar([time], [self.step_metrics["utilization"][time]], color='green', alpha=0.7).patches[0]
+        bar.set_visible(visible)
+        return bar
+
+    def build_step_analysis(self):
+        self.ax_fault.clear()
+        self.ax_fault.set_axisbelow(True)
+        graph_type = self.step_graph_choice.get()
+        total_steps = len(self.gantt_data)
+        end_frame = self.current_step + 1
+        self.step_artists = None
+        self.step_increment = []
+        self.step_overlay = []
+
+        if graph_type == "Cumulative Faults":
+            cumulative_faults = self.step_metrics["cumulative"]
+            self.step_artists, = self.ax_fault.plot(range(end_frame + 1), cumulative_faults[:end_frame + 1], marker='o', color='red', label='Cumulative Faults')
+            self.step_segment, = self.ax_fault.plot([], [], marker='o', color='red', animated=True)
+            self.ax_fault.set_xlim(-0.5, total_steps + 0.5)
+            self.ax_fault.set_ylim(0, cumulative_faults[-1] + 1)
+            self.ax_fault.set_xlabel('Time', fontsize=12)
+            self.ax_fault.set_ylabel('Cumulative Faults', fontsize=12)
+            self.ax_fault.set_title('Cumulative Faults Over Time', fontsize=14)
+            self.ax_fault.grid(True, linestyle='--', alpha=0.7)
+            self.ax_fault.legend()
+
+        elif graph_type == "Page Fault Rate":
+            fault_rate = self.step_metrics["fault_rate"]
+            self.step_artists, = self.ax_fault.plot(range(end_frame), fault_rate[:end_frame], marker='o', color='purple', label='Fault Rate')
+            self.step_segment, = self.ax_fault.plot([], [], marker='o', color='purple', animated=True)
+            self.ax_fault.set_xlim(-0.5, total_steps - 0.5)
+            self.ax_fault.set_ylim(0, 1.05)
+            self.ax_fault.set_xlabel('Time', fontsize=12)
+            self.ax_fault.set_ylabel('Fault Rate', fontsize=12)
+            self.ax_fault.set_title('Page Fault Rate Over Time (Moving Average)', fontsize=14)
+            self.ax_fault.grid(True, linestyle='--', alpha=0.7)
+            self.ax_fault.legend()
+
+        elif graph_type == "Memory Utilization":
+            self.step_artists = {}
+            self.ax_fault.set_xlim(-0.5, total_steps - 0.5)
+            self.ax_fault.xaxis.set_major_locator(plt.MaxNLocator(integer=True))
+            for time in range(end_frame):
+                self.set_step_bar_visible(time, True)
+            self.ax_fault.set_xlabel('Time', fontsize=12)
+            self.ax_fault.set_ylabel('Frames in Use', fontsize=12)
+            self.ax_fault.set_title('Memory Utilization Over Time', fontsize=14)
+            self.ax_fault.set_ylim(0, self.max_frames + 1)
+            self.ax_fault.grid(True, linestyle='--', alpha=0.7)
+
+        elif graph_type == "Page Frequency":
+            unique_pages, indices = page_indices(self.pages)
+            top, slots = top_pages(np.bincount(indices, minlength=len(unique_pages)))
+            series = len(top) + (len(top) < len(unique_pages))
+            totals = np.bincount(slots[indices], minlength=series)
+            counts = np.bincount(slots[indices[:end_frame]], minlength=series)
+            labels = [format_page(unique_pages[i]) for i in top] + [f"Other ({len(unique_pages) - len(top)})"] * (series - len(top))
+            categorical = series > len(top) or is_tagged(self.pages)
+            positions = range(series) if categorical else unique_pages
+            bars = self.ax_fault.bar(positions, counts[:series], width=0.8, align='edge', color='blue', alpha=0.7)
+            if series > len(top):
+                bars[-1].set_color('gray')
+            # Heights move in both directions, so the (at most CHART_TOP_PAGES + 1) bars are repainted every step
+            for bar in bars.patches:
+                bar.set_animated(True)
+            self.step_overlay = bars.patches
+            if categorical:
+                self.ax_fault.set_xticks([position + 0.4 for position in positions])
+                self.ax_fault.set_xticklabels(labels, rotation=90, fontsize=8)
+            # Pages folded into "Other" share its bar, so stepping updates it like any other
+            self.step_artists = {page: bars.patches[slot] for page, slot in zip(unique_pages, slots.tolist())}
+            self.ax_fault.set_ylim(0, int(totals[:series].max()) + 1)
+            self.ax_fault.set_xlabel('Page (pid:page)' if is_tagged(unique_pages) else 'Page Number', fontsize=12)
+            self.ax_fault.set_ylabel('Frequency', fontsize=12)
+            self.ax_fault.set_title('Page Frequency in Reference String', fontsize=14)
+            self.ax_fault.grid(True, linestyle='--', alpha=0.7)
+
+        elif graph_type == "Hit/Fault Distribution":
+            self.ax_fault.set_title('Hit/Fault Distribution', fontsize=14)
+            self.draw_step_distribution()
+
+        self.step_background = None
+        self.step_backgrounds.clear()
+        self.canvas.draw_idle()
+
+    def update_step_analysis(self, old_step, new_step):
+        graph_type = self.step_graph_choice.get()
+        self.step_increment = []
+
+        if graph_type == "Cumulative Faults":
+            if new_step > old_step:
+                self.step_segment.set_data(range(old_step + 1, new_step + 2), self.step_metrics["cumulative"][old_step + 1:new_step + 2])
+                self.step_increment = [self.step_segment]
+        elif graph_type == "Page Fault Rate":
+            if new_step > old_step:
+                self.step_segment.set_data(range(old_step, new_step + 1), self.step_metrics["fault_rate"][old_step:new_step + 1])
+                self.step_increment = [self.step_segment]
+        elif graph_type == "Memory Utilization":
+            for time in range(new_step + 1, old_step + 1):
+                self.set_step_bar_visible(time, False)
+            self.step_increment = [self.set_step_bar_visible(time, True) for time in range(old_step + 1, new_step + 1)]
+        elif graph_type == "Page Frequency":
+            for time in range(old_step + 1, new_step + 1):
+                bar = self.step_artists[self.pages[time]]
+                bar.set_height(bar.get_height() + 1)
+            for time in range(new_step + 1, old_step + 1):
+                bar = self.step_artists[self.pages[time]]
+                bar.set_height(bar.get_height() - 1)
+        elif graph_type == "Hit/Fault Distribution":
+            self.draw_step_distribution()
+
+    def draw_step_distribution(self):
+        # A two-wedge pie is constant-size, so it is simply rebuilt from the prefix count
+        for artist in self.step_overlay:
+            artist.remove()
+        end_frame = self.current_step + 1
+        faults_count = int(self.step_metrics["cumulative"][end_frame])
+        hits_count = end_frame - faults_count
+        labels = ['Faults', 'Hits']
+        sizes = [faults_count, hits_count]
+        colors = ['red', 'green']
+        wedges, texts, autotexts = self.ax_fault.pie(sizes, labels=labels, colors=colors, autopct='%1.1f%%', startangle=140)
+        self.step_overlay = wedges + texts + autotexts
+        for artist in self.step_overlay:
+            artist.set_animated(True)
+
+    def jump_to_step(self):
+        try:
+            step = int(self.step_jump_entry.get())
+            if not 1 <= step <= len(self.gantt_data):
+                raise ValueError(f"Step must be between 1 and {len(self.gantt_data)}")
+        except ValueError as e:
+            messagebox.showerror("Error", f"Invalid step! {str(e)}", parent=self.step_window)
+            return
+        self.show_step(step - 1)
+
+    def toggle_step_playback(self):
+        if self.step_playing:
+            self.stop_step_playback()
+        else:
+            self.step_playing = True
+            self.play_btn.config(text="Pause")
+            self.play_next_step()
+
+    def play_next_step(self):
+        if not self.step_playing:
+            return
+        if not self.update_step(1):
+            self.stop_step_playback()
+            return
+        self.step_after_id = self.step_window.after(self.step_rate.get(), self.play_next_step)
+
+    def stop_step_playback(self):
+        self.step_playing = False
+        if self.step_after_id is not None:
+            self.step_window.after_cancel(self.step_after_id)
+            self.step_after_id = None
+        self.play_btn.config(text="Play")
+
+    def close_step_through(self):
+        self.stop_step_playback()
+        self.step_window.destroy()
 
     def batch_process(self):
         dialog = tk.Toplevel(self.root)
@@ -1115,25 +4242,49 @@ class PageReplacementSimulator:
                 if frames <= 0:
                     raise ValueError("Frames must be a positive number!")
 
-                strings = input_text.get("1.0", tk.END).strip().split("\n")
-                results = []
-                for idx, string in enumerate(strings):
-                    if not string.strip():
-                        continue
-                    pages = [int(x.strip()) for x in string.split(",") if x.strip()]
-                    if not pages:
-                        continue
-
-                    algo_results = {}
-                    for algo in ["FIFO", "LRU", "Optimal"]:
-                        self.algorithm = algo
-                        result, faults, _, _ = getattr(self, algo.lower())(pages, frames)
-                        algo_results[algo] = faults
-                    results.append((f"String {idx + 1}: {string}", algo_results))
+                text = input_text.get("1.0", tk.END).strip()
+                strings = text.split("\n")
+                # Finished strings are checkpointed, so rerunning an interrupted batch skips them. The
+                # checkpoint is a header line with the batch key and then one JSON line per string,
+                # appended as each finishes.
+                batch_key = hashlib.blake2b(f"{frames}\n{text}".encode(), digest_size=16).hexdigest()
+                completed = {}
+                if os.path.exists(BATCH_CHECKPOINT):
+                    try:
+                        with open(BATCH_CHECKPOINT, "r") as f:
+                            if json.loads(f.readline()).get("key") == batch_key:
+                                for line in f:
+                                    if not line.endswith("\n"):
+                                        break  # cut short by the interruption
+                                    entry = json.loads(line)
+                                    completed[entry["string"]] = entry["results"]
+                                gui_log.info("Resuming batch: %d strings already done", len(completed))
+                    except (OSError, ValueError, KeyError) as e:
+                        gui_log.warning("Ignoring unreadable batch checkpoint: %s", e)
+                        completed = {}
+                batch = [(idx, string, parse_reference_string(string)) for idx, string in enumerate(strings) if string.strip()]
+                batch = [(idx, string, pages) for idx, string, pages in batch if pages]
+                algorithms = ["FIFO", "LRU", "Optimal"]
+                pending = [(idx, pages) for idx, _, pages in batch if str(idx) not in completed]
+                # The table only needs fault counts: one lockstep pass per string, on a process pool
+                # for large batches. Per-step histories are built when a chart or export asks for them.
+                workers = None if sum(len(pages) for _, pages in pending) >= BATCH_POOL_REFERENCES else 1
+                counts = iter_fault_counts([pages for _, pages in pending], algorithms, frames, workers)
+                with open(BATCH_CHECKPOINT, "w") as f:
+                    # Rewritten once per run, which also drops a line cut short by an interruption
+                    f.write(json.dumps({"key": batch_key}) + "\n")
+                    for idx, algo_results in completed.items():
+                        f.write(json.dumps({"string": idx, "results": algo_results}) + "\n")
+                    for (idx, pages), algo_results in zip(pending, counts):
+                        completed[str(idx)] = algo_results
+                        f.write(json.dumps({"string": str(idx), "results": algo_results}) + "\n")
+                        f.flush()
+                os.remove(BATCH_CHECKPOINT)
 
                 result_window = tk.Toplevel(self.root)
                 result_window.title("Batch Processing Results")
                 result_window.geometry("600x400")
+                ttk.Label(result_window, text="Double-click a fault count to open its chart.", font=("Arial", 9)).pack(pady=(5, 0))
                 tree = ttk.Treeview(result_window, columns=("String", "FIFO", "LRU", "Optimal"), show="headings")
                 tree.heading("String", text="Page Reference String")
                 tree.heading("FIFO", text="FIFO Faults")
@@ -1141,8 +4292,102 @@ class PageReplacementSimulator:
                 tree.heading("Optimal", text="Optimal Faults")
                 tree.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
 
-                for string, algo_results in results:
-                    tree.insert("", tk.END, values=(string, algo_results["FIFO"], algo_results["LRU"], algo_results["Optimal"]))
+                batch_pages, histories = {}, {}
+                release_on_destroy(result_window, histories.values())
+                for idx, string, pages in batch:
+                    algo_results = completed[str(idx)]
+                    batch_pages[idx] = pages
+                    tree.insert("", tk.END, iid=str(idx), values=(f"String {idx + 1}: {string}", algo_results["FIFO"], algo_results["LRU"], algo_results["Optimal"]))
+
+                def open_batch_chart(event):
+                    row, column = tree.identify_row(event.y), tree.identify_column(event.x)
+                    algo = tree.heading(column, "text").replace(" Faults", "") if row else None
+                    if algo not in algorithms:
+                        return
+                    idx = int(row)
+                    pages = batch_pages[idx]
+                    if (idx, algo) not in histories and len(pages) >= BACKGROUND_RUN_STEPS:
+                        # Long strings are simulated in a worker and come back through shared memory
+                        pool = start_step_pool(1)
+                        job = pool.submit(_run_steps_job, pages, frames, algo)
+                        pool.shutdown(wait=False)
+                        result_window.config(cursor="watch")
+                        result_window.after(100, finish_batch_chart, job, idx, algo)
+                        return
+                    if (idx, algo) not in histories:
+                        histories[idx, algo] = StepHistory.build(pages, frames, algo).acquire()
+                    show_batch_chart(idx, algo)
+
+                def finish_batch_chart(job, idx, algo):
+                    if not result_window.winfo_exists():
+                        # Nobody will show the chart; release its shared memory once the worker is done
+                        if not job.cancel():
+                            job.add_done_callback(lambda job: job.exception() or StepHistory.attach(job.result()).close())
+                        return
+                    if not job.done():
+                        result_window.after(100, finish_batch_chart, job, idx, algo)
+                        return
+                    result_window.config(cursor="")
+                    try:
+                        history = StepHistory.attach(job.result())
+                    except Exception as e:
+                        messagebox.showerror("Error", f"Simulation failed: {str(e)}", parent=result_window)
+                        return
+                    if (idx, algo) in histories:
+                        history.close()  # the same run was double-clicked again while this one ran
+                    else:
+                        histories[idx, algo] = history.acquire()
+                    show_batch_chart(idx, algo)
+
+                def show_batch_chart(idx, algo):
+                    history = histories[idx, algo]
+                    GanttChart(result_window, history, algo, frames, history.faults, batch_pages[idx])
+
+                tree.bind("<Double-1>", open_batch_chart)
+
+                def export_batch_charts():
+                    directory = filedialog.askdirectory(parent=result_window, title="Export charts to")
+                    if not directory:
+                        return
+                    jobs = [(f"run{idx + 1:03d}_{algo}", pages, frames, algo) for idx, _, pages in batch for algo in algorithms]
+                    result_window.config(cursor="watch")
+                    result_window.update_idletasks()
+                    try:
+                        paths = export_charts(jobs, directory)
+                    except Exception as e:
+                        messagebox.showerror("Error", f"Chart export failed: {str(e)}", parent=result_window)
+                        return
+                    finally:
+                        result_window.config(cursor="")
+                    messagebox.showinfo("Success", f"Exported {len(paths)} charts to {directory}", parent=result_window)
+
+                def export_batch_results():
+                    file_path = filedialog.asksaveasfilename(parent=result_window, defaultextension=".csv",
+                                                             filetypes=[("CSV", "*.csv"), ("NumPy archive", "*.npz"), ("Parquet", "*.parquet")])
+                    if not file_path:
+                        return
+                    with_steps = messagebox.askyesno("Export Results", "Include a per-step trace of every run?", parent=result_window)
+                    runs = [run_summary(f"String {idx + 1}", algo, frames, len(pages), completed[str(idx)][algo])
+                            for idx, _, pages in batch for algo in algorithms]
+                    run_histories = None
+                    try:
+                        if with_steps:
+                            missing = [(idx, algo) for idx, _, _ in batch for algo in algorithms if (idx, algo) not in histories]
+                            workers = None if sum(len(batch_pages[idx]) for idx, _ in missing) >= BATCH_POOL_REFERENCES else 1
+                            built = iter_step_jobs([(batch_pages[idx], frames, algo) for idx, algo in missing], workers)
+                            for history, key in zip(built, missing):
+                                histories[key] = history.acquire()
+                            run_histories = [histories[idx, algo] for idx, _, _ in batch for algo in algorithms]
+                        paths = export_results(file_path, runs, run_histories)
+                    except (OSError, ValueError) as e:
+                        messagebox.showerror("Error", f"Result export failed: {str(e)}", parent=result_window)
+                        return
+                    messagebox.showinfo("Success", f"Exported to {', '.join(paths)}", parent=result_window)
+
+                button_frame = tk.Frame(result_window)
+                button_frame.pack(pady=(0, 10))
+                ttk.Button(button_frame, text="Export Charts...", command=export_batch_charts).pack(side=tk.LEFT, padx=5)
+                ttk.Button(button_frame, text="Export Results...", command=export_batch_results).pack(side=tk.LEFT, padx=5)
 
                 dialog.destroy()
             except ValueError as e:
@@ -1153,27 +4398,58 @@ class PageReplacementSimulator:
 
     def compare_algorithms(self):
         try:
-            pages = [int(x.strip()) for x in self.page_entry.get().split(",") if x.strip()]
+            pages = parse_reference_string(self.page_entry.get())
             frames = int(self.frame_entry.get())
+            if not pages:
+                raise ValueError("No valid page numbers provided")
             if frames <= 0:
                 messagebox.showerror("Error", "Frames must be a positive number!")
                 return
 
-            results = {}
-            for algo in ["FIFO", "LRU", "Optimal"]:
-                self.algorithm = algo
-                result, faults, _, _ = getattr(self, algo.lower())(pages, frames)
-                results[algo] = faults
-
-            compare_window = tk.Toplevel(self.root)
-            compare_window.title("Algorithm Comparison")
-            compare_window.geometry("300x150")
-            tk.Label(compare_window, text="Algorithm Comparison Results", font=("Arial", 12, "bold")).pack(pady=5)
-            for algo, faults in results.items():
-                tk.Label(compare_window, text=f"{algo}: {faults} faults").pack(pady=2)
+            SweepChart(self.root, pages, frames)
         except ValueError:
             messagebox.showerror("Error", "Invalid input! Enter numbers separated by commas.")
 
+    def open_live_mode(self):
+        LiveDashboard(self.root, self.frame_entry.get().strip())
+
+    def toggle_instrumentation(self):
+        set_instrumentation(Instrumentation(profile=True) if self.instrument_var.get() else None)
+
+    def show_timings(self):
+        instrumentation = get_instrumentation()
+        if instrumentation is None:
+            messagebox.showinfo("Info", "Enable Record Timings and run a simulation first.")
+            return
+
+        timings_window = tk.Toplevel(self.root)
+        timings_window.title("Timings and Counters")
+        timings_window.geometry("600x400")
+        timings_text = tk.Text(timings_window, height=15, width=80, font=("Courier", 10))
+        timings_text.pack(padx=10, pady=10, fill=tk.BOTH, expand=True)
+        timings_text.insert(tk.END, instrumentation.summary())
+
+        def export(kind):
+            if kind == "trace":
+                file_path = filedialog.asksaveasfilename(parent=timings_window, defaultextension=".json",
+                                                         filetypes=[("Chrome trace", "*.json"), ("All files", "*.*")])
+            else:
+                file_path = filedialog.asksaveasfilename(parent=timings_window, defaultextension=".prof",
+                                                         filetypes=[("cProfile stats", "*.prof"), ("All files", "*.*")])
+            if not file_path:
+                return
+            if kind == "trace":
+                instrumentation.write_chrome_trace(file_path)
+            else:
+                instrumentation.write_profile(file_path)
+            messagebox.showinfo("Success", f"Exported to {file_path}", parent=timings_window)
+
+        button_frame = tk.Frame(timings_window)
+        button_frame.pack(pady=5)
+        ttk.Button(button_frame, text="Export Chrome Trace", command=lambda: export("trace")).pack(side=tk.LEFT, padx=5)
+        ttk.Button(button_frame, text="Export cProfile Stats", command=lambda: export("profile")).pack(side=tk.LEFT, padx=5)
+        ttk.Button(button_frame, text="Close", command=timings_window.destroy).pack(side=tk.LEFT, padx=5)
+
     def show_help(self):
         help_window = tk.Toplevel(self.root)
         help_window.title("Help")
@@ -1183,6 +4459,10 @@ class PageReplacementSimulator:
         help_text.insert(tk.END, "FIFO: First In First Out - Replaces the oldest page\n\n"
                                "LRU: Least Recently Used - Replaces the least recently used page\n\n"
                                "Optimal: Replaces the page that will not be used for the longest time\n\n"
+                               "Compare All: Sweeps a range of frame counts for every algorithm and flags Belady's anomaly\n\n"
+                               "Read/Write: Add w to a page (e.g., 5w) to write it; ESC and NRU prefer evicting clean pages\n\n"
+                               "Live Mode: Runs FIFO and LRU over references streamed from a file, FIFO or stdin\n\n"
+                               "Multi-Process: Tag pages as pid:page (e.g., 1:7, 2:7) to share the frames between processes\n\n"
                                "Usage:\n- Enter page references (e.g., 1, 2, 3)\n- Set frame number\n- Choose algorithm\n- Use buttons for various functions")
 
     def save_results(self):
@@ -1190,7 +4470,15 @@ class PageReplacementSimulator:
             with open("simulation_results.txt", "w") as f:
                 f.write(f"Pages: {self.page_entry.get()}\n")
                 f.write(f"Frames: {self.frame_entry.get()}\n")
-                f.write(self.output_text.get(1.0, tk.END))
+                if isinstance(self.gantt_data, StepHistory) and len(self.gantt_data) > MAX_DISPLAY_STEPS:
+                    # The output box is truncated for long runs; stream every step from the history
+                    f.write(f"Algorithm: {self.algorithm}\n")
+                    for line in self.gantt_data.lines():
+                        f.write(f"{line}\n")
+                    f.write(f"\nTotal Page Faults: {self.faults.count()}\n")
+                else:
+                    f.write(self.output_text.get(1.0, tk.END))
+            gui_log.info("Results saved to simulation_results.txt")
             messagebox.showinfo("Saved", "Results saved to simulation_results.txt")
         else:
             messagebox.showwarning("Warning", "No results to save!")
@@ -1215,10 +4503,1079 @@ class PageReplacementSimulator:
             messagebox.showinfo("Info", "No simulation data available. Run simulation first.")
             return
 
-        print(f"Opening Gantt chart with: gantt_data={len(self.gantt_data)}, algorithm={self.algorithm}, max_frames={self.max_frames}, faults={len(self.faults)}, pages={len(self.pages)}")
+        gui_log.debug("Opening Gantt chart: %d steps, algorithm=%s, %d frames", len(self.gantt_data), self.algorithm, self.max_frames)
         GanttChart(self.root, self.gantt_data, self.algorithm, self.max_frames, self.faults, self.pages)
 
-if __name__ == "__main__":
+# Local simulation service: a small asyncio HTTP/1.1 server (TCP or Unix socket) in front of a
+# process pool, so other tools can drive the engines without the GUI. POST /simulate, /compare or
+# /sweep with a JSON object; a JSON array is a batch whose requests run concurrently and are
+# answered in order. Finished results stay in an LRU cache keyed by a digest of the request, and
+# identical requests arriving while one is still running wait on the same pool future instead of
+# simulating again. /simulate with "steps": true streams one NDJSON line per step.
+SERVICE_ENDPOINTS = ("simulate", "compare", "sweep")
+HTTP_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+                413: "Payload Too Large", 500: "Internal Server Error"}
+MAX_REQUEST_BYTES = 256 << 20
+STREAM_CHUNK = 4096  # steps decoded per NDJSON write, so one stream does not stall the others
+
+def load_service_pages(source):
+    # A trace file is read here, in the worker, so a large file never blocks the event loop
+    if isinstance(source, dict):
+        with open(source["trace"], "r") as f:
+            return parse_reference_string(f.read())
+    return parse_reference_string(source) if isinstance(source, str) else source
+
+def _service_simulate(source, frames, algorithm, steps):
+    pages = load_service_pages(source)
+    if steps:
+        history = StepHistory.build(pages, frames, algorithm)
+        return dict(service_summary(algorithm, frames, len(history), history.fault_count()), history=history)
+    return service_summary(algorithm, frames, len(pages), compare_policies(pages, [algorithm], frames)[algorithm])
+
+def _service_compare(source, frames, algorithms):
+    pages = load_service_pages(source)
+    faults = compare_policies(pages, algorithms, frames)
+    return {"frames": frames, "references": len(pages), "results": [service_summary(algo, frames, len(pages), faults[algo]) for algo in algorithms]}
+
+def _service_sweep(source, frame_counts, algorithms):
+    # Already inside a pool worker, so the sweep itself runs in this process
+    curves = sweep_frames(load_service_pages(source), algorithms, frame_counts, workers=1)
+    return {"curves": {algo: [list(point) for point in curve] for algo, curve in curves.items()},
+            "anomalies": {algo: [list(anomaly) for anomaly in find_belady_anomalies(curve)] for algo, curve in curves.items()}}
+
+def service_summary(algorithm, frames, references, faults):
+    summary = run_summary(None, algorithm, frames, references, faults)
+    del summary["run"]
+    return summary
+
+def service_job(endpoint, request):
+    # Validates a request and returns (worker function, args, cache key). "trace" names a file on
+    # this machine; the worker reads and parses it, and it is keyed by path, size and mtime.
+    if not isinstance(request, dict):
+        raise ValueError("request must be a JSON object")
+    if "trace" in request:
+        stat = os.stat(request["trace"])
+        source = {"trace": request["trace"]}
+        key = [request["trace"], stat.st_size, stat.st_mtime_ns]
+    else:
+        source = request.get("pages")
+        source = parse_reference_string(source) if isinstance(source, str) else [int(page) for page in source or ()]
+        if not source:
+            raise ValueError("no page references (give \"pages\" or \"trace\")")
+        key = []
+    algorithms = request.get("algorithms", list(POLICIES))
+    if isinstance(algorithms, str):
+        algorithms = [algorithms]
+    unknown = [algo for algo in algorithms if algo not in POLICIES]
+    if unknown or not algorithms:
+        raise ValueError(f"unknown algorithms {unknown}; choose from {', '.join(POLICIES)}")
+    if endpoint == "sweep":
+        frame_counts = request.get("frame_counts") or list(range(1, int(request.get("max_frames", 10)) + 1))
+        frame_counts = sorted({int(frames) for frames in frame_counts})
+        if frame_counts[0] <= 0:
+            raise ValueError("frame counts must be positive")
+        args = (frame_counts, algorithms)
+    else:
+        frames = int(request.get("frames", 0))
+        if frames <= 0:
+            raise ValueError("\"frames\" must be a positive number")
+        if endpoint == "simulate":
+            algorithm = request.get("algorithm", algorithms[0])
+            if algorithm not in POLICIES:
+                raise ValueError(f"unknown algorithm {algorithm}; choose from {', '.join(POLICIES)}")
+            args = (frames, algorithm, bool(request.get("steps")))
+            # Trace files are only read in the worker, where StepHistory rejects tagged pages
+            if args[2] and isinstance(source, list) and is_tagged(source):
+                raise ValueError("per-step output is not available for pid:page traces")
+        else:
+            args = (frames, algorithms)
+    func = {"simulate": _service_simulate, "compare": _service_compare, "sweep": _service_sweep}[endpoint]
+    digest = hashlib.blake2b(json.dumps([endpoint, key, list(args)]).encode(), digest_size=16)
+    if not key:
+        digest.update(np.asarray(source, dtype=np.int64).tobytes())
+    return func, (source,) + args, digest.hexdigest()
+
+class SimulationService:
+    def __init__(self, workers=None, cache_size=128):
+        self.workers = workers or os.cpu_count() or 1
+        self.cache_size = cache_size
+        self.cache = OrderedDict()  # request digest -> finished result
+        self.inflight = {}  # request digest -> pool future shared by identical requests
+        self.counters = {"requests": 0, "simulations": 0, "cache_hits": 0, "coalesced": 0}
+        self.pool = None
+
+    def start(self):
+        self.pool = futures.ProcessPoolExecutor(max_workers=self.workers)
+
+    def close(self):
+        if self.pool:
+            self.pool.shutdown(cancel_futures=True)
+            self.pool = None
+
+    async def submit(self, endpoint, request):
+        func, args, key = service_job(endpoint, request)
+        self.counters["requests"] += 1
+        if key in self.cache:
+            self.counters["cache_hits"] += 1
+            self.cache.move_to_end(key)
+            return self.cache[key]
+        future = self.inflight.get(key)
+        if future is not None:
+            self.counters["coalesced"] += 1
+        else:
+            self.counters["simulations"] += 1
+            future = asyncio.get_running_loop().run_in_executor(self.pool, func, *args)
+            self.inflight[key] = future
+            future.add_done_callback(lambda done: self.finish(key, done))
+        # Shielded: a client that disconnects must not cancel the run for the others waiting on it
+        return await asyncio.shield(future)
+
+    def finish(self, key, future):
+        del self.inflight[key]
+        if future.cancelled() or future.exception() is not None:
+            return
+        self.cache[key] = future.result()
+        while len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+
+    def stats(self):
+        return dict(self.counters, cached=len(self.cache), in_flight=len(self.inflight), workers=self.workers)
+
+    async def handle(self, reader, writer):
+        # One connection; requests are answered in turn until the client closes or asks to
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                try:
+                    method, path, _ = request_line.decode("latin-1").split(" ", 2)
+                    headers = {}
+                    while True:
+                        line = await reader.readline()
+                        if not line.strip():
+                            break
+                        name, _, value = line.decode("latin-1").partition(":")
+                        headers[name.strip().lower()] = value.strip()
+                    length = int(headers.get("content-length", 0))
+                except ValueError:
+                    await self.send_json(writer, 400, {"error": "malformed request"})
+                    break
+                if length > MAX_REQUEST_BYTES:
+                    await self.send_json(writer, 413, {"error": f"request body over {MAX_REQUEST_BYTES} bytes"})
+                    break
+                body = await reader.readexactly(length) if length else b""
+                await self.respond(writer, method, path.split("?", 1)[0].strip("/"), body)
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def respond(self, writer, method, endpoint, body):
+        if endpoint == "stats" and method == "GET":
+            return await self.send_json(writer, 200, self.stats())
+        if endpoint not in SERVICE_ENDPOINTS:
+            return await self.send_json(writer, 404, {"error": f"unknown endpoint /{endpoint}"})
+        if method != "POST":
+            return await self.send_json(writer, 405, {"error": "use POST"})
+        start = time.perf_counter()
+        try:
+            request = json.loads(body or b"{}")
+            if isinstance(request, list):
+                results = await asyncio.gather(*(self.submit(endpoint, item) for item in request))
+            else:
+                results = await self.submit(endpoint, request)
+        except (ValueError, TypeError, KeyError, OSError) as e:
+            return await self.send_json(writer, 400, {"error": str(e)})
+        except Exception as e:
+            service_log.exception("/%s failed", endpoint)
+            return await self.send_json(writer, 500, {"error": str(e)})
+        service_log.info("/%s answered in %.1f ms", endpoint, (time.perf_counter() - start) * 1000)
+        if isinstance(results, dict) and "history" in results:
+            return await self.send_steps(writer, results)
+        if isinstance(results, list):
+            # Per-step histories are only streamed for single requests
+            results = [{name: value for name, value in result.items() if name != "history"} for result in results]
+        await self.send_json(writer, 200, results)
+
+    async def send_json(self, writer, status, payload):
+        body = json.dumps(payload).encode()
+        writer.write(f"HTTP/1.1 {status} {HTTP_REASONS[status]}\r\nContent-Type: application/json\r\n"
+                     f"Content-Length: {len(body)}\r\n\r\n".encode() + body)
+        await writer.drain()
+
+    async def send_steps(self, writer, result):
+        # Chunked NDJSON: the summary line, then {"step", "page", "fault", "evicted"} per step
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: application/x-ndjson\r\nTransfer-Encoding: chunked\r\n\r\n")
+        summary = {name: value for name, value in result.items() if name != "history"}
+        self.write_chunk(writer, json.dumps(summary) + "\n")
+        for columns in result["history"].step_columns(STREAM_CHUNK):
+            rows = zip(columns["step"].tolist(), columns["page"].tolist(), columns["fault"].tolist(), columns["evicted"].tolist())
+            self.write_chunk(writer, "".join(
+                f'{{"step": {step}, "page": {page}, "fault": {"true" if fault else "false"}, "evicted": {"null" if evicted == NO_PAGE else evicted}}}\n'
+                for step, page, fault, evicted in rows))
+            await writer.drain()
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+
+    def write_chunk(self, writer, text):
+        data = text.encode()
+        writer.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+
+async def serve(service, host="127.0.0.1", port=8765, socket_path=None):
+    if socket_path:
+        server = await asyncio.start_unix_server(service.handle, path=socket_path)
+        address = socket_path
+    else:
+        server = await asyncio.start_server(service.handle, host, port)
+        address = f"http://{host}:{server.sockets[0].getsockname()[1]}"
+    print(f"serving {', '.join(SERVICE_ENDPOINTS)} on {address} with {service.workers} worker(s)", flush=True)
+    async with server:
+        await server.serve_forever()
+
+def bench_startup(args):
+    # Each run is a fresh interpreter so module caches from earlier runs do not hide import cost
+    script = os.path.abspath(__file__)
+    probe = (
+        "import json, runpy, sys, time\n"
+        "start = time.perf_counter()\n"
+        f"namespace = runpy.run_path({script!r}, run_name='startup_bench')\n"
+        "imported = time.perf_counter() - start\n"
+        "window = None\n"
+        "try:\n"
+        "    root = namespace['tk'].Tk()\n"
+        "    namespace['PageReplacementSimulator'](root)\n"
+        "    root.update()\n"
+        "    window = time.perf_counter() - start\n"
+        "    root.destroy()\n"
+        "except namespace['tk'].TclError:\n"
+        "    pass\n"
+        f"heavy = [name for name in {HEAVY_MODULES!r} if name in sys.modules]\n"
+        "print(json.dumps({'import': imported, 'window': window, 'heavy': heavy}))\n"
+    )
+    import_times, window_times, heavy = [], [], set()
+    for _ in range(args.runs):
+        output = subprocess.run([sys.executable, "-c", probe], capture_output=True, text=True, check=True).stdout
+        sample = json.loads(output.strip().splitlines()[-1])
+        import_times.append(sample["import"])
+        if sample["window"] is not None:
+            window_times.append(sample["window"])
+        heavy.update(sample["heavy"])
+
+    import_time = sorted(import_times)[len(import_times) // 2]
+    print(f"startup: import {import_time * 1000:.1f} ms (median of {args.runs}, budget {args.budget * 1000:.0f} ms)")
+    if window_times:
+        print(f"startup: main window shown after {sorted(window_times)[len(window_times) // 2] * 1000:.1f} ms")
+    else:
+        print("startup: no display available, main window timing skipped")
+    ok = import_time <= args.budget and not heavy
+    if heavy:
+        print(f"startup: FAIL heavy modules imported eagerly: {', '.join(sorted(heavy))}")
+    elif not ok:
+        print("startup: FAIL import time over budget")
+    return ok
+
+def phased_trace(length, seed=0, pages=5000, working_set=100):
+    # Synthetic trace with shifting locality: each phase draws from its own small working set
+    rng = random.Random(seed)
+    trace = []
+    while len(trace) < length:
+        phase_pages = rng.sample(range(pages), working_set)
+        trace.extend(rng.choices(phase_pages, k=rng.randint(2000, 20000)))
+    return trace[:length]
+
+def bench_parallel(args):
+    workers = args.workers or os.cpu_count() or 1
+    pages = phased_trace(args.references)
+    algorithms = list(POLICIES)
+    # The chunks run the Python policies, so the serial baseline is the lockstep pass, not the kernels
+    start = time.perf_counter()
+    references, next_use, _ = prepare_trace(pages, True)
+    policies = run_lockstep(make_policies(algorithms, 64), references, next_use, report=False)
+    serial = time.perf_counter() - start
+    expected = {policy.name: policy.faults for policy in policies}
+    start = time.perf_counter()
+    result = compare_parallel(pages, algorithms, 64, workers=workers)
+    parallel = time.perf_counter() - start
+    print(f"parallel: {len(pages)} references, 64 frames, {workers} worker(s)")
+    print(f"parallel: single pass {serial:.2f} s, chunk-parallel {parallel:.2f} s, speedup {serial / parallel:.2f}x")
+    ok = result == expected
+    if not ok:
+        print(f"parallel: FAIL fault counts differ: {result} != {expected}")
+    if load_kernels():
+        start = time.perf_counter()
+        compiled = run_kernels(make_policies(algorithms, 64), *intern_trace_array(pages), report=False)
+        print(f"parallel: compiled kernels (single thread) {time.perf_counter() - start:.2f} s")
+        if {policy.name: policy.faults for policy in compiled} != expected:
+            print("parallel: FAIL compiled kernel fault counts differ")
+            ok = False
+    return ok
+
+def bench_kernels(args):
+    # Fault counts of the compiled kernels must equal the policy objects' on every trace
+    kernels = load_kernels()
+    if not kernels:
+        print("kernels: skipped, Numba is not installed (or PAGESIM_JIT=0)")
+        return True
+    rng, ok = random.Random(0), True
+    for _ in range(500):
+        pages = [rng.randint(0, rng.randint(1, 40)) for _ in range(rng.randint(1, 300))]
+        frames = rng.randint(1, 12)
+        policies = make_policies(list(kernels), frames)
+        run_kernels(policies, *intern_trace_array(pages), report=False)
+        expected = {algo: SIMULATORS[algo](pages, frames)[1] for algo in kernels}
+        if {policy.name: policy.faults for policy in policies} != expected:
+            print(f"kernels: FAIL {frames} frames, pages {pages}: {[(policy.name, policy.faults) for policy in policies]} != {expected}")
+            ok = False
+            break
+    pages = phased_trace(args.references)
+    for frames in (16, 64, 1024):
+        start = time.perf_counter()
+        references, next_use, _ = prepare_trace(pages, True)
+        policies = run_lockstep(make_policies(list(kernels), frames), references, next_use, report=False)
+        python_time = time.perf_counter() - start
+        start = time.perf_counter()
+        compiled = run_kernels(make_policies(list(kernels), frames), *intern_trace_array(pages), report=False)
+        kernel_time = time.perf_counter() - start
+        print(f"kernels: {len(pages)} references, {frames} frames: Python {python_time:.2f} s, compiled {kernel_time:.2f} s, "
+              f"{len(pages) * len(kernels) / kernel_time / 1e6:.1f} M policy-references/s")
+        if [policy.faults for policy in compiled] != [policy.faults for policy in policies]:
+            print(f"kernels: FAIL fault counts differ at {frames} frames")
+            ok = False
+    return ok
+
+# Differential verification. The simulate_* functions are the oracles: short, obviously correct
+# and slow. Every faster or differently shaped engine is run on adversarial traces and compared
+# with them; a mismatch (or a crash) is shrunk to a minimal reproducer by dropping references,
+# lowering the frame count and renumbering pages while the engine still disagrees.
+def _verify_generate_random(rng):
+    return [rng.randint(0, rng.randint(1, 20)) for _ in range(rng.randint(0, 80))], rng.randint(1, 10)
+
+def _verify_generate_one_frame(rng):
+    return [rng.randint(0, 6) for _ in range(rng.randint(1, 60))], 1
+
+def _verify_generate_huge_frames(rng):
+    pages = [rng.randint(0, 30) for _ in range(rng.randint(1, 60))]
+    return pages, len(set(pages)) + rng.choice([0, 1, 1000])
+
+def _verify_generate_repeated(rng):
+    pages = []
+    while len(pages) < 60:
+        pages.extend([rng.randint(0, 5)] * rng.randint(1, 12))
+    return pages, rng.randint(1, 4)
+
+def _verify_generate_scan(rng):
+    # A loop one or two pages longer than memory: every reference faults under FIFO and LRU
+    frames = rng.randint(1, 8)
+    loop = list(range(frames + rng.randint(1, 2)))
+    return loop * rng.randint(2, 6), frames
+
+def _verify_generate_belady(rng):
+    # The classic anomaly string under a random relabelling, sometimes with a random tail
+    labels = rng.sample(range(100), 5)
+    pages = [labels[page - 1] for page in (1, 2, 3, 4, 1, 2, 5, 1, 2, 3, 4, 5)]
+    pages += [rng.choice(labels) for _ in range(rng.choice([0, 0, 10]))]
+    return pages, rng.choice([3, 4])
+
+def _verify_generate_wide_ids(rng):
+    # Negative and very large page numbers, for engines that intern or store pages as int64
+    values = [rng.choice([-rng.randint(1, 10 ** 6), rng.randint(0, 9), rng.randint(2 ** 40, 2 ** 62)]) for _ in range(12)]
+    return [rng.choice(values) for _ in range(rng.randint(1, 60))], rng.randint(1, 8)
+
+def _verify_generate_phased(rng):
+    return phased_trace(rng.randint(500, 3000), rng.randint(0, 1 << 30), pages=200, working_set=rng.randint(4, 40)), rng.randint(4, 48)
+
+VERIFY_GENERATORS = {"random": _verify_generate_random, "one_frame": _verify_generate_one_frame,
+                     "huge_frames": _verify_generate_huge_frames, "repeated": _verify_generate_repeated,
+                     "scan": _verify_generate_scan, "belady": _verify_generate_belady,
+                     "wide_ids": _verify_generate_wide_ids, "phased": _verify_generate_phased}
+
+def fault_mismatch(faults, oracle):
+    return None if faults == oracle[1] else f"{faults} faults, expected {oracle[1]}"
+
+def resident_mismatch(memory, oracle):
+    expected = [page for page in oracle[2][-1][1] if page is not None] if oracle[2] else []
+    return None if memory == expected else f"final frames {memory}, expected {expected}"
+
+def _verify_lockstep(pages, frames, algo, oracle):
+    policy = POLICIES[algo](frames)
+    references, next_use, page_table = prepare_trace(pages, policy.needs_future)
+    run_lockstep([policy], references, next_use, report=False)
+    memory = [page_table[page] for page in policy.memory()] if page_table is not None else policy.memory()
+    return fault_mismatch(policy.faults, oracle) or resident_mismatch(memory, oracle)
+
+def _verify_steps(pages, frames, algo, oracle):
+    history = StepHistory.build(pages, frames, algo)
+    if list(history.faults) != oracle[3]:
+        return "fault flags differ"
+    if list(history) != oracle[2]:
+        return "frame contents differ"
+    if list(history.lines()) != oracle[0]:
+        return "result lines differ"
+    for index in sorted({0, len(pages) // 2, len(pages) - 1}) if pages else ():
+        if history[index] != oracle[2][index]:
+            return f"random access to step {index} differs"
+    return None
+
+def _verify_kernels(pages, frames, algo, oracle):
+    policy = run_kernels([POLICIES[algo](frames)], *intern_trace_array(pages), report=False)[0]
+    return fault_mismatch(policy.faults, oracle)
+
+def _verify_parallel(pages, frames, algo, oracle):
+    # In-process chunks with a one-reference warm-up, so nearly every boundary is reconciled.
+    # Only fault counts are promised: reconciled Optimal frames may differ among pages never used again.
+    policy = run_chunk_parallel(pages, [algo], frames, workers=1, chunks=1 + len(pages) % 5, warmup=1)[0]
+    return fault_mismatch(policy.faults, oracle)
+
+def _verify_resumable(pages, frames, algo, oracle):
+    # Split over several runs through a checkpoint, as with --stop-after
+    every = max(1, len(pages) // 3)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "verify.ckpt")
+        for _ in range(len(pages) + 2):
+            policies, _, done = run_resumable(pages, [algo], frames, path, every, stop_after=every + 1)
+            if done:
+                return fault_mismatch(policies[0].faults, oracle)
+    return "resumed runs never finished"
+
+def _verify_sampled(pages, frames, algo, oracle):
+    # At rate 1 every page is sampled and frames are not scaled, so the estimate is exact
+    if not pages:
+        return None
+    total, _, estimates = sampled_miss_ratios(pages, [algo], [frames], rate=1.0, seeds=1)
+    return fault_mismatch(round(estimates[algo][0][1] * total), oracle)
+
+def _verify_workload(pages, frames, algo, oracle):
+    # A single process under global replacement is the plain simulator
+    result, page_faults, gantt_data, faults, _, _ = simulate_workload(pages, frames, algo, scope="global")
+    if (result, page_faults, gantt_data, faults) != tuple(oracle):
+        return fault_mismatch(page_faults, oracle) or "steps differ"
+    return None
+
+def _verify_live(pages, frames, algo, oracle):
+    window = max(1, len(pages) // 2)
+    monitor = LiveMonitor([algo], frames, window, history=5)
+    monitor.feed(pages)
+    snapshot = monitor.snapshot()
+    if snapshot["working_set"] != len(set(pages[-window:])):
+        return f"working set {snapshot['working_set']}, expected {len(set(pages[-window:]))}"
+    if monitor.window_faults[0] != sum(oracle[3][-window:]):
+        return f"rolling faults {monitor.window_faults[0]}, expected {sum(oracle[3][-window:])}"
+    if [step[2][0] for step in snapshot["steps"]] != oracle[3][-5:]:
+        return "recent steps differ"
+    return fault_mismatch(monitor.policies[0].faults, oracle)
+
+def _verify_dirty(pages, frames, algo, oracle):
+    # Writes must not change any decision, and each eviction of a page written since it was loaded
+    # is one write-back; the evictions are read off the oracle's frames
+    writes = [(i + len(pages)) % 3 == 0 for i in range(len(pages))]
+    _, _, gantt_data, faults, policy = simulate_access(pages, writes, frames, algo)
+    if gantt_data != oracle[2] or faults != oracle[3]:
+        return "steps differ"
+    expected, dirty, previous = 0, set(), set()
+    for (_, memory, page), write in zip(oracle[2], writes):
+        resident = {resident for resident in memory if resident is not None}
+        for evicted in previous - resident:
+            if evicted in dirty:
+                dirty.discard(evicted)
+                expected += 1
+        if write:
+            dirty.add(page)
+        previous = resident
+    return None if policy.write_backs == expected else f"{policy.write_backs} write-backs, expected {expected}"
+
+def _verify_prefetch(pages, frames, algo, oracle):
+    # The unwrapped runs in the prefetch pass are the plain policy, a degree-0 wrapper changes
+    # nothing, every prefetched page is used, evicted unused or still waiting, and read-ahead
+    # never evicts the page just demanded (Optimal and FIFO would pick it without the pin)
+    for degree in (0, 2):
+        baselines, wrapped, references, next_use = prefetch_policies(pages, [algo], frames, list(PREFETCHERS), degree)
+        for i, page in enumerate(references):
+            for policy in baselines + wrapped:
+                policy.access(page, next_use[i] if next_use is not None else None)
+            for policy in wrapped:
+                if page not in policy:
+                    return f"{policy.name} (degree {degree}): read-ahead evicted the demanded page at step {i}"
+        for policy in wrapped:
+            problem = fault_mismatch(policy.baseline.faults, oracle)
+            if degree == 0:
+                problem = problem or fault_mismatch(policy.faults, oracle)
+            if policy.issued != policy.useful + policy.wasted + len(policy.prefetched):
+                problem = problem or f"{policy.issued} prefetched but {policy.useful} used, {policy.wasted} wasted"
+            if problem:
+                return f"{policy.name} (degree {degree}): {problem}"
+    return None
+
+VERIFY_ENGINES = {"lockstep": _verify_lockstep, "steps": _verify_steps, "kernels": _verify_kernels,
+                  "parallel": _verify_parallel, "resumable": _verify_resumable, "sampled": _verify_sampled,
+                  "workload": _verify_workload, "live": _verify_live, "dirty": _verify_dirty, "prefetch": _verify_prefetch}
+
+def verify_case(engine, pages, frames, algo):
+    # None when the engine agrees with the oracle, otherwise what differed
+    try:
+        return VERIFY_ENGINES[engine](pages, frames, algo, SIMULATORS[algo](pages, frames))
+    except Exception as e:
+        return f"{type(e).__name__}: {e}"
+
+def shrink_case(pages, frames, failing):
+    # Greedy delta debugging; each change is kept only while failing(pages, frames) still holds
+    changed = True
+    while changed:
+        changed = False
+        size = max(1, len(pages) // 2)
+        while size:
+            i = 0
+            while i < len(pages):
+                candidate = pages[:i] + pages[i + size:]
+                if failing(candidate, frames):
+                    pages, changed = candidate, True
+                else:
+                    i += size
+            size //= 2
+        while frames > 1 and failing(pages, frames - 1):
+            frames, changed = frames - 1, True
+        labels = {}
+        renumbered = [labels.setdefault(page, len(labels)) for page in pages]
+        if renumbered != pages and failing(renumbered, frames):
+            pages, changed = renumbered, True
+    return pages, frames
+
+def verify_cases(args):
+    # (generator, pages, frames) for the --pages trace, or for args.cases generated traces
+    if args.pages:
+        yield "--pages", parse_reference_string(args.pages), args.frames
+        return
+    rng = random.Random(args.seed)
+    generators = list(VERIFY_GENERATORS)
+    for case in range(args.cases):
+        generator = generators[case % len(generators)]
+        yield (generator,) + VERIFY_GENERATORS[generator](rng)
+
+def bench_verify(args):
+    engines = [args.engine] if args.engine else list(VERIFY_ENGINES)
+    if "kernels" in engines and not load_kernels():
+        print("verify: kernels skipped, Numba is not installed (or PAGESIM_JIT=0)")
+        engines.remove("kernels")
+    algorithms = {"kernels": list(load_kernels()), "live": online_algorithms()}
+    checked, failed = dict.fromkeys(engines, 0), {}
+    start = time.perf_counter()
+    for generator, pages, frames in verify_cases(args):
+        for engine in engines:
+            if engine in failed:
+                continue
+            for algo in algorithms.get(engine, SIMULATORS):
+                if args.algorithm and algo != args.algorithm:
+                    continue
+                checked[engine] += 1
+                if verify_case(engine, pages, frames, algo) is None:
+                    continue
+                # Shrunk copies only: the other engines still check the generated trace
+                small_pages, small_frames = shrink_case(pages, frames, lambda pages, frames: verify_case(engine, pages, frames, algo) is not None)
+                failed[engine] = f"{algo} on a {generator} trace: {verify_case(engine, small_pages, small_frames, algo)}; reproduce with: " \
+                                 f"bench verify --engine {engine} --algorithm {algo} --pages \"{', '.join(map(str, small_pages))}\" --frames {small_frames}"
+                break
+    source = "the --pages trace" if args.pages else f"{args.cases} traces from {len(VERIFY_GENERATORS)} generators (seed {args.seed})"
+    print(f"verify: {source} in {time.perf_counter() - start:.1f} s")
+    for engine in engines:
+        status = f"FAIL {failed[engine]}" if engine in failed else "ok"
+        print(f"verify: {engine:10s} {checked[engine]:6d} comparisons {status}")
+    return not failed
+
+BENCHMARKS = {"startup": bench_startup, "parallel": bench_parallel, "kernels": bench_kernels, "verify": bench_verify}
+
+def cli_bench(args):
+    unknown = [name for name in args.names if name not in BENCHMARKS]
+    if unknown:
+        args.parser.error(f"unknown benchmark(s): {', '.join(unknown)}")
+    results = [BENCHMARKS[name](args) for name in args.names or BENCHMARKS]
+    return 0 if all(results) else 1
+
+def load_cli_references(args, flags=True):
+    # Trace files are streamed; nothing but the engine's own state is kept per reference.
+    # flags=False makes an r/w flag anywhere in the trace an error instead of dropping it.
+    if args.pages:
+        return parse_reference_string(args.pages)
+    return iter_trace_file(args.trace, flags)
+
+def cli_compare(args):
+    if args.frames <= 0:
+        args.parser.error("--frames must be a positive number")
+    if args.checkpoint_every <= 0 or (args.stop_after is not None and args.stop_after < 0):
+        args.parser.error("--checkpoint-every must be positive and --stop-after non-negative")
+    if args.stop_after is not None and not args.checkpoint:
+        args.parser.error("--stop-after requires --checkpoint")
+    if (args.workers is not None and args.workers <= 0) or (args.chunks is not None and args.chunks <= 0):
+        args.parser.error("--workers and --chunks must be positive")
+    if args.workers and args.checkpoint:
+        args.parser.error("--workers cannot be combined with --checkpoint")
+    if (args.workers or args.checkpoint or args.steps) and trace_is_tagged(args):
+        args.parser.error("pid:page traces cannot be used with --workers, --checkpoint or --steps; see the workload command")
+    # A reference string is checked whole; a trace file is streamed, so its flags need --writes
+    # and are otherwise rejected where the parse meets them
+    args.track_writes = (args.writes or any(algo in DIRTY_POLICIES for algo in args.algorithms)
+                         or bool(args.pages and has_access_flags(args.pages)))
+    if args.track_writes and (args.workers or args.checkpoint or args.steps or args.tlb_entries is not None):
+        args.parser.error("R/W traces and ESC/NRU cannot be used with --workers, --checkpoint, --steps or --tlb-entries")
+    if args.tlb_entries is not None:
+        if args.workers or args.checkpoint:
+            args.parser.error("--tlb-entries cannot be combined with --workers or --checkpoint")
+        try:
+            TLBModel(**hierarchy_config(args))
+        except ValueError as e:
+            args.parser.error(str(e))
+    if args.steps and not args.results:
+        args.parser.error("--steps requires --results")
+    if args.results and os.path.splitext(args.results)[1].lower() not in RESULT_FORMATS:
+        args.parser.error(f"--results must end in one of {', '.join(RESULT_FORMATS)}")
+    if args.results and args.results.lower().endswith(".parquet") and importlib.util.find_spec("pyarrow") is None:
+        args.parser.error("pyarrow is not installed; use a .csv or .npz results path")
+    try:
+        return run_instrumented(args, lambda: compare_trace(args))
+    except ValueError as e:
+        # Bad tokens, and r/w flags without --writes, only show up while the trace streams
+        args.parser.error(str(e))
+
+def compare_trace(args):
+    if args.track_writes:
+        return compare_writes(args)
+    if args.checkpoint:
+        return compare_resumable(args)
+    if args.tlb_entries:
+        return compare_hierarchy(args)
+    if args.workers:
+        policies = run_chunk_parallel(load_cli_references(args, flags=False), args.algorithms, args.frames, args.workers, args.chunks)
+        print_policy_results(policies)
+        if args.results:
+            export_compare_results(args, policies)
+        return 0
+    policies = make_policies(args.algorithms, args.frames)
+    need_future = any(policy.needs_future for policy in policies)
+    references = load_cli_references(args, flags=False)
+    # A trace that is in memory anyway can go to the compiled kernels; a streamed FIFO/LRU run
+    # stays in Python to keep memory bounded
+    in_memory = need_future or args.pages
+    if in_memory:
+        references = list(references)
+    if in_memory and use_kernels(policies, references):
+        with phase("parse"):
+            ids, next_use = intern_trace_array(references)
+        with phase("simulate"):
+            run_kernels(policies, ids, next_use)
+    else:
+        with phase("parse"):
+            if _instrumentation and not need_future:
+                # Materialise the stream so parsing and simulation are timed separately
+                references = list(references)
+            references, next_use, _ = prepare_trace(references, need_future)
+        with phase("simulate"):
+            run_lockstep(policies, references, next_use)
+    print_policy_results(policies)
+    if args.results:
+        export_compare_results(args, policies)
+    return 0
+
+def compare_hierarchy(args):
+    policies = make_policies(args.algorithms, args.frames)
+    need_future = any(policy.needs_future for policy in policies)
+    models = [TLBModel(**hierarchy_config(args)) for _ in policies]
+    with phase("parse"):
+        references, next_use, page_table = prepare_trace(load_cli_references(args, flags=False), need_future)
+    with phase("simulate"):
+        run_hierarchy(policies, references, next_use, page_table, models)
+    print_policy_results(policies)
+    for policy, model in zip(policies, models):
+        report = model.report()
+        print(f"{policy.name:8s} EAT={format_ns(report['eat_ns'])} tlb_miss_rate={report['tlb_miss_rate'] * 100:.2f}% "
+              f"stall={format_ns(report['stall_ns'])} shootdowns={report['shootdowns']}")
+    if args.results:
+        export_compare_results(args, policies)
+    return 0
+
+def compare_writes(args):
+    # Dirty bits need the write flags, so R/W traces (and ESC/NRU) take the lockstep engine with access_rw
+    policies = [ACCESS_POLICIES[algo](args.frames) for algo in args.algorithms]
+    need_future = any(policy.needs_future for policy in policies)
+    with open(args.trace, "r") if args.trace else nullcontext() as f:
+        with phase("parse"):
+            accesses = iter_accesses(f) if args.trace else zip(*parse_access_string(args.pages))
+            next_use = None
+            if need_future:
+                accesses = list(accesses)
+                references, next_use, _ = prepare_trace([page for page, _ in accesses], True)
+                accesses = zip(references, [write for _, write in accesses])
+        with phase("simulate"):
+            run_dirty(policies, accesses, next_use)
+    with phase("metrics"):
+        for policy in policies:
+            print(dirty_report_line(policy))
+    if args.results:
+        export_compare_results(args, policies)
+    return 0
+
+def hierarchy_config(args):
+    return {"tlb_entries": args.tlb_entries, "tlb_ways": args.tlb_ways, "tlb_ns": args.tlb_ns,
+            "memory_ns": args.memory_ns, "walk_levels": args.walk_levels, "fault_ns": args.fault_ns}
+
+def trace_is_tagged(args):
+    # Checks the reference string, or the start of the trace file, for pid:page tokens
+    if args.pages:
+        return ":" in args.pages
+    with open(args.trace, "r") as f:
+        return ":" in f.read(1 << 16)
+
+def cli_prefetch(args):
+    if args.frames <= 0 or args.degree <= 0:
+        args.parser.error("--frames and --degree must be positive numbers")
+    with phase("parse"):
+        references = list(load_cli_references(args))
+    if not references:
+        args.parser.error("no page references")
+    if is_tagged(references):
+        args.parser.error("prefetching needs plain page numbers, not pid:page references")
+    policies = run_prefetch(references, args.algorithms, args.frames, args.prefetchers, args.degree)
+    with phase("metrics"):
+        for policy in policies:
+            print(prefetch_report_line(prefetch_report(policy)))
+    return 0
+
+def cli_workload(args):
+    if args.frames <= 0 or args.window <= 0:
+        args.parser.error("--frames and --window must be positive numbers")
+    references = list(load_cli_references(args))
+    if not references:
+        args.parser.error("no page references")
+    for algo in args.algorithms:
+        with phase("simulate"):
+            _, faults, _, _, processes, overcommitted = simulate_workload(references, args.frames, algo, args.allocation,
+                                                                          args.scope, args.window, record=False)
+        hits = len(references) - faults
+        print(f"{algo:8s} faults={faults} hits={hits} hit_ratio={hits / len(references) * 100:.2f}% "
+              f"(allocation={args.allocation}, scope={args.scope})")
+        for line in process_fault_lines(processes, overcommitted):
+            print(f"  {line}")
+    return 0
+
+def cli_live(args):
+    if args.interval <= 0:
+        args.parser.error("--interval must be positive")
+    try:
+        monitor = LiveMonitor(args.algorithms, args.frames, args.window, args.history)
+    except ValueError as e:
+        args.parser.error(str(e))
+    session = LiveSession(monitor, args.source, args.follow)
+    session.start()
+    clear = sys.stdout.isatty()
+    last_references, last_time = 0, session.started
+    next_refresh = session.started
+    try:
+        while True:
+            # Refreshes are paced by the clock, not by the input
+            next_refresh += args.interval
+            finished = session.done.wait(max(0.0, next_refresh - time.perf_counter()))
+            snapshot = session.snapshot()
+            now = time.perf_counter()
+            rate = (snapshot["references"] - last_references) / (now - last_time)
+            last_references, last_time = snapshot["references"], now
+            lines = live_dashboard_lines(snapshot, now - session.started, rate)
+            print(("\033[H\033[J" if clear else "") + "\n".join(lines) + ("" if clear else "\n"), flush=True)
+            if finished:
+                break
+    except KeyboardInterrupt:
+        pass
+    finally:
+        session.close()
+    if session.error:
+        print(f"error: {session.error}", file=sys.stderr)
+        return 1
+    return 0
+
+def export_compare_results(args, policies, references=None):
+    # Per-step traces re-run each algorithm over the (materialised) trace to record its StepHistory
+    run = os.path.basename(args.trace) if args.trace else "pages"
+    runs = [run_summary(run, policy.name, args.frames, policy.hits + policy.faults, policy.faults) for policy in policies]
+    histories = None
+    if args.steps:
+        references = list(load_cli_references(args, flags=False)) if references is None else references
+        with phase("record"):
+            histories = [StepHistory.build(references, args.frames, policy.name) for policy in policies]
+    paths = export_results(args.results, runs, histories)
+    print(f"results written to {', '.join(paths)}")
+
+def compare_resumable(args):
+    try:
+        policies, offset, done = run_resumable(load_cli_references(args, flags=False), args.algorithms, args.frames, args.checkpoint,
+                                               args.checkpoint_every, args.stop_after, resume=not args.fresh)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Cannot resume from {args.checkpoint}: {e} (use --fresh to start over)", file=sys.stderr)
+        return 1
+    if not done:
+        print(f"stopped after {offset} references; checkpoint saved to {args.checkpoint}")
+    print_policy_results(policies)
+    if done and args.results:
+        export_compare_results(args, policies)
+    return 0
+
+def print_policy_results(policies):
+    with phase("metrics"):
+        for policy in policies:
+            total = policy.hits + policy.faults
+            hit_ratio = policy.hits / total * 100 if total else 0
+            print(f"{policy.name:8s} faults={policy.faults} hits={policy.hits} hit_ratio={hit_ratio:.2f}%")
+
+def run_instrumented(args, func):
+    # --timings / --chrome-trace turn on phase and counter collection, --profile wraps the run
+    if args.profile and args.profile.endswith((".html", ".pyisession")) and importlib.util.find_spec("pyinstrument") is None:
+        args.parser.error("pyinstrument is not installed; use a .prof path for cProfile output")
+    if args.timings or args.chrome_trace:
+        set_instrumentation(Instrumentation())
+    try:
+        status = profile_call(func, args.profile) if args.profile else func()
+    finally:
+        instrumentation = get_instrumentation()
+        set_instrumentation(None)
+    if instrumentation:
+        if args.timings:
+            print(instrumentation.summary(), file=sys.stderr)
+        if args.chrome_trace:
+            instrumentation.write_chrome_trace(args.chrome_trace)
+    return status
+
+def cli_analyze(args):
+    if any(window <= 0 for window in args.windows):
+        args.parser.error("--windows must be positive")
+    with phase("parse"):
+        pages = list(load_cli_references(args))
+    if not pages:
+        args.parser.error("the trace is empty")
+    with phase("metrics"):
+        analysis = analyze_trace(pages, args.windows)
+    references, distances, gaps = analysis["references"], analysis["distances"], analysis["gaps"]
+    reused = distances[distances >= 0]
+    print(f"references={references} unique_pages={analysis['unique_pages']} cold_misses={references - len(reused)}")
+    if len(reused):
+        p50, p90, p99 = np.percentile(reused, [50, 90, 99])
+        print(f"reuse distance: median={p50:.0f} p90={p90:.0f} p99={p99:.0f} max={int(reused.max())}")
+        print(f"inter-reference gap: mean={gaps.mean():.1f} median={np.median(gaps):.0f} max={int(gaps.max())}")
+    for target in (50, 90, 95, 99):
+        sized = [frames for frames, faults in analysis["lru_faults"] if (references - faults) / references * 100 >= target]
+        print(f"LRU frames for {target}% hit ratio: {sized[0] if sized else 'unreachable (cold misses)'}")
+    if args.frames:
+        faults = dict(analysis["lru_faults"]).get(args.frames, references - len(reused))
+        print(f"LRU faults at {args.frames} frames: {faults}")
+    for window, sizes in analysis["working_set"].items():
+        print(f"working set (window {window}): mean={sizes.mean():.1f} max={int(sizes.max())}")
+    if args.curve:
+        print("frames,lru_faults")
+        for frames, faults in analysis["lru_faults"]:
+            print(f"{frames},{faults}")
+    return 0
+
+def cli_sample(args):
+    if not 0 < args.rate <= 1:
+        args.parser.error("--rate must be in (0, 1]")
+    if args.seeds < 1 or any(frames <= 0 for frames in args.frames):
+        args.parser.error("--seeds and --frames must be positive")
+    if trace_is_tagged(args):
+        args.parser.error("sampling needs plain page numbers, not pid:page references; see the workload command")
+    try:
+        with phase("simulate"):
+            total, sample_sizes, estimates = sampled_miss_ratios(load_cli_references(args), args.algorithms, args.frames, args.rate, args.seeds)
+    except ValueError as e:
+        # A pid:page reference past the part of the trace checked above
+        args.parser.error(str(e))
+    print(f"references={total} rate={args.rate:g} seeds={args.seeds} mean_sample={sum(sample_sizes) / len(sample_sizes):.0f}")
+    exact = {}
+    if args.exact:
+        with phase("simulate"):
+            pages = list(load_cli_references(args))
+            for frames in args.frames:
+                exact[frames] = compare_policies(pages, args.algorithms, frames)
+    for algo, points in estimates.items():
+        for frames, miss_ratio, half_width in points:
+            line = f"{algo:8s} frames={frames} miss_ratio={miss_ratio:.4f} +/-{half_width:.4f} (95% CI)"
+            if frames in exact:
+                exact_ratio = exact[frames][algo] / total if total else 0
+                line += f" exact={exact_ratio:.4f} error={miss_ratio - exact_ratio:+.4f}"
+            if frames * args.rate < 10:
+                line += f" [only {max(1, round(frames * args.rate))} sampled frames; raise --rate]"
+            print(line)
+    return 0
+
+def cli_export(args):
+    if args.frames <= 0:
+        args.parser.error("--frames must be a positive number")
+    if args.batch:
+        with open(args.batch, "r") as f:
+            runs = [(f"run{line_number:03d}", parse_reference_string(line)) for line_number, line in enumerate(f, 1)]
+        runs = [(stem, pages) for stem, pages in runs if pages]
+    else:
+        runs = [("run", list(load_cli_references(args)))]
+    if not runs or not runs[0][1]:
+        args.parser.error("no page references to export")
+    if any(is_tagged(pages) for _, pages in runs):
+        args.parser.error("chart export needs plain page numbers, not pid:page references; see the workload command")
+    jobs = [(f"{stem}_{algo}", pages, args.frames, algo) for stem, pages in runs for algo in args.algorithms]
+    paths = export_charts(jobs, args.out, args.formats, args.charts, args.graph_type, args.workers)
+    print(f"wrote {len(paths)} files for {len(jobs)} runs to {args.out}")
+    return 0
+
+def cli_serve(args):
+    if (args.workers is not None and args.workers <= 0) or args.cache_size < 0:
+        args.parser.error("--workers must be positive and --cache-size non-negative")
+    if args.socket and not hasattr(asyncio, "start_unix_server"):
+        args.parser.error("Unix sockets are not supported on this platform; use --port")
+    service = SimulationService(args.workers, args.cache_size)
+    service.start()
+    try:
+        asyncio.run(serve(service, args.host, args.port, args.socket))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.close()
+        if args.socket and os.path.exists(args.socket):
+            os.remove(args.socket)
+    return 0
+
+def add_trace_arguments(parser, frames_required=True):
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--pages", help="page reference string, e.g. \"7, 0, 1, 2\" or \"1:7, 2:0\" (pid:page)")
+    source.add_argument("--trace", help="file of page numbers separated by commas or whitespace")
+    parser.add_argument("--frames", type=int, required=frames_required, help="number of frames")
+
+def add_instrumentation_arguments(parser):
+    parser.add_argument("--timings", action="store_true", help="print phase timings and policy counters to stderr")
+    parser.add_argument("--chrome-trace", metavar="PATH", help="write phase timings as a Chrome trace JSON file")
+    parser.add_argument("--profile", metavar="PATH", help="profile the run (.prof for cProfile, .html/.pyisession for pyinstrument)")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Page Replacement Algorithm Simulator")
+    parser.add_argument("--log-level", default=None, choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+                        help="console log level (default: $PAGESIM_LOG_LEVEL or WARNING)")
+    parser.add_argument("--log-burst", type=int, default=5, help="messages allowed per call site per interval")
+    parser.add_argument("--log-interval", type=float, default=1.0, help="rate-limit interval in seconds")
+    subparsers = parser.add_subparsers(dest="command")
+
+    bench_parser = subparsers.add_parser("bench", help="run performance benchmarks")
+    bench_parser.add_argument("names", nargs="*", help=f"benchmarks to run ({', '.join(BENCHMARKS)}; default: all)")
+    bench_parser.add_argument("--runs", type=int, default=5, help="repetitions per benchmark")
+    bench_parser.add_argument("--budget", type=float, default=STARTUP_BUDGET, help="startup import budget in seconds")
+    bench_parser.add_argument("--workers", type=int, help="processes for the parallel benchmark (default: CPU count)")
+    bench_parser.add_argument("--references", type=int, default=2_000_000, help="trace length for the parallel and kernels benchmarks")
+    bench_parser.add_argument("--cases", type=int, default=400, help="random traces checked by the verify benchmark")
+    bench_parser.add_argument("--seed", type=int, default=0, help="seed for the verify benchmark's traces")
+    bench_parser.add_argument("--engine", choices=list(VERIFY_ENGINES), help="verify only this engine")
+    bench_parser.add_argument("--algorithm", choices=list(SIMULATORS), help="verify only this algorithm")
+    bench_parser.add_argument("--pages", help="verify this reference string instead of generated traces")
+    bench_parser.add_argument("--frames", type=int, default=3, help="frames for --pages")
+    bench_parser.set_defaults(handler=cli_bench, parser=bench_parser)
+
+    compare_parser = subparsers.add_parser("compare", help="run several policies over one trace in a single pass")
+    add_trace_arguments(compare_parser)
+    compare_parser.add_argument("--algorithms", nargs="+", choices=list(ACCESS_POLICIES), default=list(POLICIES),
+                                help="policies to run; the dirty-aware ESC and NRU need the in-memory R/W engine")
+    compare_parser.add_argument("--writes", action="store_true",
+                                help="read r/w flags from the trace file and track dirty pages (reference strings are checked directly)")
+    compare_parser.add_argument("--checkpoint", metavar="PATH", help="save progress here and resume from it on the next run")
+    compare_parser.add_argument("--checkpoint-every", type=int, default=1 << 20, metavar="N", help="references between checkpoints")
+    compare_parser.add_argument("--stop-after", type=int, metavar="N", help="process at most N more references, then exit")
+    compare_parser.add_argument("--fresh", action="store_true", help="ignore an existing checkpoint")
+    compare_parser.add_argument("--workers", type=int, metavar="N", help="split the trace into chunks simulated by N processes")
+    compare_parser.add_argument("--chunks", type=int, metavar="N", help="number of chunks for --workers (default: one per worker)")
+    hierarchy = compare_parser.add_argument_group("memory hierarchy", "model a TLB in front of the frames and report effective access time")
+    hierarchy.add_argument("--tlb-entries", type=int, metavar="N", help="TLB entries; turns the hierarchy model on")
+    hierarchy.add_argument("--tlb-ways", type=int, default=HIERARCHY_DEFAULTS["tlb_ways"], metavar="N", help="TLB associativity")
+    hierarchy.add_argument("--tlb-ns", type=float, default=HIERARCHY_DEFAULTS["tlb_ns"], help="TLB lookup latency")
+    hierarchy.add_argument("--memory-ns", type=float, default=HIERARCHY_DEFAULTS["memory_ns"], help="memory access latency")
+    hierarchy.add_argument("--walk-levels", type=int, default=HIERARCHY_DEFAULTS["walk_levels"], help="memory accesses per page-table walk")
+    hierarchy.add_argument("--fault-ns", type=float, default=HIERARCHY_DEFAULTS["fault_ns"], help="page-fault service time")
+    compare_parser.add_argument("--results", metavar="PATH", help="write a summary row per algorithm to a .csv, .npz or .parquet file")
+    compare_parser.add_argument("--steps", action="store_true", help="also write every step of every algorithm (PATH_steps.csv/.parquet, or inside the .npz)")
+    add_instrumentation_arguments(compare_parser)
+    compare_parser.set_defaults(handler=cli_compare, parser=compare_parser)
+
+    analyze_parser = subparsers.add_parser("analyze", help="reuse-distance, working-set and gap analytics for a trace")
+    add_trace_arguments(analyze_parser, frames_required=False)
+    analyze_parser.add_argument("--windows", nargs="+", type=int, default=[10, 100, 1000], help="working-set window sizes")
+    analyze_parser.add_argument("--curve", action="store_true", help="print the LRU faults-vs-frames curve as CSV")
+    analyze_parser.set_defaults(handler=cli_analyze, parser=analyze_parser)
+
+    sample_parser = subparsers.add_parser("sample", help="approximate miss ratios from a hash-sampled trace")
+    source = sample_parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--pages", help="page reference string")
+    source.add_argument("--trace", help="file of page numbers separated by commas or whitespace")
+    sample_parser.add_argument("--frames", type=int, nargs="+", required=True, help="frame counts of the full-size system")
+    sample_parser.add_argument("--algorithms", nargs="+", choices=list(POLICIES), default=["LRU"])
+    sample_parser.add_argument("--rate", type=float, default=0.01, help="fraction of pages sampled")
+    sample_parser.add_argument("--seeds", type=int, default=5, help="independent samples used for the error bound")
+    sample_parser.add_argument("--exact", action="store_true", help="also run the exact simulation and report the error")
+    add_instrumentation_arguments(sample_parser)
+    sample_parser.set_defaults(handler=lambda args: run_instrumented(args, lambda: cli_sample(args)), parser=sample_parser)
+
+    export_parser = subparsers.add_parser("export", help="render every chart of one or more runs to files, without a window")
+    source = export_parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--pages", help="page reference string")
+    source.add_argument("--trace", help="file of page numbers separated by commas or whitespace")
+    source.add_argument("--batch", help="file with one page reference string per line, each exported as its own run")
+    export_parser.add_argument("--frames", type=int, required=True, help="number of frames")
+    export_parser.add_argument("--algorithms", nargs="+", choices=list(POLICIES), default=list(POLICIES))
+    export_parser.add_argument("--out", default="charts", help="output directory")
+    export_parser.add_argument("--formats", nargs="+", choices=EXPORT_FORMATS, default=["png"])
+    export_parser.add_argument("--charts", nargs="+", choices=CHART_NAMES, default=list(CHART_NAMES))
+    export_parser.add_argument("--graph-type", choices=GANTT_GRAPH_TYPES, default="Broken Bar", help="style of the Gantt chart")
+    export_parser.add_argument("--workers", type=int, help="render processes (default: CPU count)")
+    export_parser.set_defaults(handler=cli_export, parser=export_parser)
+
+    workload_parser = subparsers.add_parser("workload", help="simulate a pid:page trace with frame allocation and global or local replacement")
+    add_trace_arguments(workload_parser)
+    workload_parser.add_argument("--algorithms", nargs="+", choices=list(POLICIES), default=list(POLICIES))
+    workload_parser.add_argument("--allocation", choices=ALLOCATIONS, default="equal", help="how frames are divided between processes")
+    workload_parser.add_argument("--scope", choices=SCOPES, default="local", help="replace among all frames or the faulting process's own")
+    workload_parser.add_argument("--window", type=int, default=100, help="references considered by working-set and PFF allocation")
+    add_instrumentation_arguments(workload_parser)
+    workload_parser.set_defaults(handler=lambda args: run_instrumented(args, lambda: cli_workload(args)), parser=workload_parser)
+
+    prefetch_parser = subparsers.add_parser("prefetch", help="wrap policies with prefetchers and compare them with the plain policies")
+    add_trace_arguments(prefetch_parser)
+    prefetch_parser.add_argument("--algorithms", nargs="+", choices=list(ACCESS_POLICIES), default=list(POLICIES))
+    prefetch_parser.add_argument("--prefetchers", nargs="+", choices=list(PREFETCHERS), default=list(PREFETCHERS))
+    prefetch_parser.add_argument("--degree", type=int, default=PREFETCH_DEGREE, help="pages prefetched per trigger (at most frames - 1)")
+    add_instrumentation_arguments(prefetch_parser)
+    prefetch_parser.set_defaults(handler=lambda args: run_instrumented(args, lambda: cli_prefetch(args)), parser=prefetch_parser)
+
+    live_parser = subparsers.add_parser("live", help="run online policies over a stream of references with a refreshing dashboard")
+    live_parser.add_argument("source", nargs="?", default="-", help="file or FIFO to read references from (default: stdin)")
+    live_parser.add_argument("--follow", action="store_true", help="keep reading at the end of the file, like tail -f")
+    live_parser.add_argument("--frames", type=int, required=True, help="number of frames")
+    live_parser.add_argument("--algorithms", nargs="+", choices=online_algorithms(), default=online_algorithms())
+    live_parser.add_argument("--window", type=int, default=LIVE_WINDOW, help="references in the rolling fault rate and working set")
+    live_parser.add_argument("--history", type=int, default=LIVE_HISTORY, help="recent steps shown")
+    live_parser.add_argument("--interval", type=float, default=LIVE_INTERVAL, help="seconds between dashboard refreshes")
+    live_parser.set_defaults(handler=cli_live, parser=live_parser)
+
+    serve_parser = subparsers.add_parser("serve", help="answer simulate/compare/sweep requests over local HTTP")
+    serve_parser.add_argument("--host", default="127.0.0.1", help="address to listen on")
+    serve_parser.add_argument("--port", type=int, default=8765, help="TCP port (0 picks a free one)")
+    serve_parser.add_argument("--socket", metavar="PATH", help="listen on a Unix socket instead of TCP")
+    serve_parser.add_argument("--workers", type=int, help="simulation processes (default: CPU count)")
+    serve_parser.add_argument("--cache-size", type=int, default=128, help="finished results kept for repeated requests")
+    serve_parser.set_defaults(handler=cli_serve, parser=serve_parser)
+
+    args = parser.parse_args(argv)
+    configure_logging(args.log_level, args.log_burst, args.log_interval)
+    if args.command:
+        return args.handler(args)
+
     root = tk.Tk()
     app = PageReplacementSimulator(root)
+    root.after_idle(start_background_imports)
     root.mainloop()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())